@@ -0,0 +1,112 @@
+# Генератор синтетических корпусов вакансий для бенчмарков.
+# generate_api_items() — элементы в формате ответа hh.ru (/vacancies -> items), детерминированно по seed.
+# generate_records() — те же вакансии в формате хранилищ (как Vacancy.to_dict()).
+# Генераторы ленивые: корпус на 5M записей не держится в памяти целиком.
+# Запуск: python -m benchmarks.corpus 100000 data/corpus.jsonl [--records]
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator
+
+TITLES = [
+    "Python разработчик",
+    "Senior Python Developer",
+    "Backend-разработчик (Django)",
+    "Data Scientist",
+    "Аналитик данных",
+    "Главный бухгалтер",
+    "Менеджер по продажам",
+    "QA инженер",
+    "DevOps инженер",
+    "Frontend-разработчик (React)",
+    "Водитель-экспедитор",
+    "Продавец-консультант",
+]
+AREAS = [
+    "Москва",
+    "Санкт-Петербург",
+    "Новосибирск",
+    "Екатеринбург",
+    "Казань",
+    "Нижний Новгород",
+    "Московская область",
+    "Краснодар",
+    "Самара",
+    "Удалённо",
+]
+EMPLOYERS = ["Сбер", "Яндекс", "VK", "Тинькофф", "Ozon", "Wildberries", "МТС", "Авито", "ООО Ромашка", "ИП Иванов"]
+REQUIREMENTS = [
+    "Опыт разработки на <highlighttext>Python</highlighttext> от 3 лет. Знание Django, FastAPI.",
+    "Уверенное знание SQL, опыт работы с PostgreSQL и Redis.",
+    "Знание продуктов 1С, опыт ведения бухгалтерского учёта.",
+    "Опыт активных продаж, грамотная речь, клиентоориентированность.",
+    "Опыт автоматизации тестирования, pytest, Selenium.",
+    "Kubernetes, Docker, CI/CD, мониторинг (Prometheus, Grafana).",
+    "React, TypeScript, опыт вёрстки адаптивных интерфейсов.",
+    "Водительские права категории B, знание города.",
+]
+BASE_DATE = datetime(2025, 9, 1, tzinfo=timezone(timedelta(hours=3)))
+
+
+def generate_api_items(count: int, seed: int = 42, start_id: int = 100000000) -> Iterator[Dict[str, Any]]:
+    """Лениво генерирует count элементов в формате ответа API hh.ru."""
+    rng = random.Random(seed)
+    for number in range(count):
+        vacancy_id = start_id + number
+        salary_from = rng.choice([None, None] + [rng.randrange(30, 400) * 1000 for _ in range(3)])
+        salary = None
+        if salary_from is not None:
+            salary = {"from": salary_from, "to": salary_from + rng.randrange(0, 100) * 1000, "currency": "RUR"}
+        published = BASE_DATE - timedelta(minutes=rng.randrange(0, 60 * 24 * 180))
+        yield {
+            "id": str(vacancy_id),
+            "name": rng.choice(TITLES),
+            "area": {"id": str(rng.randrange(1, 100)), "name": rng.choice(AREAS)},
+            "employer": {"name": rng.choice(EMPLOYERS)},
+            "salary": salary,
+            "published_at": published.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "snippet": {"requirement": " ".join(rng.sample(REQUIREMENTS, 2)), "responsibility": None},
+        }
+
+
+def api_item_to_record(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Преобразует элемент API в запись хранилища без валидации Vacancy (для быстрой генерации)."""
+    salary = item.get("salary") or {}
+    published = datetime.strptime(item["published_at"], "%Y-%m-%dT%H:%M:%S%z")
+    return {
+        "title": item["name"],
+        "location": item["area"]["name"],
+        "published_at": published.isoformat(),
+        "url": item["alternate_url"],
+        "salary": salary.get("from") or 0,
+        "description": item["snippet"]["requirement"],
+        "key_skills": [],
+        "experience": "Не указано",
+        "employer": item["employer"]["name"],
+    }
+
+
+def generate_records(count: int, seed: int = 42, start_id: int = 100000000) -> Iterator[Dict[str, Any]]:
+    """Лениво генерирует count записей в формате хранилищ (как Vacancy.to_dict())."""
+    for item in generate_api_items(count, seed, start_id):
+        yield api_item_to_record(item)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генерация синтетического корпуса вакансий (JSONL)")
+    parser.add_argument("count", type=int, help="Количество вакансий")
+    parser.add_argument("output", help="Файл JSONL")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--records", action="store_true", help="Формат хранилища вместо формата API")
+    args = parser.parse_args()
+    generator = generate_records if args.records else generate_api_items
+    with open(args.output, "w", encoding="utf-8") as f:
+        for item in generator(args.count, args.seed):
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
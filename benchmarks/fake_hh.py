@@ -0,0 +1,239 @@
+# Локальный стенд API hh.ru для бенчмарков и тестов.
+# FakeHHServer отдаёт постраничные ответы /vacancies из заданного списка или синтетического корпуса.
+# Настраиваются задержка ответа (latency), ответ 429 на каждый N-й запрос (rate_limit_every, Retry-After)
+# и ограничение глубины выдачи (max_depth, у hh.ru это 2000 вакансий).
+# Поддерживаются параметры date_from (вакансии не старше даты) и order_by=publication_time (сначала новые).
+# /vacancies/{id} отдаёт полную карточку вакансии (HTML-описание, key_skills, experience).
+# FakeSuperJobServer и FakeHabrServer отдают те же вакансии в форматах API SuperJob и Хабр Карьеры
+# (для проверки федеративного поиска и дедупликации между источниками).
+# Используется как контекстный менеджер: with FakeHHServer(count=10000) as server: HHAPI(server.url) ...
+
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Type
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.corpus import generate_api_items
+
+
+class FakeHHServer:
+    """Локальный HTTP-сервер, имитирующий /vacancies API hh.ru."""
+
+    PATH = "/vacancies"
+
+    def __init__(
+        self,
+        items: Optional[Sequence[Dict[str, Any]]] = None,
+        count: int = 1000,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0,
+        max_depth: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """:param items: Вакансии в формате API (по умолчанию — синтетический корпус из count вакансий)
+        :param latency: Задержка перед каждым ответом, с
+        :param rate_limit_every: Отвечать 429 на каждый N-й запрос (0 — никогда)
+        :param retry_after: Значение заголовка Retry-After для ответов 429
+        :param max_depth: Максимальное количество вакансий, доступных через пагинацию"""
+        self.items: List[Dict[str, Any]] = list(items) if items is not None else list(generate_api_items(count))
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.max_depth = max_depth
+        self._by_id = {str(item.get("id")): item for item in self.items}
+        self.requests_count = 0
+        self.detail_requests = 0
+        self.throttled_count = 0
+        self.last_params: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode("ascii")
+        return f"http://{host}:{port}{self.PATH}"
+
+    def start(self) -> "FakeHHServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeHHServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _should_throttle(self) -> bool:
+        with self._lock:
+            self.requests_count += 1
+            throttle = bool(self.rate_limit_every) and self.requests_count % self.rate_limit_every == 0
+            if throttle:
+                self.throttled_count += 1
+            return throttle
+
+    def search_page(self, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Формирует страницу ответа /vacancies."""
+        self.last_params = params
+        per_page = int(params.get("per_page", ["20"])[0])
+        page = int(params.get("page", ["0"])[0])
+        items = self.items
+        if "date_from" in params:
+            since = _parse_date(params["date_from"][0])
+            items = [item for item in items if _parse_date(item["published_at"]) >= since]
+        if params.get("order_by") == ["publication_time"]:
+            items = sorted(items, key=lambda item: _parse_date(item["published_at"]), reverse=True)
+        found = len(items)
+        available = found if self.max_depth is None else min(found, self.max_depth)
+        start, end = page * per_page, min((page + 1) * per_page, available)
+        return {
+            "items": items[start:end] if start < available else [],
+            "found": found,
+            "pages": (available + per_page - 1) // per_page,
+            "page": page,
+            "per_page": per_page,
+        }
+
+    def vacancy_details(self, vacancy_id: str) -> Optional[Dict[str, Any]]:
+        """Формирует полную карточку вакансии /vacancies/{id} на основе элемента поиска."""
+        item = self._by_id.get(vacancy_id)
+        if item is None:
+            return None
+        with self._lock:
+            self.detail_requests += 1
+        requirement = (item.get("snippet") or {}).get("requirement") or ""
+        words = [word.strip(".,()") for word in requirement.replace("<highlighttext>", "").split()]
+        skills = sorted({word for word in words if word[:1].isupper() and word.isascii() and len(word) > 2})
+        return {
+            **item,
+            "description": f"<p><strong>Обязанности:</strong> работа в команде {item['name']}.</p>"
+            f"<p><strong>Требования:</strong> {requirement}</p><ul><li>Полный рабочий день</li></ul>",
+            "key_skills": [{"name": skill} for skill in skills],
+            "experience": {"id": "between1And3", "name": "От 1 года до 3 лет"},
+        }
+
+    def _make_handler(self) -> Type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._should_throttle():
+                    self._send(429, {"errors": [{"type": "too_many_requests"}]}, {"Retry-After": server.retry_after})
+                    return
+                parsed = urlparse(self.path)
+                path = parsed.path.rstrip("/")
+                if path == server.PATH:
+                    self._send(200, server.search_page(parse_qs(parsed.query)))
+                    return
+                details = None
+                if path.startswith(server.PATH + "/"):
+                    details = server.vacancy_details(path.rsplit("/", 1)[1])
+                if details is None:
+                    self._send(404, {"errors": [{"type": "not_found"}]})
+                    return
+                self._send(200, details)
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, Any]] = None) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+class FakeSuperJobServer(FakeHHServer):
+    """Локальный стенд API SuperJob (/2.0/vacancies): те же вакансии в формате SuperJob."""
+
+    PATH = "/2.0/vacancies"
+
+    def search_page(self, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        self.last_params = params
+        count = int(params.get("count", ["20"])[0])
+        page = int(params.get("page", ["0"])[0])
+        start, end = page * count, (page + 1) * count
+        return {
+            "objects": [_superjob_item(item) for item in self.items[start:end]],
+            "total": len(self.items),
+            "more": end < len(self.items),
+        }
+
+
+class FakeHabrServer(FakeHHServer):
+    """Локальный стенд API Хабр Карьеры (/api/frontend/vacancies): страницы с 1, формат Хабр Карьеры."""
+
+    PATH = "/api/frontend/vacancies"
+
+    def search_page(self, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        self.last_params = params
+        per_page = int(params.get("per_page", ["25"])[0])
+        page = int(params.get("page", ["1"])[0])
+        start, end = (page - 1) * per_page, page * per_page
+        return {
+            "list": [_habr_item(item) for item in self.items[start:end]],
+            "meta": {"totalResults": len(self.items), "totalPages": (len(self.items) + per_page - 1) // per_page},
+        }
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
+
+def _superjob_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    salary = item.get("salary") or {}
+    return {
+        "id": int(item["id"]),
+        "profession": item["name"],
+        "town": {"title": item["area"]["name"]},
+        "firm_name": (item.get("employer") or {}).get("name"),
+        "payment_from": salary.get("from") or 0,
+        "payment_to": salary.get("to") or 0,
+        "currency": "rub",
+        "date_published": int(_parse_date(item["published_at"]).timestamp()),
+        "link": f"https://www.superjob.ru/vakansii/{item['id']}.html",
+        "candidat": (item.get("snippet") or {}).get("requirement"),
+        "experience": {"title": "Не имеет значения"},
+    }
+
+
+def _habr_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    salary = item.get("salary")
+    requirement = (item.get("snippet") or {}).get("requirement") or ""
+    skills = sorted({word.strip(".,()") for word in requirement.split() if word[:1].isupper() and word.isascii()})
+    return {
+        "id": int(item["id"]),
+        "title": item["name"],
+        "href": f"/vacancies/{item['id']}",
+        "company": {"title": (item.get("employer") or {}).get("name")},
+        "locations": [{"title": item["area"]["name"]}],
+        "remoteWork": False,
+        "salary": {"from": salary["from"], "to": salary["to"], "currency": "rur"} if salary else None,
+        "publishedDate": {"date": _parse_date(item["published_at"]).isoformat()},
+        "skills": [{"title": skill} for skill in skills if skill],
+    }
@@ -0,0 +1,218 @@
+# Набор бенчмарков конвейера вакансий (в духе asv: результаты сохраняются и сравниваются между версиями).
+# Покрывает: загрузку через HHAPI с локального стенда, convert_items, process_items (пул процессов),
+# remove_duplicates, _filter_items, SnapshotDiff (в памяти и по частям на диске), add/get/delete каждого FileHandler
+# и полный проход iter_items() по несжатым и сжатым хранилищам (jsonl/csv против .gz/.zst) с размером файлов на диске.
+# Запуск:
+#   python -m benchmarks.run --size 10000 --label v0.2.0
+#   python -m benchmarks.run --size 10000 --label dev --compare v0.2.0 --fail-threshold 1.25
+# Результаты пишутся в benchmarks/results/<label>.json; при --compare выводится отношение медиан,
+# а при превышении --fail-threshold процесс завершается с кодом 1.
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import api_item_to_record, generate_api_items
+from benchmarks.fake_hh import FakeHHServer
+from src.get_api import HHAPI
+from src.pipeline import convert_items, process_items
+from src.services import remove_duplicates
+from src.snapshot_diff import SnapshotDiff
+from src.work_files import HANDLERS, _filter_items, get_handler
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+XLSX_MAX_SIZE = 2000  # openpyxl слишком медленный для больших корпусов
+SCAN_FORMATS = ["jsonl", "jsonl.gz", "jsonl.zst", "csv", "csv.gz", "csv.zst"]
+
+
+def _zstd_available() -> bool:
+    try:
+        import zstandard  # type: ignore[import-not-found]  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def scan_formats() -> List[str]:
+    """Форматы для сравнения сжатых и несжатых хранилищ (zstd — только при установленном zstandard)."""
+    return [fmt for fmt in SCAN_FORMATS if not fmt.endswith(".zst") or _zstd_available()]
+
+
+def store_sizes(records: List[Dict[str, Any]], workdir: Path) -> Dict[str, int]:
+    """Размер на диске (байт) хранилища с records в каждом из scan_formats()."""
+    sizes = {}
+    for fmt in scan_formats():
+        handler = get_handler(str(workdir / f"size.{fmt}"))
+        handler.add_items(records)
+        sizes[fmt] = handler.filename.stat().st_size
+    return sizes
+
+
+class Benchmark:
+    """Один замер: setup() готовит данные (не замеряется), run(data) — замеряемая часть."""
+
+    def __init__(self, name: str, run: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None) -> None:
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+
+    def measure(self, repeat: int) -> Dict[str, float]:
+        timings = []
+        for _ in range(repeat):
+            data = self.setup()
+            started = time.perf_counter()
+            self.run(data)
+            timings.append(time.perf_counter() - started)
+        return {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.fmean(timings),
+            "repeat": repeat,
+        }
+
+
+def build_benchmarks(size: int, workdir: Path) -> List[Benchmark]:
+    """Создаёт набор бенчмарков для корпуса из size вакансий."""
+    api_items = list(generate_api_items(size))
+    records = [api_item_to_record(item) for item in api_items]
+    half = size // 2
+    criteria = {"location": ["Москва", "Казань"]}
+    quarter = size // 4
+    # Следующий снимок: часть вакансий ушла, часть добавилась, у каждой десятой изменилась зарплата
+    changed = [
+        {**record, "salary": record["salary"] + 5000} if number % 10 == 0 else record
+        for number, record in enumerate(records[quarter:])
+    ]
+
+    def harvest(_: Any) -> None:
+        per_page = 100
+        with FakeHHServer(items=api_items) as server:
+            api = HHAPI(base_url=server.url, per_page=per_page, pages=(size + per_page - 1) // per_page)
+            assert len(api.get_vacancies("python")) == size
+
+    benchmarks = [
+        Benchmark("hhapi_harvest", harvest),
+        Benchmark("convert_items", lambda _: convert_items(api_items)),
+        Benchmark(
+            "process_items_pool",
+            lambda _: process_items(
+                api_items, ["python"], "Москва", chunk_size=max(1, size // 8), parallel_threshold=0
+            ),
+        ),
+        Benchmark("remove_duplicates", lambda _: remove_duplicates(records[: half + quarter], records[half:], "url")),
+        Benchmark("filter_items", lambda _: _filter_items(records, criteria)),
+        Benchmark("snapshot_diff", lambda _: list(SnapshotDiff(records[: half + quarter], changed))),
+        Benchmark(
+            "snapshot_diff_partitioned",
+            lambda _: list(SnapshotDiff(records[: half + quarter], changed, partitions=8, workdir=workdir)),
+        ),
+    ]
+
+    for fmt, handler_class in HANDLERS.items():
+        if fmt == "jsonl":
+            continue
+        sample = records[:XLSX_MAX_SIZE] if fmt == "xlsx" else records
+        counter = iter(range(sys.maxsize))
+
+        def fresh_handler(fmt: str = fmt, handler_class: Any = handler_class) -> Any:
+            return handler_class(str(workdir / f"bench_{next(counter)}.{fmt}"))
+
+        def filled_handler(fresh: Callable[[], Any] = fresh_handler, sample: List[Dict[str, Any]] = sample) -> Any:
+            handler = fresh()
+            handler.add_items(sample)
+            return handler
+
+        def add_sample(handler: Any, sample: List[Dict[str, Any]] = sample) -> None:
+            handler.add_items(sample)
+
+        benchmarks += [
+            Benchmark(f"{fmt}_add_items", add_sample, fresh_handler),
+            Benchmark(f"{fmt}_get_items", lambda h: h.get_items(criteria), filled_handler),
+            Benchmark(f"{fmt}_delete_items", lambda h: h.delete_items({"location": "Казань"}), filled_handler),
+        ]
+
+    for fmt in scan_formats():
+
+        def scan_handler(fmt: str = fmt, store: Dict[str, Any] = {}) -> Any:
+            # Файл заполняется один раз: замеряется только чтение
+            if "handler" not in store:
+                store["handler"] = get_handler(str(workdir / f"scan.{fmt}"))
+                store["handler"].add_items(records)
+            return store["handler"]
+
+        benchmarks.append(Benchmark(f"{fmt}_scan", lambda h: sum(1 for _ in h.iter_items()), scan_handler))
+    return benchmarks
+
+
+def run_suite(size: int, repeat: int, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for benchmark in build_benchmarks(size, Path(tmp)):
+            if only and not any(name in benchmark.name for name in only):
+                continue
+            results[benchmark.name] = benchmark.measure(repeat)
+            print(f"{benchmark.name:<24} median {results[benchmark.name]['median'] * 1000:10.2f} ms", flush=True)
+    return results
+
+
+def compare(current: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> float:
+    """Печатает отношение медиан текущего прогона к базовому и возвращает наихудшее отношение."""
+    worst = 0.0
+    for name, stats in current.items():
+        if name not in baseline or not baseline[name]["median"]:
+            continue
+        ratio = stats["median"] / baseline[name]["median"]
+        worst = max(worst, ratio)
+        print(f"{name:<24} x{ratio:6.2f}")
+    return worst
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки конвейера вакансий")
+    parser.add_argument("--size", type=int, default=10000, help="Размер синтетического корпуса")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов каждого замера")
+    parser.add_argument("--label", default="local", help="Метка прогона (версия), имя файла результатов")
+    parser.add_argument("--only", nargs="*", help="Запустить только бенчмарки, содержащие эти подстроки")
+    parser.add_argument("--compare", help="Метка прогона для сравнения")
+    parser.add_argument("--fail-threshold", type=float, help="Допустимое замедление (например 1.25)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.size, args.repeat, args.only)
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = store_sizes([api_item_to_record(item) for item in generate_api_items(args.size)], Path(tmp))
+    for fmt, size in sizes.items():
+        print(f"{fmt + ' size':<24} {size / 1024:13.1f} KiB")
+    RESULTS_DIR.mkdir(exist_ok=True)
+    report = {
+        "label": args.label,
+        "size": args.size,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+        "sizes": sizes,
+    }
+    with open(RESULTS_DIR / f"{args.label}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+
+    if args.compare:
+        with open(RESULTS_DIR / f"{args.compare}.json", "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("size") != args.size:
+            print(f"Внимание: размер корпуса отличается ({baseline.get('size')} != {args.size})")
+        worst = compare(results, baseline["results"])
+        if args.fail_threshold and worst > args.fail_threshold:
+            print(f"Регрессия: замедление x{worst:.2f} больше порога x{args.fail_threshold}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,4 @@
 from pathlib import Path
 
-# Папка для всех файлов
+# Папка для всех файлов (создаётся хэндлерами при первой записи, а не при импорте)
 DATA_FOLDER = Path(__file__).resolve().parent / "data"
-DATA_FOLDER.mkdir(exist_ok=True)  # создаём папку, если её нет
\ No newline at end of file
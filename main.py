@@ -1,4 +1,11 @@
-from src.user_interface import user_interaction
+import sys
 
 if __name__ == "__main__":
-    user_interaction()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        from src.cli import main
+
+        sys.exit(main())
+
+    from src.user_interface import user_interaction
+
+    user_interaction()
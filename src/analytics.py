@@ -0,0 +1,181 @@
+# Что реализовано:
+# StoreAnalytics — статистика по сохранённым вакансиям любого хранилища (FileHandler, ShardedHandler):
+# salary_percentiles() — перцентили, медиана и средняя зарплата по группам (локация, работодатель, опыт, месяц),
+# counts() / counts_by_day() — количество вакансий по группам и по дням публикации,
+# top_employers() — работодатели с наибольшим количеством вакансий и их медианная зарплата.
+# Хранилище читается потоково через iter_items() частями по chunk_size записей; каждая часть обрабатывается
+# векторно в pandas/numpy, частичные результаты (счётчики и массивы зарплат по группам) объединяются.
+# Зарплата 0 (не указана) в статистику зарплат не входит.
+# Результаты кэшируются в JSON-файле по версии хранилища (mtime и размер файла или манифеста секций):
+# повторный отчёт по неизменившемуся хранилищу не читает его заново.
+# pandas и numpy импортируются только при расчёте статистики.
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from config import DATA_FOLDER
+from src.profiling import metrics
+from src.services import batched
+from src.work_files import FileHandler
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_CACHE_PATH = DATA_FOLDER / "analytics_cache.json"
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+GROUP_FIELDS = ("location", "employer", "experience", "date", "month")
+
+
+class StoreAnalytics:
+    """Агрегаты по вакансиям хранилища с потоковым чтением и кэшем по версии хранилища."""
+
+    def __init__(
+        self, handler: FileHandler, chunk_size: int = 50000, cache_path: Optional[Path] = DEFAULT_CACHE_PATH
+    ) -> None:
+        """:param handler: Хранилище вакансий
+        :param chunk_size: Количество записей в одной части при чтении
+        :param cache_path: Файл кэша результатов (None — без кэша)"""
+        self._handler = handler
+        self._chunk_size = max(1, chunk_size)
+        self._cache_path = Path(cache_path) if cache_path is not None else None
+
+    # ------------------ Отчёты ------------------
+    def salary_percentiles(
+        self, by: str = "location", percentiles: Sequence[float] = DEFAULT_PERCENTILES, min_count: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Перцентили зарплаты по группам.
+        :param by: Поле группировки (location, employer, experience, date, month)
+        :param percentiles: Перцентили (0–100)
+        :param min_count: Минимальное количество вакансий с зарплатой в группе
+        :return: Строки {by, count, mean, p25, p50, ...} по убыванию медианы"""
+        percentiles = [float(p) for p in percentiles]
+        key = f"salary_percentiles|{by}|{','.join(map(str, percentiles))}|{min_count}"
+        return self._cached(key, lambda: self._salary_percentiles(by, percentiles, min_count))
+
+    def counts(self, by: str = "location", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Количество вакансий по группам (по убыванию количества)."""
+        return self._cached(f"counts|{by}|{limit}", lambda: self._counts(by, limit))
+
+    def counts_by_day(self) -> List[Dict[str, Any]]:
+        """Количество вакансий по дням публикации (по возрастанию даты)."""
+        return sorted(self.counts(by="date"), key=lambda row: row["date"])
+
+    def top_employers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Работодатели с наибольшим количеством вакансий и их медианная зарплата."""
+        medians = {row["employer"]: row["p50"] for row in self.salary_percentiles("employer", (50,))}
+        return [
+            {**row, "median_salary": medians.get(row["employer"])} for row in self.counts(by="employer", limit=limit)
+        ]
+
+    # ------------------ Расчёт ------------------
+    def _frames(self, columns: Sequence[str]) -> Iterator["pd.DataFrame"]:
+        """Части хранилища в виде DataFrame с нужными колонками."""
+        import pandas as pd
+
+        for chunk in batched(self._handler.iter_items(), self._chunk_size):
+            frame = pd.DataFrame.from_records(chunk)
+            metrics.inc("analytics_rows_total", len(frame))
+            yield frame.reindex(columns=list(dict.fromkeys(columns)))
+
+    def _counts(self, by: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        import pandas as pd
+
+        total: Optional[pd.Series] = None
+        for frame in self._frames([_source_field(by)]):
+            counts = _group_keys(frame, by).value_counts()
+            total = counts if total is None else total.add(counts, fill_value=0)
+        if total is None:
+            return []
+        total = total.astype(int).sort_values(ascending=False, kind="stable")
+        if limit:
+            total = total.head(limit)
+        return [{by: str(group), "count": int(count)} for group, count in total.items()]
+
+    def _salary_percentiles(self, by: str, percentiles: List[float], min_count: int) -> List[Dict[str, Any]]:
+        import numpy as np
+        import pandas as pd
+
+        parts: Dict[str, List[Any]] = {}
+        for frame in self._frames([_source_field(by), "salary"]):
+            salary = pd.to_numeric(frame["salary"], errors="coerce")
+            mask = salary > 0
+            groups = _group_keys(frame, by)[mask]
+            for group, values in salary[mask].groupby(groups, sort=False):
+                parts.setdefault(str(group), []).append(values.to_numpy(dtype=np.float64))
+
+        rows: List[Dict[str, Any]] = []
+        for group, arrays in parts.items():
+            samples = np.concatenate(arrays)
+            if len(samples) < min_count:
+                continue
+            row: Dict[str, Any] = {by: group, "count": int(len(samples)), "mean": round(float(samples.mean()), 2)}
+            for p, value in zip(percentiles, np.percentile(samples, percentiles)):
+                row[f"p{p:g}"] = round(float(value), 2)
+            rows.append(row)
+        sort_key = "p50" if 50.0 in percentiles else "mean"
+        return sorted(rows, key=lambda row: (-row[sort_key], row[by]))
+
+    # ------------------ Кэш ------------------
+    def store_version(self) -> List[Any]:
+        """Версия хранилища: путь, mtime и размер файла (для секционированного — файла манифеста)."""
+        path = Path(self._handler.filename)
+        manifest = getattr(self._handler, "manifest_path", None)
+        if manifest is not None:
+            path = Path(manifest)
+        if not path.exists():
+            return [str(path), None, None]
+        stat = path.stat()
+        return [str(path), stat.st_mtime_ns, stat.st_size]
+
+    def _cached(self, key: str, compute: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        if self._cache_path is None:
+            return compute()
+        version = self.store_version()
+        store_key = f"{type(self._handler).__name__}|{version[0]}"
+        cache = _load_cache(self._cache_path)
+        entry = cache.get(store_key)
+        if entry is not None and entry.get("version") == version and key in entry["results"]:
+            metrics.inc("analytics_cache_hits_total")
+            result: List[Dict[str, Any]] = entry["results"][key]
+            return result
+        metrics.inc("analytics_cache_misses_total")
+        with metrics.span("analytics_seconds", report=key.split("|", 1)[0]):
+            result = compute()
+        if entry is None or entry.get("version") != version:
+            entry = cache[store_key] = {"version": version, "results": {}}
+        entry["results"][key] = result
+        _save_cache(self._cache_path, cache)
+        return result
+
+
+# ------------------ Вспомогательные функции ------------------
+def _source_field(by: str) -> str:
+    if by not in GROUP_FIELDS:
+        raise ValueError(f"Группировка возможна по полям: {', '.join(GROUP_FIELDS)}")
+    return "published_at" if by in ("date", "month") else by
+
+
+def _group_keys(frame: "pd.DataFrame", by: str) -> "pd.Series":
+    """Ключи группировки части: дата и месяц берутся из строки published_at, пустые значения — "Не указано"."""
+    if by in ("date", "month"):
+        return frame["published_at"].astype(str).str[: 10 if by == "date" else 7]
+    return frame[by].fillna("Не указано").astype(str).replace("", "Не указано")
+
+
+def _load_cache(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        cache: Dict[str, Any] = json.load(f)
+    return cache
+
+
+def _save_cache(path: Path, cache: Dict[str, Any]) -> None:
+    """Сохраняет кэш (через временный файл и os.replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
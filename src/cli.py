@@ -0,0 +1,457 @@
+# Неинтерактивный интерфейс командной строки (для cron, скриптов и конвейеров).
+# Подкоманды:
+# search — поиск по одному или нескольким запросам с фильтрами и ТОП N, вывод в stdout или файл.
+# sync — поиск и добавление найденных вакансий в хранилище (без дубликатов по url).
+# query — отбор вакансий из сохранённого файла по локации, датам, зарплате и ключевым словам.
+# export — перенос вакансий из одного формата хранилища в другой.
+# diff — новые, удалённые и изменившиеся (с разницей зарплат) вакансии между двумя снимками.
+# stats — перцентили зарплат и количество вакансий по группам, по дням и по работодателям (с кэшем).
+# compact — удаление устаревших версий вакансий и вакансий старше окна хранения (--retention-days).
+# dedup — поиск (--dry-run) или удаление почти одинаковых вакансий (перепубликаций под новым url) в хранилище.
+# watch — фоновый режим: сохранённые поиски из JSON-файла опрашиваются по расписанию (src/watch.py).
+# archive — перенос старых секций секционированного хранилища (--store-format sharded) в архив.
+# serve — локальный HTTP-сервис запросов к хранилищу (src/server.py), модуль импортируется только при запуске.
+# По умолчанию результаты выводятся в stdout построчно в формате JSONL.
+# --workers задаёт число параллельных запросов к API, --api-url — адрес API (например, локальный стенд).
+# --sources (search/sync) — источники вакансий (hh, superjob, habr): опрашиваются параллельно, у каждого свой
+# срок ожидания (--source-timeout), одинаковые вакансии с разных площадок объединяются (src/federation.py).
+# Адреса источников, кроме hh, задаются через --source-url ИМЯ=АДРЕС.
+# --processes задаёт число процессов для конвертации и фильтрации больших пакетов (1 — без пула процессов).
+# --near-duplicates ПОРОГ (sync) не добавляет в хранилище почти-дубликаты уже сохранённых вакансий.
+# sync ведёт фильтр Блума url всех когда-либо сохранённых вакансий (<хранилище>.seen.bloom, src/seen_filter.py):
+# уже известные вакансии не конвертируются, а загрузка страниц прекращается на полностью известной странице.
+# --no-seen-filter отключает фильтр (например, чтобы заново загрузить удалённые из хранилища вакансии).
+# --enrich (search/sync) догружает полные карточки вакансий уже после дешёвых фильтров (с дисковым кэшем).
+# --metrics, --profile и --tracemalloc (перед подкомандой) включают сбор метрик и профилирование запуска.
+
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from src.analytics import DEFAULT_PERCENTILES, GROUP_FIELDS, StoreAnalytics
+from src.enrichment import DetailCache, enrich_items
+from src.federation import DEFAULT_SOURCE_TIMEOUT, federated_search
+from src.get_api import HHAPI, PROVIDERS, PagedVacancyAPI, get_provider
+from src.maintenance import compact_store, remove_near_duplicates
+from src.near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, find_near_duplicates
+from src.pipeline import convert_items, filter_by_keywords, parse_salary_range, process_items, top_vacancies
+from src.profiling import metrics, profile_run
+from src.query_cache import QueryCache
+from src.seen_filter import SeenFilter, seen_filter_path
+from src.services import remove_duplicates
+from src.sharding import ShardedHandler
+from src.snapshot_diff import DIFF_FIELDS, SnapshotDiff
+from src.text_index import InvertedIndex
+from src.vacancy_get import Vacancy
+from src.watch import DEFAULT_JITTER, WatchDaemon, load_saved_searches
+from src.work_files import HANDLERS, STORE_FORMATS, VACANCY_FIELDS, _flat_value, get_handler
+
+OUTPUT_FORMATS = ["jsonl"] + [fmt for fmt in HANDLERS if fmt != "jsonl"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов со всеми подкомандами."""
+    parser = argparse.ArgumentParser(prog="hh-vacancies", description="Поиск и хранение вакансий hh.ru")
+    parser.add_argument("--metrics", help="Сохранить метрики запуска в файл (JSON или .prom)")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], help="Формат файла метрик")
+    parser.add_argument("--profile", help="Сохранить статистику cProfile в файл")
+    parser.add_argument("--tracemalloc", action="store_true", help="Замерить пиковое потребление памяти")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search = subparsers.add_parser("search", help="Поиск вакансий и вывод результатов")
+    _add_api_arguments(search)
+    _add_filter_arguments(search)
+    _add_output_arguments(search)
+    search.add_argument("--top", type=int, help="Количество вакансий в ТОП N по зарплате")
+
+    sync = subparsers.add_parser("sync", help="Поиск вакансий и сохранение в хранилище")
+    _add_api_arguments(sync)
+    _add_filter_arguments(sync)
+    sync.add_argument("--store", required=True, help="Файл хранилища (формат по расширению)")
+    sync.add_argument("--store-format", choices=STORE_FORMATS, help="Формат хранилища")
+    sync.add_argument(
+        "--near-duplicates", type=float, metavar="ПОРОГ", help="Не добавлять почти-дубликаты (сходство от 0 до 1)"
+    )
+    sync.add_argument(
+        "--no-seen-filter", action="store_true", help="Не пропускать вакансии, которые уже сохранялись в хранилище"
+    )
+
+    query = subparsers.add_parser("query", help="Отбор вакансий из сохранённого файла")
+    query.add_argument("--store", required=True, help="Файл хранилища (формат по расширению)")
+    query.add_argument("--store-format", choices=STORE_FORMATS, help="Формат хранилища")
+    _add_filter_arguments(query)
+    query.add_argument(
+        "--location-match", choices=["exact", "prefix", "substring"], default="substring", help="Сравнение локации"
+    )
+    query.add_argument("--date-from", help="Дата публикации не раньше (ISO)")
+    query.add_argument("--date-to", help="Дата публикации не позже (ISO)")
+    query.add_argument("--mode", choices=["or", "and"], default="or", help="Режим поиска по ключевым словам")
+    query.add_argument("--top", type=int, help="Количество вакансий в ТОП N по зарплате")
+    _add_output_arguments(query)
+
+    export = subparsers.add_parser("export", help="Экспорт хранилища в другой формат")
+    export.add_argument("--store", required=True, help="Исходный файл хранилища")
+    export.add_argument("--store-format", choices=STORE_FORMATS, help="Формат исходного хранилища")
+    _add_output_arguments(export)
+
+    diff = subparsers.add_parser("diff", help="Новые, удалённые и изменившиеся вакансии между двумя хранилищами")
+    diff.add_argument("--old", required=True, help="Старый снимок (файл или каталог хранилища)")
+    diff.add_argument("--old-format", choices=STORE_FORMATS, help="Формат старого снимка")
+    diff.add_argument("--new", required=True, help="Новый снимок (файл или каталог хранилища)")
+    diff.add_argument("--new-format", choices=STORE_FORMATS, help="Формат нового снимка")
+    diff.add_argument("--partitions", type=int, default=1, help="Частей для сравнения больших снимков на диске")
+    _add_output_arguments(diff)
+
+    stats = subparsers.add_parser("stats", help="Статистика по сохранённым вакансиям")
+    stats.add_argument("--store", required=True, help="Файл или каталог хранилища")
+    stats.add_argument("--store-format", choices=STORE_FORMATS, help="Формат хранилища")
+    stats.add_argument(
+        "--report", choices=["salary", "counts", "daily", "employers"], default="salary", help="Вид отчёта"
+    )
+    stats.add_argument("--by", choices=GROUP_FIELDS, default="location", help="Поле группировки")
+    stats.add_argument("--percentiles", type=float, nargs="+", default=list(DEFAULT_PERCENTILES), help="Перцентили")
+    stats.add_argument("--limit", type=int, help="Количество строк отчёта")
+    stats.add_argument("--format", choices=["jsonl", "json", "csv"], default="jsonl", help="Формат вывода")
+    stats.add_argument("--no-cache", action="store_true", help="Не использовать кэш результатов")
+
+    compact = subparsers.add_parser("compact", help="Удаление устаревших версий и старых вакансий из хранилища")
+    compact.add_argument("--store", required=True, help="Файл или каталог хранилища")
+    compact.add_argument("--store-format", choices=STORE_FORMATS, help="Формат хранилища")
+    compact.add_argument("--retention-days", type=float, help="Удалить вакансии, опубликованные раньше N дней назад")
+
+    dedup = subparsers.add_parser("dedup", help="Почти одинаковые вакансии (перепубликации) в хранилище")
+    dedup.add_argument("--store", required=True, help="Файл или каталог хранилища")
+    dedup.add_argument("--store-format", choices=STORE_FORMATS, help="Формат хранилища")
+    dedup.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Порог сходства (от 0 до 1)")
+    dedup.add_argument("--dry-run", action="store_true", help="Только вывести найденные пары, не удаляя")
+
+    watch = subparsers.add_parser("watch", help="Периодический опрос сохранённых поисков")
+    watch.add_argument("--searches", required=True, help="JSON-файл сохранённых поисков")
+    watch.add_argument("--stats", help="Файл JSON со статистикой поисков (обновляется после каждого цикла)")
+    watch.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="Случайный сдвиг интервала, доля")
+    watch.add_argument("--timeout", type=float, default=10, help="Таймаут запроса, с")
+    watch.add_argument("--cycles", type=int, help="Остановиться после N опросов (по умолчанию — работать до Ctrl+C)")
+
+    archive = subparsers.add_parser("archive", help="Перенос старых секций хранилища в архив")
+    archive.add_argument("--store", required=True, help="Каталог секционированного хранилища")
+    archive.add_argument("--before", required=True, help="Архивировать секции с вакансиями старше даты (ISO)")
+
+    serve = subparsers.add_parser("serve", help="HTTP-сервис запросов к хранилищу (только чтение)")
+    serve.add_argument("--store", required=True, help="Файл или каталог хранилища")
+    serve.add_argument("--store-format", choices=STORE_FORMATS, help="Формат хранилища")
+    serve.add_argument("--host", default="127.0.0.1", help="Адрес сервиса")
+    serve.add_argument("--port", type=int, default=8000, help="Порт сервиса")
+    return parser
+
+
+def _add_api_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("queries", nargs="+", help="Поисковые запросы")
+    parser.add_argument("--api-url", default=HHAPI.DEFAULT_URL, help="Адрес API вакансий hh.ru")
+    parser.add_argument("--sources", nargs="+", choices=sorted(PROVIDERS), default=["hh"], help="Источники вакансий")
+    parser.add_argument(
+        "--source-url", action="append", default=[], metavar="ИМЯ=АДРЕС", help="Адрес API источника (кроме hh)"
+    )
+    parser.add_argument(
+        "--source-timeout", type=float, default=DEFAULT_SOURCE_TIMEOUT, help="Срок ожидания одного источника, с"
+    )
+    parser.add_argument("--pages", type=int, default=1, help="Количество страниц на запрос")
+    parser.add_argument("--per-page", type=int, default=20, help="Вакансий на странице")
+    parser.add_argument("--timeout", type=float, default=10, help="Таймаут запроса, с")
+    parser.add_argument("--workers", type=int, default=4, help="Количество параллельных запросов")
+    parser.add_argument("--processes", type=int, help="Процессов для обработки больших пакетов (по умолчанию — ядра)")
+    parser.add_argument("--enrich", action="store_true", help="Догрузить описание, key_skills и опыт из карточек")
+    parser.add_argument("--details-cache", help="Файл кэша карточек (по умолчанию data/details_cache.jsonl)")
+
+
+def _add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--keywords", nargs="*", default=[], help="Ключевые слова в названии/описании")
+    parser.add_argument("--location", help="Локация (поиск по подстроке)")
+    parser.add_argument("--salary", help="Диапазон зарплат, например 100000-150000")
+    parser.add_argument("--salary-min", type=int, help="Минимальная зарплата")
+    parser.add_argument("--salary-max", type=int, help="Максимальная зарплата")
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl", help="Формат вывода")
+    parser.add_argument("--output", help="Файл для сохранения (по умолчанию stdout)")
+
+
+def _salary_bounds(args: argparse.Namespace) -> Tuple[Optional[int], Optional[int]]:
+    if args.salary:
+        return parse_salary_range(args.salary)
+    return args.salary_min, args.salary_max
+
+
+def _providers(args: argparse.Namespace, seen: Optional[SeenFilter] = None) -> List[PagedVacancyAPI]:
+    """Клиенты выбранных источников (--sources) с адресами из --api-url и --source-url.
+    :param seen: Фильтр уже сохранённых вакансий (их источники не отдают)"""
+    urls = {"hh": args.api_url}
+    for value in args.source_url:
+        name, sep, url = value.partition("=")
+        if not sep or name not in PROVIDERS:
+            raise ValueError(f"Адрес источника задаётся как ИМЯ=АДРЕС, источники: {', '.join(sorted(PROVIDERS))}")
+        urls[name] = url
+    return [
+        get_provider(
+            name, base_url=urls.get(name), per_page=args.per_page, pages=args.pages, timeout=args.timeout, seen=seen
+        )
+        for name in dict.fromkeys(args.sources)
+    ]
+
+
+def fetch_all(args: argparse.Namespace, seen: Optional[SeenFilter] = None) -> List[Dict[str, Any]]:
+    """Запрашивает вакансии по всем запросам и источникам параллельно; результат без дубликатов, в порядке запросов.
+    Ошибка (ConnectionError) — только если не ответил ни один источник.
+    :param seen: Фильтр уже сохранённых вакансий (они не запрашиваются повторно)"""
+
+    def fetch(keyword: str) -> List[Dict[str, Any]]:
+        items, report = federated_search(keyword, _providers(args, seen), default_timeout=args.source_timeout)
+        failed = {name: source for name, source in report.items() if source["status"] != "ok"}
+        if failed and len(failed) == len(report):
+            raise ConnectionError("; ".join(source.get("error", source["status"]) for source in failed.values()))
+        for name, source in failed.items():
+            print(f"Источник {name} пропущен ({source['status']}): {source.get('error', '')}", file=sys.stderr)
+        return items
+
+    workers = max(1, min(args.workers, len(args.queries)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        batches = list(executor.map(fetch, args.queries))
+    items: List[Dict[str, Any]] = []
+    for batch in batches:
+        items = remove_duplicates(items, batch, key="alternate_url")
+    return items
+
+
+def _search(args: argparse.Namespace, seen: Optional[SeenFilter] = None) -> List[Vacancy]:
+    min_salary, max_salary = _salary_bounds(args)
+    api_items = fetch_all(args, seen)
+    if not args.enrich:
+        return process_items(
+            api_items, args.keywords, args.location, min_salary, max_salary, skip_invalid=True, workers=args.processes
+        )
+
+    # Карточки запрашиваются только для вакансий, прошедших дешёвые фильтры по локации и зарплате;
+    # ключевые слова проверяются после обогащения — уже по полному описанию и навыкам.
+    vacancies = process_items(
+        api_items, (), args.location, min_salary, max_salary, skip_invalid=True, workers=args.processes
+    )
+    survivors = {vac.url for vac in vacancies}
+    candidates = [item for item in api_items if item.get("alternate_url") in survivors]
+    # Полные карточки есть только у hh.ru; вакансии других источников остаются как есть
+    api = HHAPI(base_url=args.api_url, timeout=args.timeout)
+    cache = DetailCache(args.details_cache) if args.details_cache else DetailCache()
+    hh_items = [item for item in candidates if item.get("source", "hh") == "hh"]
+    enriched = {item.get("alternate_url"): item for item in enrich_items(hh_items, api, cache, workers=args.workers)}
+    items = [enriched.get(item.get("alternate_url"), item) for item in candidates]
+    return filter_by_keywords(convert_items(items, skip_invalid=True), args.keywords)
+
+
+def write_records(
+    records: Iterable[Dict[str, Any]],
+    fmt: str,
+    output: Optional[str],
+    stream: TextIO,
+    fields: Sequence[str] = VACANCY_FIELDS,
+) -> int:
+    """Выводит записи в stdout (JSONL построчно, JSON, CSV, TXT) или сохраняет в файл через хэндлер.
+    :param fields: Колонки CSV/XLSX
+    :return: Количество выведенных записей"""
+    if output:
+        items = list(records)
+        get_handler(output, fmt, fields).add_items(items)
+        return len(items)
+    if fmt == "xlsx":
+        raise ValueError("Формат xlsx можно сохранить только в файл (--output)")
+    count = 0
+    if fmt == "json":
+        items = list(records)
+        json.dump(items, stream, ensure_ascii=False, indent=4)
+        stream.write("\n")
+        return len(items)
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow({k: _flat_value(v) for k, v in record.items()})
+            count += 1
+        return count
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+        count += 1
+    return count
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    vacancies = top_vacancies(_search(args), args.top)
+    write_records((vac.to_dict() for vac in vacancies), args.format, args.output, sys.stdout)
+    return 0
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+    handler = get_handler(args.store, args.store_format)
+    seen = None
+    if not args.no_seen_filter:
+        # Фильтр пополняется при каждом add_items; без файла фильтра он строится по содержимому хранилища
+        seen = SeenFilter(seen_filter_path(handler.filename))
+        handler.attach_index(seen, rebuild=not seen.load())
+    vacancies = _search(args, seen)
+    if args.near_duplicates is not None:
+        handler.attach_index(NearDuplicateIndex(threshold=args.near_duplicates), rebuild=True)
+    # Собственный кэш: count() после add_items берёт записанное содержимое из кэша, а не читает файл заново
+    handler.enable_cache(QueryCache())
+    with handler:
+        added = handler.add_items([vac.to_dict() for vac in vacancies])
+    summary = {"store": str(handler.filename), "found": len(vacancies), "added": added, "total": handler.count()}
+    print(json.dumps(summary, ensure_ascii=False))
+    return 0
+
+
+def cmd_query(args: argparse.Namespace) -> int:
+    min_salary, max_salary = _salary_bounds(args)
+    handler = get_handler(args.store, args.store_format)
+    items = handler.query(
+        location=args.location,
+        location_match=args.location_match,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        salary_min=min_salary,
+        salary_max=max_salary,
+    )
+    if args.keywords:
+        text_index = InvertedIndex()
+        text_index.add_items(items)
+        matched = text_index.match(args.keywords, mode=args.mode)
+        items = [item for item in items if item.get("url") in matched]
+    if args.top:
+        items = sorted(items, key=lambda item: int(item.get("salary") or 0), reverse=True)[: args.top]
+    write_records(items, args.format, args.output, sys.stdout)
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    source = get_handler(args.store, args.store_format)
+    write_records(source.get_items(), args.format, args.output, sys.stdout)
+    return 0
+
+
+def cmd_diff(args: argparse.Namespace) -> int:
+    old = get_handler(args.old, args.old_format)
+    new = get_handler(args.new, args.new_format)
+    diff = SnapshotDiff(old, new, partitions=args.partitions)
+    if args.output:
+        counts = diff.write(get_handler(args.output, args.format, DIFF_FIELDS))
+    else:
+        write_records(diff, args.format, None, sys.stdout, DIFF_FIELDS)
+        counts = diff.counts
+    print(json.dumps(counts, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    handler = get_handler(args.store, args.store_format)
+    analytics = StoreAnalytics(handler, cache_path=None) if args.no_cache else StoreAnalytics(handler)
+    if args.report == "salary":
+        rows = analytics.salary_percentiles(args.by, args.percentiles)[: args.limit]
+    elif args.report == "counts":
+        rows = analytics.counts(args.by, args.limit)
+    elif args.report == "daily":
+        rows = analytics.counts_by_day()[: args.limit]
+    else:
+        rows = analytics.top_employers(args.limit or 10)
+    write_records(rows, args.format, None, sys.stdout, list(rows[0]) if rows else [])
+    return 0
+
+
+def cmd_compact(args: argparse.Namespace) -> int:
+    handler = get_handler(args.store, args.store_format)
+    stats = compact_store(handler, args.retention_days)
+    print(json.dumps({"store": str(handler.filename), **stats}, ensure_ascii=False))
+    return 0
+
+
+def cmd_dedup(args: argparse.Namespace) -> int:
+    handler = get_handler(args.store, args.store_format)
+    if args.dry_run:
+        write_records(find_near_duplicates(handler, args.threshold), "jsonl", None, sys.stdout)
+        return 0
+    stats = remove_near_duplicates(handler, args.threshold)
+    print(json.dumps({"store": str(handler.filename), **stats}, ensure_ascii=False))
+    return 0
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    daemon = WatchDaemon(load_saved_searches(args.searches), args.jitter, args.stats, args.timeout)
+    try:
+        daemon.run(args.cycles)
+    except KeyboardInterrupt:
+        daemon.stop()
+    finally:
+        daemon.close()
+    write_records(daemon.stats(), "jsonl", None, sys.stdout)
+    return 0
+
+
+def cmd_archive(args: argparse.Namespace) -> int:
+    handler = ShardedHandler(args.store)
+    moved = handler.archive(args.before)
+    print(json.dumps({"store": str(handler.filename), "archived": moved}, ensure_ascii=False))
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from src.server import serve
+
+    handler = get_handler(args.store, args.store_format)
+    print(f"Сервис запущен: http://{args.host}:{args.port}/vacancies", file=sys.stderr)
+    serve(handler, args.host, args.port)
+    return 0
+
+
+COMMANDS = {
+    "search": cmd_search,
+    "sync": cmd_sync,
+    "query": cmd_query,
+    "export": cmd_export,
+    "diff": cmd_diff,
+    "stats": cmd_stats,
+    "compact": cmd_compact,
+    "dedup": cmd_dedup,
+    "watch": cmd_watch,
+    "archive": cmd_archive,
+    "serve": cmd_serve,
+}
+
+
+def _run(args: argparse.Namespace) -> int:
+    try:
+        return COMMANDS[args.command](args)
+    except ConnectionError as e:
+        print(f"Ошибка API: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа CLI. Возвращает код завершения процесса."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    instrumented = bool(args.metrics or args.profile or args.tracemalloc)
+    if not instrumented:
+        return _run(args)
+
+    metrics.reset()
+    metrics.enable()
+    try:
+        with profile_run(args.profile, trace_memory=args.tracemalloc):
+            code = _run(args)
+    finally:
+        if args.metrics:
+            metrics.write_report(args.metrics, args.metrics_format)
+        metrics.disable()
+    return code
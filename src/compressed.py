@@ -0,0 +1,355 @@
+# Что реализовано:
+# Сжатые хранилища вакансий JSONL и CSV (форматы jsonl.gz, csv.gz, jsonl.zst, csv.zst).
+# Файл — последовательность независимо сжатых блоков по block_size записей: gzip-члены (файл читается
+# и обычным gzip) или кадры zstd (нужен пакет zstandard, импортируется только при работе с .zst).
+# Рядом с файлом лежит оглавление блоков <файл>.blocks.json: смещение и длина блока, количество записей,
+# диапазоны дат публикации и зарплат, локации и битовая маска url (2 хэша, 8 бит на запись).
+# Чтение идёт потоково, блок за блоком. query() и get_items() с критериями url или location
+# пропускают блоки, которые по оглавлению не могут содержать подходящих записей (не распаковывая их).
+# add_items() дописывает новые блоки в конец файла, не пересжимая старые; проверка дубликатов по url
+# распаковывает только блоки, в маске которых есть url новых записей.
+# delete_items() и replace_items() перезаписывают файл целиком.
+# Если оглавление отсутствует или не совпадает с размером файла (например, после сбоя), оно
+# восстанавливается сканированием границ блоков.
+# Блоки CSV содержат заголовок (каждый блок читается независимо); значения декодируются по схеме (src/schema.py).
+
+import csv
+import hashlib
+import io
+import json
+import os
+import zlib
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from src.indexes import normalize_location
+from src.profiling import metrics
+from src.schema import decode_rows
+from src.services import batched, remove_duplicates
+from src.store_stats import part_stats, ranges_overlap
+from src.work_files import FileHandler, _flat_value, _location_check
+
+CODECS = ("gzip", "zstd")
+# Формат хранилища -> (формат записей в блоке, кодек)
+COMPRESSED_FORMATS: Dict[str, Tuple[str, str]] = {
+    "csv.gz": ("csv", "gzip"),
+    "csv.zst": ("csv", "zstd"),
+    "jsonl.gz": ("jsonl", "gzip"),
+    "jsonl.zst": ("jsonl", "zstd"),
+}
+DEFAULT_BLOCK_SIZE = 1000
+BLOCK_INDEX_SUFFIX = ".blocks.json"
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+# Бит маски url на одну запись блока (при двух хэшах ложные срабатывания ~5%)
+URL_MASK_BITS = 8
+
+
+def codec_for(filename: Any) -> str:
+    """Кодек по расширению файла: .zst — zstd, иначе gzip."""
+    return "zstd" if Path(str(filename)).suffix == ".zst" else "gzip"
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        raise ValueError("Для сжатия zstd нужен пакет zstandard (pip install zstandard)")
+    return zstandard
+
+
+def compress_block(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    """Сжимает один блок независимо от остальных."""
+    level = DEFAULT_LEVELS[codec] if level is None else level
+    if codec == "zstd":
+        return bytes(_zstandard().ZstdCompressor(level=level).compress(data))
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 — формат gzip
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress_block(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return bytes(_zstandard().ZstdDecompressor().decompress(data))
+    return zlib.decompress(data, 31)
+
+
+def _decompressor(codec: str) -> Any:
+    """Потоковый распаковщик одного блока (unused_data — начало следующего блока)."""
+    if codec == "zstd":
+        return _zstandard().ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(31)
+
+
+def _url_positions(url: Any, bits: int) -> Tuple[int, int]:
+    digest = hashlib.blake2b(str(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest[:4], "little") % bits, int.from_bytes(digest[4:], "little") % bits
+
+
+def _url_mask(items: Sequence[Dict[str, Any]]) -> Tuple[int, int]:
+    """Битовая маска url блока: (число бит, маска)."""
+    bits = 64
+    while bits < URL_MASK_BITS * len(items):
+        bits *= 2
+    mask = 0
+    for item in items:
+        for position in _url_positions(item.get("url"), bits):
+            mask |= 1 << position
+    return bits, mask
+
+
+class BlockCompressedHandler(FileHandler):
+    """Хранилище из независимо сжатых блоков записей с оглавлением блоков."""
+
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        codec: Optional[str] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        level: Optional[int] = None,
+    ) -> None:
+        """:param filename: Имя файла
+        :param fields: Колонки CSV (по умолчанию VACANCY_FIELDS)
+        :param codec: "gzip" или "zstd" (по умолчанию — по расширению файла)
+        :param block_size: Записей в одном блоке
+        :param level: Уровень сжатия (по умолчанию 6 для gzip и 3 для zstd)"""
+        super().__init__(filename, fields)
+        self.codec = codec or codec_for(self.filename)
+        if self.codec not in CODECS:
+            raise ValueError(f"Неизвестный кодек сжатия: {self.codec}")
+        if self.codec == "zstd":
+            _zstandard()
+        self.block_size = max(1, block_size)
+        self.level = level
+        self._blocks: Optional[List[Dict[str, Any]]] = None
+        self._blocks_stamp: Optional[Tuple[int, int]] = None
+
+    def _options(self) -> Dict[str, Any]:
+        return {**super()._options(), "codec": self.codec, "block_size": self.block_size, "level": self.level}
+
+    @abstractmethod
+    def _encode_block(self, items: Sequence[Dict[str, Any]]) -> bytes: ...
+
+    """Несжатое содержимое блока."""
+
+    @abstractmethod
+    def _decode_block(self, data: bytes) -> List[Dict[str, Any]]: ...
+
+    """Записи из несжатого содержимого блока."""
+
+    @property
+    def block_index_path(self) -> Path:
+        return self.filename.with_name(self.filename.name + BLOCK_INDEX_SUFFIX)
+
+    # ------------------ Оглавление блоков ------------------
+    def blocks(self) -> List[Dict[str, Any]]:
+        """Оглавление блоков (перечитывается при изменении файла, восстанавливается, если устарело)."""
+        self._ensure_file()
+        stat = os.stat(self.filename)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._blocks is not None and self._blocks_stamp == stamp:
+            return self._blocks
+        blocks = None
+        if self.block_index_path.exists():
+            with open(self.block_index_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("size") == stat.st_size and state.get("codec") == self.codec:
+                blocks = state["blocks"]
+        if blocks is None:
+            blocks = self._scan_blocks()
+            self._save_blocks(blocks, stat.st_size)
+        for block in blocks:
+            block["_mask"] = int(block["url_mask"], 16)
+        self._blocks, self._blocks_stamp = blocks, stamp
+        return blocks
+
+    def _save_blocks(self, blocks: List[Dict[str, Any]], size: int) -> None:
+        state = {
+            "codec": self.codec,
+            "size": size,
+            "blocks": [{k: v for k, v in block.items() if not k.startswith("_")} for block in blocks],
+        }
+        tmp_path = self.block_index_path.with_name(self.block_index_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.block_index_path)
+
+    def _scan_blocks(self) -> List[Dict[str, Any]]:
+        """Восстанавливает оглавление: находит границы блоков и пересчитывает их статистику."""
+        with open(self.filename, "rb") as f:
+            data = f.read()
+        blocks, offset = [], 0
+        while offset < len(data):
+            decompressor = _decompressor(self.codec)
+            view = memoryview(data)[offset:]
+            plain = decompressor.decompress(view)
+            if not decompressor.eof:
+                raise ValueError(f"Повреждённый блок сжатого хранилища {self.filename} (смещение {offset})")
+            length = len(view) - len(decompressor.unused_data)
+            blocks.append(self._block_entry(offset, length, self._decode_block(plain)))
+            offset += length
+        metrics.inc("compressed_index_rebuilds_total")
+        return blocks
+
+    @staticmethod
+    def _block_entry(offset: int, length: int, items: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        bits, mask = _url_mask(items)
+        return {"offset": offset, "length": length, **part_stats(items), "url_bits": bits, "url_mask": f"{mask:x}"}
+
+    @staticmethod
+    def _may_contain(block: Dict[str, Any], url: Any) -> bool:
+        return all(block["_mask"] >> position & 1 for position in _url_positions(url, block["url_bits"]))
+
+    # ------------------ Чтение и запись блоков ------------------
+    def _iter_blocks(self, blocks: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        with open(self.filename, "rb") as f:
+            for block in blocks:
+                f.seek(block["offset"])
+                with self._span("decompress"):
+                    items = self._decode_block(decompress_block(f.read(block["length"]), self.codec))
+                metrics.inc("compressed_blocks_read_total")
+                yield items
+
+    def _read_blocks(self, blocks: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        metrics.inc("compressed_blocks_skipped_total", len(self.blocks()) - len(blocks))
+        return [item for items in self._iter_blocks(blocks) for item in items]
+
+    def _write_blocks(self, items: Iterable[Dict[str, Any]], append: bool) -> None:
+        """Пишет записи новыми блоками (в конец файла или вместо его содержимого) и обновляет оглавление."""
+        blocks = list(self.blocks()) if append else []
+        with open(self.filename, "ab" if append else "wb") as f:
+            offset = f.tell()
+            for batch in batched(items, self.block_size):
+                with self._span("compress"):
+                    data = compress_block(self._encode_block(batch), self.codec, self.level)
+                f.write(data)
+                blocks.append(self._block_entry(offset, len(data), batch))
+                offset += len(data)
+        self._save_blocks(blocks, offset)
+        self._blocks = None
+
+    def _ensure_file(self) -> None:
+        if not Path(self.filename).exists():
+            Path(self.filename).touch()
+            self._save_blocks([], 0)
+
+    def _read_items(self) -> List[Dict[str, Any]]:
+        return self._read_blocks(self.blocks())
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """потоково читает записи, распаковывая по одному блоку."""
+        for items in self._iter_blocks(self.blocks()):
+            yield from items
+
+    def _write_items(self, items: List[Dict[str, Any]]) -> None:
+        self._write_blocks(items, append=False)
+
+    def _write_stream(self, items: Iterable[Dict[str, Any]]) -> None:
+        self._write_blocks(items, append=False)
+
+    # ------------------ Операции хранилища ------------------
+    def add_items(self, items: List[Dict[str, Any]]) -> int:
+        """Дописывает новые вакансии блоками в конец файла (существующие блоки не пересжимаются).
+        :return: Количество добавленных вакансий"""
+        self._ensure_file()
+        items = self._drop_near_duplicates(items)
+        with self._span("merge"):
+            new = remove_duplicates([], items, key="url")
+            known = self._known_urls([item.get("url") for item in new])
+            new = [item for item in new if item.get("url") not in known]
+        if new:
+            with self._span("write"):
+                self._write_blocks(new, append=True)
+        self._mark_changed()
+        self._update_indexes(added=new)
+        return len(new)
+
+    def count(self) -> int:
+        """Количество вакансий по оглавлению блоков (без распаковки)."""
+        self._ensure_file()
+        return sum(block["count"] for block in self.blocks())
+
+    def _known_urls(self, urls: Sequence[Any]) -> Set[Any]:
+        """Какие из urls уже есть в файле (распаковываются только блоки, маска которых их допускает)."""
+        wanted = set(urls)
+        candidates = [block for block in self.blocks() if any(self._may_contain(block, url) for url in wanted)]
+        return {item.get("url") for item in self._read_blocks(candidates)} & wanted
+
+    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Возвращает вакансии; при критериях url и location читаются только блоки, которые могут подойти."""
+        self._ensure_file()
+        return self._cached_query(criteria, lambda: self._read_blocks(self._blocks_for_criteria(criteria)))
+
+    def _blocks_for_criteria(self, criteria: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        urls: List[List[Any]] = []
+        locations: List[Set[str]] = []
+        for field, value in (criteria or {}).items():
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if field == "url":
+                urls.append(values)
+            elif field == "location" and all(isinstance(v, str) for v in values):
+                locations.append({normalize_location(v) for v in values})
+        return [
+            block
+            for block in self.blocks()
+            if all(any(self._may_contain(block, url) for url in options) for options in urls)
+            and all(not options.isdisjoint(block["locations"]) for options in locations)
+        ]
+
+    def _query_scope(
+        self,
+        location: Optional[str],
+        location_match: str,
+        date_low: Optional[float],
+        date_high: Optional[float],
+        salary_min: Optional[int],
+        salary_max: Optional[int],
+    ) -> Iterable[Dict[str, Any]]:
+        """Читает только блоки, статистика которых пересекается с критериями запроса."""
+        check = _location_check(location, location_match) if location is not None else None
+        blocks = []
+        for block in self.blocks():
+            if not ranges_overlap(block.get("min_published_at"), block.get("max_published_at"), date_low, date_high):
+                continue
+            if not ranges_overlap(block.get("min_salary"), block.get("max_salary"), salary_min, salary_max):
+                continue
+            if check is not None and not any(check({"location": loc}) for loc in block["locations"]):
+                continue
+            blocks.append(block)
+        return self._read_blocks(blocks)
+
+
+class CompressedJSONLHandler(BlockCompressedHandler):
+    """Сжатый JSONL: блок — строки JSON по одной записи."""
+
+    def _encode_block(self, items: Sequence[Dict[str, Any]]) -> bytes:
+        return "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items).encode("utf-8")
+
+    def _decode_block(self, data: bytes) -> List[Dict[str, Any]]:
+        # split("\n"), а не splitlines(): внутри строк JSON могут быть символы U+2028 и другие разделители
+        return [json.loads(line) for line in data.decode("utf-8").split("\n") if line.strip()]
+
+
+class CompressedCSVHandler(BlockCompressedHandler):
+    """Сжатый CSV: блок — заголовок и строки записей."""
+
+    def _encode_block(self, items: Sequence[Dict[str, Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.fields)
+        writer.writeheader()
+        writer.writerows({k: _flat_value(v) for k, v in item.items()} for item in items)
+        return buffer.getvalue().encode("utf-8")
+
+    def _decode_block(self, data: bytes) -> List[Dict[str, Any]]:
+        reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        header = next(reader, None)
+        return decode_rows(header, list(reader)) if header else []
+
+
+def compressed_handler(filename: str, fmt: str, fields: Optional[Sequence[str]] = None) -> BlockCompressedHandler:
+    """Хэндлер сжатого хранилища по формату (jsonl.gz, csv.gz, jsonl.zst, csv.zst)."""
+    if fmt not in COMPRESSED_FORMATS:
+        raise ValueError(f"Неизвестный формат сжатого хранилища: {fmt}")
+    records, codec = COMPRESSED_FORMATS[fmt]
+    handler_class = CompressedCSVHandler if records == "csv" else CompressedJSONLHandler
+    return handler_class(filename, fields, codec=codec)
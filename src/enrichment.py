@@ -0,0 +1,186 @@
+# Что реализовано:
+# Необязательный этап обогащения вакансий полной карточкой /vacancies/{id}: поиск hh.ru отдаёт только
+# обрезанный snippet, а полная карточка содержит описание, ключевые навыки (key_skills) и опыт (experience).
+# DetailCache — дисковый кэш карточек (JSONL с дозаписью) по id и версии вакансии (updated_at или
+# published_at): неизменённые вакансии повторно не запрашиваются.
+# Каждая новая версия карточки дописывается отдельной строкой; когда устаревших строк становится больше
+# compact_min_stale и больше, чем актуальных, put_many() перезаписывает файл по одной строке на вакансию
+# (compact()), чтобы чтение кэша при запуске не разбирало всю историю версий.
+# enrich_items() параллельно (ThreadPoolExecutor) запрашивает карточки только для промахов кэша
+# и добавляет поля description, key_skills, experience в элементы API.
+
+import html
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DATA_FOLDER
+from src.get_api import HHAPI
+from src.profiling import metrics
+
+DEFAULT_CACHE_PATH = DATA_FOLDER / "details_cache.jsonl"
+DETAIL_FIELDS = ("description", "key_skills", "experience")
+# Устаревших строк файла кэша, после которых он может быть компактизирован
+COMPACT_MIN_STALE = 1000
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def strip_html(value: Optional[str]) -> str:
+    """Превращает HTML-описание вакансии в обычный текст."""
+    if not value:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", value))).strip()
+
+
+def vacancy_version(item: Dict[str, Any]) -> str:
+    """Версия вакансии для кэша: updated_at, а если его нет — published_at."""
+    return str(item.get("updated_at") or item.get("published_at") or "")
+
+
+def extract_details(detail: Dict[str, Any]) -> Dict[str, Any]:
+    """Оставляет из карточки вакансии только нужные поля в нормализованном виде."""
+    experience = detail.get("experience")
+    return {
+        "description": strip_html(detail.get("description")),
+        "key_skills": [skill["name"] for skill in detail.get("key_skills") or [] if skill.get("name")],
+        "experience": experience.get("name") if isinstance(experience, dict) else experience,
+    }
+
+
+class DetailCache:
+    """Дисковый кэш карточек вакансий: id -> (версия, поля карточки)."""
+
+    def __init__(self, path: Optional[Path] = None, compact_min_stale: int = COMPACT_MIN_STALE) -> None:
+        """:param path: Файл кэша (JSONL, по умолчанию data/details_cache.jsonl)
+        :param compact_min_stale: Минимум устаревших строк для автоматической компактизации файла"""
+        self.__path = Path(path) if path is not None else DEFAULT_CACHE_PATH
+        self.compact_min_stale = compact_min_stale
+        self._entries: Optional[Dict[str, Tuple[str, Dict[str, Any]]]] = None
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def _load(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        if self._entries is None:
+            entries: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+            lines = 0
+            if self.__path.exists():
+                with open(self.__path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            entries[record["id"]] = (record["version"], record["details"])
+                            lines += 1
+            self._entries, self._lines = entries, lines
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    @property
+    def stale(self) -> int:
+        """Количество устаревших строк в файле (прежние версии карточек)."""
+        return self._lines - len(self._load())
+
+    def get(self, vacancy_id: str, version: str) -> Optional[Dict[str, Any]]:
+        """Возвращает закэшированную карточку, если её версия совпадает."""
+        with self._lock:
+            entry = self._load().get(vacancy_id)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def put_many(self, entries: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Сохраняет карточки (id, версия, поля) — дозаписью в конец файла.
+        Если устаревших строк накопилось больше порога и больше, чем актуальных, файл компактизируется."""
+        if not entries:
+            return
+        with self._lock:
+            cached = self._load()
+            self.__path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.__path, "a", encoding="utf-8") as f:
+                for vacancy_id, version, details in entries:
+                    cached[vacancy_id] = (version, details)
+                    record = {"id": vacancy_id, "version": version, "details": details}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._lines += len(entries)
+            stale = self._lines - len(cached)
+            if stale >= self.compact_min_stale and stale > len(cached):
+                self._rewrite()
+
+    def compact(self) -> None:
+        """Перезаписывает файл, оставляя по одной (последней) записи на вакансию."""
+        with self._lock:
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        cached = self._load()
+        tmp_path = self.__path.with_name(self.__path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for vacancy_id, (version, details) in cached.items():
+                record = {"id": vacancy_id, "version": version, "details": details}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        tmp_path.replace(self.__path)
+        self._lines = len(cached)
+        metrics.inc("details_cache_compactions_total")
+
+
+def enrich_items(
+    api_items: List[Dict[str, Any]],
+    api: Optional[HHAPI] = None,
+    cache: Optional[DetailCache] = None,
+    workers: int = 8,
+) -> List[Dict[str, Any]]:
+    """Добавляет к элементам API поля полной карточки (description, key_skills, experience).
+    :param api_items: Элементы ответа поиска (уже прошедшие дешёвые фильтры)
+    :param api: Клиент HHAPI для запросов карточек
+    :param cache: Дисковый кэш карточек
+    :param workers: Количество параллельных запросов
+    :return: Новые словари элементов; при ошибке запроса элемент остаётся без обогащения"""
+    api = api or HHAPI()
+    cache = cache if cache is not None else DetailCache()
+    details: Dict[str, Dict[str, Any]] = {}
+    missing: Dict[str, str] = {}
+    for item in api_items:
+        vacancy_id = str(item.get("id") or "")
+        if not vacancy_id or vacancy_id in details or vacancy_id in missing:
+            continue
+        version = vacancy_version(item)
+        cached = cache.get(vacancy_id, version)
+        if cached is not None:
+            details[vacancy_id] = cached
+        else:
+            missing[vacancy_id] = version
+    metrics.inc("details_cache_hits_total", len(details))
+    metrics.inc("details_cache_misses_total", len(missing))
+
+    def fetch(vacancy_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        try:
+            return vacancy_id, extract_details(api.get_vacancy_details(vacancy_id))
+        except ConnectionError:
+            metrics.inc("details_errors_total")
+            return vacancy_id, None
+
+    fetched: List[Tuple[str, str, Dict[str, Any]]] = []
+    if missing:
+        with metrics.span("enrich_seconds"):
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as executor:
+                for vacancy_id, detail in executor.map(fetch, list(missing)):
+                    if detail is not None:
+                        details[vacancy_id] = detail
+                        fetched.append((vacancy_id, missing[vacancy_id], detail))
+        cache.put_many(fetched)
+
+    enriched = []
+    for item in api_items:
+        detail = details.get(str(item.get("id") or ""))
+        enriched.append({**item, **{k: v for k, v in detail.items() if v}} if detail else dict(item))
+    return enriched
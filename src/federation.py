@@ -0,0 +1,103 @@
+# Что реализовано:
+# federated_search() — поиск вакансий сразу во всех источниках (HHAPI, SuperJobAPI, HabrCareerAPI и др.):
+# каждый источник опрашивается в своём потоке, у каждого — свой срок ожидания (timeouts, default_timeout).
+# Источник, не уложившийся в срок или ответивший ошибкой, не задерживает остальные: его результат
+# пропускается, а в отчёте по источникам отмечается статус timeout / error.
+# Результаты объединяются в порядке источников с дедупликацией между источниками: одна и та же вакансия,
+# опубликованная на нескольких площадках (совпадают нормализованные название, работодатель и город),
+# остаётся только из первого источника. Внутри одного источника вакансии различаются по url.
+# Опрос источников и найденные дубликаты замеряются в реестре metrics (federated_*).
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from src.get_api import VacancyAPI
+from src.profiling import metrics
+
+DEFAULT_SOURCE_TIMEOUT = 60.0
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_text(value: Any) -> str:
+    """Строка для сравнения: нижний регистр, ё -> е, без знаков препинания и лишних пробелов."""
+    return _NON_WORD.sub(" ", str(value or "").lower().replace("ё", "е")).strip()
+
+
+def dedup_key(item: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Ключ вакансии для дедупликации между источниками: название, работодатель, город."""
+    return (
+        normalize_text(item.get("name")),
+        normalize_text((item.get("employer") or {}).get("name")),
+        normalize_text((item.get("area") or {}).get("name")),
+    )
+
+
+def _fetch(provider: VacancyAPI, keyword: str) -> Tuple[List[Dict[str, Any]], float]:
+    started = time.perf_counter()
+    items = provider.get_vacancies(keyword)
+    return items, time.perf_counter() - started
+
+
+def federated_search(
+    keyword: str,
+    providers: Sequence[VacancyAPI],
+    timeouts: Optional[Mapping[str, float]] = None,
+    default_timeout: float = DEFAULT_SOURCE_TIMEOUT,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Параллельный поиск по всем источникам с объединением результатов.
+    :param keyword: Поисковый запрос
+    :param providers: Клиенты источников (порядок задаёт приоритет при дедупликации)
+    :param timeouts: Срок ожидания источника по имени, с
+    :param default_timeout: Срок ожидания для источников, не указанных в timeouts, с
+    :return: Вакансии в общей схеме и отчёт {источник: {status, count, seconds[, error]}}"""
+    timeouts = timeouts or {}
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, len(providers)), thread_name_prefix="federated")
+    futures = [(provider.name, executor.submit(_fetch, provider, keyword)) for provider in providers]
+    # Не ждём зависших источников: их потоки завершатся сами по таймауту HTTP-запроса
+    executor.shutdown(wait=False)
+
+    batches: List[Tuple[str, List[Dict[str, Any]]]] = []
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, future in futures:
+        deadline = started + timeouts.get(name, default_timeout)
+        try:
+            items, seconds = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            future.cancel()
+            report[name] = {"status": "timeout", "count": 0, "seconds": round(time.monotonic() - started, 3)}
+        except Exception as e:
+            # Любая ошибка источника (сеть, разбор или нормализация ответа) не должна прерывать остальные
+            report[name] = {"status": "error", "count": 0, "seconds": round(time.monotonic() - started, 3)}
+            report[name]["error"] = str(e) or type(e).__name__
+        else:
+            batches.append((name, items))
+            report[name] = {"status": "ok", "count": len(items), "seconds": round(seconds, 3)}
+            metrics.observe("federated_source_seconds", seconds, source=name)
+        metrics.inc("federated_requests_total", source=name, status=report[name]["status"])
+
+    return merge_sources(batches), report
+
+
+def merge_sources(batches: Sequence[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """Объединяет результаты источников (в порядке batches) без дубликатов по url и между источниками."""
+    owners: Dict[Tuple[str, str, str], str] = {}
+    urls = set()
+    merged: List[Dict[str, Any]] = []
+    duplicates = 0
+    for name, items in batches:
+        for item in items:
+            url = item.get("alternate_url")
+            if url in urls:
+                continue
+            if owners.setdefault(dedup_key(item), name) != name:
+                duplicates += 1
+                continue
+            urls.add(url)
+            merged.append(item)
+    metrics.inc("federated_duplicates_total", duplicates)
+    return merged
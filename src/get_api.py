@@ -2,22 +2,62 @@
 # Абстрактный класс VacancyAPI с методами:
 # _connect() — подключение к API (без реализации).
 # get_vacancies() — получение вакансий (без реализации).
-# Класс HHAPI, который:
-# Наследует абстрактный класс.
-# Приватный атрибут __base_url.
+# PagedVacancyAPI — общий клиент постраничных JSON API вакансий:
+# Адрес API, размер страницы и количество страниц задаются в конструкторе (можно указать локальный стенд).
 # Приватный метод _connect() проверяет доступность API.
-# Метод get_vacancies() принимает ключевое слово, формирует параметры (text, per_page), делает запрос и
-# возвращает список словарей из ключа "items".
+# iter_pages() отдаёт вакансии постранично, get_vacancies() собирает их в один список.
+# date_from — только вакансии, опубликованные не раньше даты (если API источника это умеет, иначе без фильтра).
+# Можно передать requests.Session (session=...): соединения с API переиспользуются между запросами.
+# seen=... — множество (обычно seen_filter.SeenFilter) url уже сохранённых вакансий: iter_pages() отбрасывает
+# такие вакансии до конвертации и прекращает загрузку на странице, где все вакансии уже известны.
+# Библиотека requests импортируется лениво — при первом запросе, а не при импорте модуля,
+# чтобы CLI быстро запускался (атрибут модуля requests доступен через __getattr__).
+# При ответе 429 запрос повторяется после паузы из Retry-After (или с экспоненциальной задержкой).
+# Каждый запрос страницы замеряется в реестре metrics: задержка, размер ответа, статус, разбор JSON
+# (метка source — имя источника).
+# Источники (реестр PROVIDERS, get_provider()):
+# HHAPI (hh) — API hh.ru; get_vacancy_details() запрашивает полную карточку вакансии /vacancies/{id}.
+# SuperJobAPI (superjob) — API SuperJob (/2.0/vacancies, ключ приложения X-Api-App-Id).
+# HabrCareerAPI (habr) — API Хабр Карьеры (/api/frontend/vacancies).
+# Все источники отдают вакансии в одной схеме — схеме элемента поиска hh.ru, которую понимает
+# pipeline.convert_api_to_vacancy(): id, name, area.name, employer.name, salary.from/to/currency,
+# published_at, alternate_url, snippet.requirement, опционально experience.name и key_skills,
+# и поле source (имя источника; у элементов hh.ru не добавляется — его отсутствие означает hh).
 
+from __future__ import annotations
+
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Container, Dict, Iterator, List, Optional, Type, Union
+from urllib.parse import urljoin
+
+from src.profiling import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый доступ к src.get_api.requests (импорт при первом обращении)."""
+    if name == "requests":
+        import requests
 
-import requests
+        return requests
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Часовой пояс дат SuperJob (unix-время публикации переводится в дату по Москве)
+MSK = timezone(timedelta(hours=3))
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
 
 
 class VacancyAPI(ABC):
     """Абстрактный класс для работы с API сервисов вакансий."""
 
+    name = ""
+
     @abstractmethod
     def _connect(self) -> requests.Response:
         """Подключение к API. Должно возвращать объект Response."""
@@ -33,17 +73,61 @@ class VacancyAPI(ABC):
         pass
 
 
-class HHAPI(VacancyAPI):
-    """Класс для работы с API hh.ru."""
+class PagedVacancyAPI(VacancyAPI):
+    """Общий клиент постраничного JSON API вакансий: повторы при 429, замеры, разбор страниц."""
 
-    def __init__(self) -> None:
-        self._base_url = "https://api.hh.ru/vacancies"
+    DEFAULT_URL = ""
+    FIRST_PAGE = 0
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        per_page: int = 20,
+        pages: int = 1,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        headers: Optional[Dict[str, str]] = None,
+        session: Optional[requests.Session] = None,
+        seen: Optional[Container[Any]] = None,
+    ) -> None:
+        """:param base_url: Адрес API (по умолчанию DEFAULT_URL источника)
+        :param per_page: Количество вакансий на странице
+        :param pages: Максимальное количество запрашиваемых страниц
+        :param timeout: Таймаут запроса в секундах
+        :param max_retries: Количество повторов при ответе 429 (Too Many Requests)
+        :param backoff: Базовая пауза перед повтором, если сервер не прислал Retry-After
+        :param headers: Дополнительные заголовки запросов (например, ключ приложения)
+        :param session: Сессия requests для переиспользования соединений (None — отдельный запрос)
+        :param seen: url уже сохранённых вакансий (None — отдавать все вакансии)"""
+        self._base_url = base_url or self.DEFAULT_URL
+        self._per_page = per_page
+        self._pages = pages
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._headers = dict(headers or {})
+        self._session = session
+        self._seen = seen
         self.__last_response: requests.Response | None = None
 
+    def _request_options(self) -> Dict[str, Any]:
+        return {"headers": self._headers} if self._headers else {}
+
+    def _http_get(self, url: str, **options: Any) -> requests.Response:
+        """GET через сессию (если задана) или requests.get."""
+        import requests
+
+        client: Any = self._session if self._session is not None else requests
+        response: requests.Response = client.get(url, **options, **self._request_options())
+        return response
+
     def _connect(self) -> requests.Response:
         """Приватный метод подключения к API."""
+        import requests
+
         try:
-            response = requests.get(self._base_url, timeout=10)
+            response = self._http_get(self._base_url, timeout=self._timeout)
             if response.status_code != 200:
                 raise ConnectionError(f"Ошибка подключения: {response.status_code} {response.reason}")
             self.__last_response = response
@@ -51,22 +135,242 @@ class HHAPI(VacancyAPI):
         except requests.RequestException as e:
             raise ConnectionError(f"Ошибка сети: {e}")
 
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Пауза перед повтором: Retry-After из ответа или экспоненциальная задержка."""
+        try:
+            return max(0.0, float(response.headers.get("Retry-After", "")))
+        except (TypeError, ValueError):
+            return float(self._backoff * 2**attempt)
+
+    def _request(self, url: str, params: Optional[Dict[str, Union[str, int]]] = None) -> requests.Response:
+        """GET-запрос с замерами и повтором при ответе 429."""
+        import requests
+
+        for attempt in range(self._max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self._http_get(url, params=params, timeout=self._timeout)
+            except requests.RequestException as e:
+                metrics.inc("api_errors_total", source=self.name)
+                raise ConnectionError(f"Ошибка запроса вакансий: {e}")
+            if metrics.enabled:
+                metrics.observe("api_request_seconds", time.perf_counter() - started, source=self.name)
+                metrics.inc("api_requests_total", source=self.name, status=response.status_code)
+                metrics.inc("api_response_bytes_total", len(response.content or b""), source=self.name)
+            if response.status_code != 429 or attempt == self._max_retries:
+                return response
+            time.sleep(self._retry_delay(response, attempt))
+        return response
+
+    def _parse_json(self, response: requests.Response, what: str) -> Dict[str, Any]:
+        """Разбор JSON-ответа; ошибка статуса или разбора — ConnectionError."""
+        if response.status_code != 200:
+            raise ConnectionError(f"Ошибка при получении {what}: {response.status_code} {response.reason}")
+        with metrics.span("json_parse_seconds", source=self.name):
+            try:
+                data: Any = response.json()
+            except ValueError as e:
+                raise ConnectionError(f"Ошибка запроса {what}: {e}")
+        return data if isinstance(data, dict) else {}
+
+    # ------------------ Формат источника ------------------
+    @abstractmethod
+    def _page_params(self, keyword: str, page: int) -> Dict[str, Union[str, int]]:
+        """Параметры запроса страницы page поиска по keyword."""
+
+    @abstractmethod
+    def _page_items(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Вакансии из ответа страницы (в формате источника)."""
+
+    @abstractmethod
+    def _has_more(self, data: Dict[str, Any], page: int) -> bool:
+        """Есть ли страницы после page."""
+
+    def _since_params(self, date_from: datetime) -> Dict[str, Union[str, int]]:
+        """Параметры запроса «опубликованы не раньше date_from» (пусто — источник так не умеет)."""
+        return {}
+
+    def normalize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Приводит вакансию источника к общей схеме (схеме элемента поиска hh.ru)."""
+        return item
+
+    # ------------------ Поиск ------------------
+    def _get_page(self, keyword: str, page: int, date_from: Optional[datetime] = None) -> Dict[str, Any]:
+        """Запрос одной страницы результатов поиска."""
+        params = self._page_params(keyword, page)
+        if date_from is not None:
+            params.update(self._since_params(date_from))
+        response = self._request(self._base_url, params)
+        return self._parse_json(response, "вакансий")
+
+    def iter_pages(self, keyword: str, date_from: Optional[datetime] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Постранично отдаёт вакансии (в общей схеме) по ключевому слову, пока не закончатся страницы.
+        :param date_from: Только вакансии, опубликованные не раньше (если источник поддерживает фильтр)"""
+        for number in range(self._pages):
+            page = self.FIRST_PAGE + number
+            data = self._get_page(keyword, page, date_from)
+            items = [self.normalize(item) for item in self._page_items(data)]
+            fresh = self._unseen(items)
+            if fresh:
+                yield fresh
+            if not fresh or not self._has_more(data, page):
+                break
+
+    def _unseen(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Вакансии страницы, которых нет среди уже сохранённых (seen)."""
+        if self._seen is None or not items:
+            return items
+        seen = self._seen
+        fresh = [item for item in items if item.get("alternate_url") not in seen]
+        metrics.inc("api_known_items_total", len(items) - len(fresh), source=self.name)
+        return fresh
+
     def get_vacancies(self, keyword: str) -> List[Dict[str, Any]]:
-        """Получение вакансий с hh.ru по ключевому слову."""
+        """Получение вакансий по ключевому слову."""
         # Проверяем соединение перед запросом
         self._connect()
 
-        params: Dict[str, Union[str, int]] = {
+        items: List[Dict[str, Any]] = []
+        for page_items in self.iter_pages(keyword):
+            items.extend(page_items)
+        return items
+
+
+class HHAPI(PagedVacancyAPI):
+    """Класс для работы с API hh.ru."""
+
+    name = "hh"
+    DEFAULT_URL = "https://api.hh.ru/vacancies"
+
+    def _page_params(self, keyword: str, page: int) -> Dict[str, Union[str, int]]:
+        return {
             "text": str(keyword),  # явно приводим к str
-            "per_page": 20,  # int
-            "page": 0,  # int
+            "per_page": self._per_page,  # int
+            "page": page,  # int
         }
-        try:
-            response = requests.get(self._base_url, params=params, timeout=10)
-            if response.status_code != 200:
-                raise ConnectionError(f"Ошибка при получении вакансий: {response.status_code} {response.reason}")
-            data: Any = response.json()
-            items: List[Dict[str, Any]] = data.get("items", [])  # явно указываем тип
-            return items
-        except requests.RequestException as e:
-            raise ConnectionError(f"Ошибка запроса вакансий: {e}")
+
+    def _page_items(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = data.get("items", [])  # явно указываем тип
+        return items
+
+    def _has_more(self, data: Dict[str, Any], page: int) -> bool:
+        total_pages = data.get("pages")
+        return not (isinstance(total_pages, int) and page + 1 >= total_pages)
+
+    def _since_params(self, date_from: datetime) -> Dict[str, Union[str, int]]:
+        return {"date_from": date_from.strftime(DATE_FORMAT), "order_by": "publication_time"}
+
+    def get_vacancy_details(self, vacancy_id: str) -> Dict[str, Any]:
+        """Запрос полной карточки вакансии /vacancies/{id} (описание, key_skills, experience)."""
+        response = self._request(f"{self._base_url.rstrip('/')}/{vacancy_id}")
+        return self._parse_json(response, f"вакансии {vacancy_id}")
+
+
+class SuperJobAPI(PagedVacancyAPI):
+    """Класс для работы с API SuperJob."""
+
+    name = "superjob"
+    DEFAULT_URL = "https://api.superjob.ru/2.0/vacancies/"
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None, **options: Any) -> None:
+        """:param api_key: Ключ приложения (по умолчанию — переменная окружения SUPERJOB_API_KEY)
+        Остальные параметры — как у PagedVacancyAPI."""
+        api_key = api_key or os.environ.get("SUPERJOB_API_KEY")
+        headers = dict(options.pop("headers", None) or {})
+        if api_key:
+            headers["X-Api-App-Id"] = api_key
+        super().__init__(base_url, headers=headers, **options)
+
+    def _page_params(self, keyword: str, page: int) -> Dict[str, Union[str, int]]:
+        return {"keyword": str(keyword), "count": self._per_page, "page": page}
+
+    def _page_items(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = data.get("objects", [])
+        return items
+
+    def _has_more(self, data: Dict[str, Any], page: int) -> bool:
+        return bool(data.get("more"))
+
+    def _since_params(self, date_from: datetime) -> Dict[str, Union[str, int]]:
+        return {"date_published_from": int(date_from.timestamp())}
+
+    def normalize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        salary_from, salary_to = item.get("payment_from") or None, item.get("payment_to") or None
+        published = item.get("date_published")
+        return {
+            "id": str(item.get("id", "")),
+            "name": item.get("profession") or "",
+            "area": {"name": (item.get("town") or {}).get("title") or "Не указано"},
+            "employer": {"name": item.get("firm_name")},
+            "salary": (
+                {"from": salary_from, "to": salary_to, "currency": str(item.get("currency") or "rub").upper()}
+                if salary_from or salary_to
+                else None
+            ),
+            "published_at": datetime.fromtimestamp(published, MSK).strftime(DATE_FORMAT) if published else None,
+            "alternate_url": item.get("link"),
+            "snippet": {"requirement": item.get("candidat"), "responsibility": item.get("work")},
+            "experience": {"name": (item.get("experience") or {}).get("title")},
+            "source": self.name,
+        }
+
+
+class HabrCareerAPI(PagedVacancyAPI):
+    """Класс для работы с API Хабр Карьеры."""
+
+    name = "habr"
+    DEFAULT_URL = "https://career.habr.com/api/frontend/vacancies"
+    FIRST_PAGE = 1
+
+    def _page_params(self, keyword: str, page: int) -> Dict[str, Union[str, int]]:
+        return {"q": str(keyword), "per_page": self._per_page, "page": page}
+
+    def _page_items(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = data.get("list", [])
+        return items
+
+    def _has_more(self, data: Dict[str, Any], page: int) -> bool:
+        total_pages = (data.get("meta") or {}).get("totalPages")
+        return not (isinstance(total_pages, int) and page >= total_pages)
+
+    def normalize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        locations = item.get("locations") or []
+        location = locations[0].get("title") if locations else ("Удалённо" if item.get("remoteWork") else None)
+        salary = item.get("salary") or {}
+        published = (item.get("publishedDate") or {}).get("date")
+        skills = [skill.get("title") for skill in item.get("skills") or [] if skill.get("title")]
+        return {
+            "id": str(item.get("id", "")),
+            "name": item.get("title") or "",
+            "area": {"name": location or "Не указано"},
+            "employer": {"name": (item.get("company") or {}).get("title")},
+            "salary": (
+                {"from": salary.get("from"), "to": salary.get("to"), "currency": str(salary.get("currency") or "rur")}
+                if salary.get("from") or salary.get("to")
+                else None
+            ),
+            "published_at": datetime.fromisoformat(published).strftime(DATE_FORMAT) if published else None,
+            "alternate_url": urljoin(self._base_url, item["href"]) if item.get("href") else None,
+            "snippet": {"requirement": ", ".join(skills) or None, "responsibility": None},
+            "key_skills": skills,
+            "source": self.name,
+        }
+
+
+# Реестр источников вакансий: имя -> класс клиента
+PROVIDERS: Dict[str, Type[PagedVacancyAPI]] = {api.name: api for api in (HHAPI, SuperJobAPI, HabrCareerAPI)}
+
+
+def register_provider(api: Type[PagedVacancyAPI]) -> Type[PagedVacancyAPI]:
+    """Добавляет класс клиента в реестр PROVIDERS (можно использовать как декоратор)."""
+    if not api.name:
+        raise ValueError("У источника вакансий должно быть имя (атрибут name)")
+    PROVIDERS[api.name] = api
+    return api
+
+
+def get_provider(name: str, **options: Any) -> PagedVacancyAPI:
+    """Создаёт клиент источника по имени из реестра; options — параметры конструктора."""
+    if name not in PROVIDERS:
+        raise ValueError(f"Неизвестный источник вакансий: {name}")
+    return PROVIDERS[name](**options)
@@ -0,0 +1,307 @@
+# Что реализовано:
+# Абстрактный класс ItemIndex — общий интерфейс индексов над хранилищами вакансий.
+# Индекс подключается к любому FileHandler через attach_index() и получает уведомления
+# о добавленных и удалённых записях (add_items / remove_items).
+# Идентификатором записи везде служит url — тот же ключ, по которому удаляются дубликаты.
+# Индексы с файлом на диске сохраняются через save() с атомарной заменой файла.
+# Постоянные индексы (persistent = True, например SeenFilter) помнят и удалённые из хранилища записи:
+# перестроение (rebuild, FileHandler.rebuild_indexes после компактизации или replace_items) их не очищает,
+# а только дополняет текущими записями.
+# Вторичные индексы:
+# LocationIndex — локация -> url, поиск по точному значению, префиксу и подстроке (отсортированный список ключей).
+# DateIndex и SalaryIndex — отсортированные индексы по published_at и salary для запросов по диапазону.
+
+import json
+import os
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+
+class ItemIndex(ABC):
+    """Абстрактный индекс над записями вакансий (словарями с ключом url)."""
+
+    # Индекс помнит записи, удалённые из хранилища: при перестроении не очищается
+    persistent = False
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """:param path: Файл для сохранения индекса (None — только в памяти)"""
+        self._path = Path(path) if path is not None else None
+
+    @abstractmethod
+    def add_items(self, items: List[Dict[str, Any]]) -> None: ...
+
+    """Добавляет записи в индекс (повторный url заменяет старую запись)."""
+
+    @abstractmethod
+    def remove_items(self, items: List[Dict[str, Any]]) -> None: ...
+
+    """Удаляет записи из индекса."""
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    """Полностью очищает индекс."""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def rebuild(self, items: List[Dict[str, Any]]) -> None:
+        """Перестраивает индекс с нуля по переданным записям (постоянный индекс только дополняется)."""
+        if not self.persistent:
+            self.clear()
+        self.add_items(items)
+
+    @abstractmethod
+    def _dump_state(self) -> Dict[str, Any]: ...
+
+    """Состояние индекса для сохранения на диск."""
+
+    @abstractmethod
+    def _load_state(self, state: Dict[str, Any]) -> None: ...
+
+    """Восстанавливает индекс из сохранённого состояния."""
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def save(self) -> None:
+        """Сохраняет индекс в файл (через временный файл и os.replace)."""
+        if self._path is None:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._dump_state(), f, ensure_ascii=False)
+        os.replace(tmp_path, self._path)
+
+    def load(self) -> bool:
+        """Загружает индекс из файла. Возвращает False, если файла нет."""
+        if self._path is None or not self._path.exists():
+            return False
+        with open(self._path, "r", encoding="utf-8") as f:
+            self._load_state(json.load(f))
+        return True
+
+
+def normalize_location(value: Any) -> str:
+    """Нормализует название локации для поиска: нижний регистр, ё -> е, без лишних пробелов."""
+    if not isinstance(value, str):
+        return ""
+    return " ".join(value.lower().replace("ё", "е").split())
+
+
+def to_timestamp(value: Any) -> Optional[float]:
+    """Переводит дату (datetime или строку ISO) в timestamp. Даты без часового пояса считаются UTC."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    moment: datetime = value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def to_salary(value: Any) -> Optional[int]:
+    """Переводит зарплату из файла (int, float или строка) в int."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+class LocationIndex(ItemIndex):
+    """Индекс локация -> множество url с поиском по точному значению, префиксу и подстроке."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        super().__init__(path)
+        self.clear()
+
+    def clear(self) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+        self._by_url: Dict[str, str] = {}
+        self._sorted_keys: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def add_items(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            url = item.get("url")
+            if not url:
+                continue
+            self._discard(url)
+            key = normalize_location(item.get("location"))
+            if key not in self._postings:
+                self._postings[key] = set()
+                self._sorted_keys = None
+            self._postings[key].add(url)
+            self._by_url[url] = key
+
+    def remove_items(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            url = item.get("url")
+            if url:
+                self._discard(url)
+
+    def _discard(self, url: str) -> None:
+        key = self._by_url.pop(url, None)
+        if key is None:
+            return
+        postings = self._postings[key]
+        postings.discard(url)
+        if not postings:
+            del self._postings[key]
+            self._sorted_keys = None
+
+    @property
+    def keys(self) -> List[str]:
+        """Отсортированный список нормализованных локаций (перестраивается лениво)."""
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._postings)
+        return self._sorted_keys
+
+    def lookup(self, location: str, match: str = "exact") -> Set[str]:
+        """Возвращает url вакансий по локации.
+        :param location: Искомая локация
+        :param match: "exact" — точное совпадение, "prefix" — по началу, "substring" — по подстроке"""
+        query = normalize_location(location)
+        if match == "exact":
+            return set(self._postings.get(query, set()))
+        keys = self.keys
+        if match == "prefix":
+            start = bisect_left(keys, query)
+            end = bisect_left(keys, query + "\uffff")
+            matched = keys[start:end]
+        elif match == "substring":
+            matched = [key for key in keys if query in key]
+        else:
+            raise ValueError("Тип совпадения должен быть 'exact', 'prefix' или 'substring'")
+        result: Set[str] = set()
+        for key in matched:
+            result.update(self._postings[key])
+        return result
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {key: sorted(urls) for key, urls in self._postings.items()}
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.clear()
+        for key, urls in state.items():
+            self._postings[key] = set(urls)
+            for url in urls:
+                self._by_url[url] = key
+
+
+class SortedIndex(ItemIndex):
+    """Отсортированный индекс числового поля: диапазонные запросы через bisect."""
+
+    field = ""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        super().__init__(path)
+        self.clear()
+
+    def clear(self) -> None:
+        self._keys: List[float] = []
+        self._urls: List[str] = []
+        self._by_url: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    @abstractmethod
+    def _key(self, value: Any) -> Optional[float]: ...
+
+    """Приводит значение поля к числовому ключу (None — запись не индексируется)."""
+
+    def add_items(self, items: List[Dict[str, Any]]) -> None:
+        batch: Dict[str, float] = {}
+        for item in items:
+            url = item.get("url")
+            key = self._key(item.get(self.field))
+            if not url:
+                continue
+            self._discard(url)
+            batch.pop(url, None)
+            if key is not None:
+                batch[url] = key
+        pairs = [(key, url) for url, key in batch.items()]
+        if not pairs:
+            return
+        if len(pairs) > 64:
+            # Большие пакеты дешевле досортировать целиком, чем вставлять по одному
+            for key, url in pairs:
+                self._by_url[url] = key
+            merged = sorted(zip(self._keys + [k for k, _ in pairs], self._urls + [u for _, u in pairs]))
+            self._keys = [k for k, _ in merged]
+            self._urls = [u for _, u in merged]
+            return
+        for key, url in pairs:
+            position = bisect_right(self._keys, key)
+            self._keys.insert(position, key)
+            self._urls.insert(position, url)
+            self._by_url[url] = key
+
+    def remove_items(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            url = item.get("url")
+            if url:
+                self._discard(url)
+
+    def _discard(self, url: str) -> None:
+        key = self._by_url.pop(url, None)
+        if key is None:
+            return
+        position = bisect_left(self._keys, key)
+        while position < len(self._keys) and self._keys[position] == key:
+            if self._urls[position] == url:
+                del self._keys[position]
+                del self._urls[position]
+                return
+            position += 1
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> Set[str]:
+        """Возвращает url записей с ключом в диапазоне [low, high] (границы включительно)."""
+        start = 0 if low is None else bisect_left(self._keys, low)
+        end = len(self._keys) if high is None else bisect_right(self._keys, high)
+        return set(self._urls[start:end])
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {"keys": self._keys, "urls": self._urls}
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.clear()
+        self._keys = list(state.get("keys", []))
+        self._urls = list(state.get("urls", []))
+        self._by_url = dict(zip(self._urls, self._keys))
+
+
+class DateIndex(SortedIndex):
+    """Отсортированный индекс по дате публикации (published_at) для запросов по диапазону дат."""
+
+    field = "published_at"
+
+    def _key(self, value: Any) -> Optional[float]:
+        return to_timestamp(value)
+
+    def between(self, date_from: Any = None, date_to: Any = None) -> Set[str]:
+        """url вакансий, опубликованных в диапазоне [date_from, date_to] (datetime или строка ISO)."""
+        return self.range(to_timestamp(date_from), to_timestamp(date_to))
+
+
+class SalaryIndex(SortedIndex):
+    """Отсортированный индекс по зарплате для пересечения с другими индексами."""
+
+    field = "salary"
+
+    def _key(self, value: Any) -> Optional[float]:
+        return to_salary(value)
@@ -0,0 +1,160 @@
+# Что реализовано:
+# compact_store() — обслуживание хранилища вакансий любого формата (FileHandler или ShardedHandler):
+# удаляет вакансии старше окна хранения (retention_days) и устаревшие версии (для каждого url
+# остаётся запись с самой поздней датой публикации, при равенстве — последняя в файле).
+# Хранилище читается потоково (iter_items) в два прохода: в памяти держится только url -> (дата, позиция),
+# а не сами записи. Результат пишется во временный файл того же формата и с теми же параметрами хэндлера
+# и атомарно подменяет исходный (os.replace); JSONL, JSON и CSV пишутся потоково, XLSX — целиком.
+# У секционированного хранилища самая свежая версия url выбирается по всем секциям сразу (перепубликация
+# могла попасть в секцию другого месяца), затем секции переписываются по одной, статистика манифеста
+# и карта url пересчитываются.
+# Подключённые к хранилищу индексы перестраиваются пакетами по INDEX_BATCH_SIZE записей.
+# remove_near_duplicates() так же переписывает хранилище без почти-дубликатов (перепубликаций под новым url),
+# найденных find_near_duplicates() из src/near_duplicates.py.
+
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.indexes import to_timestamp
+from src.near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates
+from src.profiling import metrics
+from src.sharding import ShardedHandler
+from src.work_files import FileHandler
+
+INDEX_BATCH_SIZE = 10000
+
+
+def compact_store(
+    handler: FileHandler, retention_days: Optional[float] = None, now: Optional[datetime] = None
+) -> Dict[str, int]:
+    """Удаляет из хранилища устаревшие версии вакансий и вакансии старше окна хранения.
+    :param handler: Хранилище (файловое или секционированное)
+    :param retention_days: Окно хранения в днях (None — без удаления по дате)
+    :param now: Текущий момент для расчёта окна (по умолчанию — сейчас, UTC)
+    :return: Счётчики scanned, kept, expired, superseded"""
+    cutoff = None
+    if retention_days is not None:
+        cutoff = ((now or datetime.now(timezone.utc)) - timedelta(days=retention_days)).timestamp()
+
+    stats = {"scanned": 0, "kept": 0, "expired": 0, "superseded": 0}
+    with metrics.span("compact_seconds", handler=type(handler).__name__):
+        keys = sorted(handler.shards) if isinstance(handler, ShardedHandler) else []
+        files = [handler.shard_handler(key) for key in keys] if isinstance(handler, ShardedHandler) else [handler]
+        for file_handler, winners in zip(files, _latest_versions(files)):
+            _add_stats(stats, _compact_file(file_handler, winners, cutoff))
+        if isinstance(handler, ShardedHandler):
+            handler.refresh_shards(keys)
+        handler.rebuild_indexes(INDEX_BATCH_SIZE)
+    for name, value in stats.items():
+        metrics.inc("compact_records_total", value, result=name)
+    return stats
+
+
+def _latest_versions(files: List[FileHandler]) -> List[Set[int]]:
+    """Первый проход по всем файлам хранилища: для каждого файла — позиции самых свежих версий url
+    (среди всех файлов; при равной дате — последняя по порядку файлов и строк)."""
+    latest: Dict[str, Tuple[float, int, int]] = {}
+    for number, file_handler in enumerate(files):
+        for position, item in enumerate(file_handler.iter_items()):
+            url = item.get("url")
+            if not url:
+                continue
+            published = to_timestamp(item.get("published_at"))
+            published = float("-inf") if published is None else published
+            best = latest.get(url)
+            if best is None or published >= best[0]:
+                latest[url] = (published, number, position)
+    winners: List[Set[int]] = [set() for _ in files]
+    for _, number, position in latest.values():
+        winners[number].add(position)
+    return winners
+
+
+def _compact_file(handler: FileHandler, winners: Set[int], cutoff: Optional[float]) -> Dict[str, int]:
+    """Второй потоковый проход по файлу: остаются позиции winners не старше cutoff; файл подменяется атомарно."""
+    stats = {"scanned": 0, "kept": 0, "expired": 0, "superseded": 0}
+
+    def survivors() -> Iterator[Dict[str, Any]]:
+        for position, item in enumerate(handler.iter_items()):
+            stats["scanned"] += 1
+            if item.get("url") and position not in winners:
+                stats["superseded"] += 1
+                continue
+            published = to_timestamp(item.get("published_at"))
+            if cutoff is not None and published is not None and published < cutoff:
+                stats["expired"] += 1
+                continue
+            stats["kept"] += 1
+            yield item
+
+    # Выжившие записи пишутся во временный файл того же формата
+    _replace_file(handler, survivors())
+    return stats
+
+
+def remove_near_duplicates(
+    handler: FileHandler, threshold: float = DEFAULT_THRESHOLD, **options: Any
+) -> Dict[str, int]:
+    """Удаляет из хранилища почти-дубликаты вакансий (остаётся запись, раньше встретившаяся в хранилище).
+    :param handler: Хранилище (файловое или секционированное)
+    :param threshold: Порог сходства
+    :param options: Параметры NearDuplicateIndex (num_perm, shingle_size)
+    :return: Счётчики scanned, kept, removed"""
+    stats = {"scanned": 0, "kept": 0, "removed": 0}
+    with metrics.span("dedup_seconds", handler=type(handler).__name__):
+        duplicates = {record["url"] for record in find_near_duplicates(handler, threshold, **options)}
+        if isinstance(handler, ShardedHandler):
+            keys = sorted(handler.shards)
+            for key in keys:
+                _add_stats(stats, _drop_urls(handler.shard_handler(key), duplicates))
+            handler.refresh_shards(keys)
+        else:
+            _add_stats(stats, _drop_urls(handler, duplicates))
+        if duplicates:
+            handler.rebuild_indexes(INDEX_BATCH_SIZE)
+    return stats
+
+
+def _drop_urls(handler: FileHandler, urls: Set[str]) -> Dict[str, int]:
+    """Переписывает файл хранилища без записей с url из urls (если таких нет — файл не трогается)."""
+    stats = {"scanned": 0, "kept": 0, "removed": 0}
+    if not urls:
+        stats["scanned"] = stats["kept"] = sum(1 for _ in handler.iter_items())
+        return stats
+
+    def survivors() -> Iterator[Dict[str, Any]]:
+        for item in handler.iter_items():
+            stats["scanned"] += 1
+            if item.get("url") in urls:
+                stats["removed"] += 1
+                continue
+            stats["kept"] += 1
+            yield item
+
+    _replace_file(handler, survivors())
+    return stats
+
+
+def _replace_file(handler: FileHandler, items: Iterable[Dict[str, Any]]) -> None:
+    """Пишет записи во временный файл того же формата и атомарно подменяет им файл хранилища."""
+    path = Path(handler.filename)
+    tmp_path = path.with_name(f"{path.stem}.compact{path.suffix}")
+    tmp_handler = type(handler)(str(tmp_path), **handler._options())
+    # Оглавление блоков сжатого хранилища (src/compressed.py) подменяется вместе с файлом
+    tmp_sidecar: Optional[Path] = getattr(tmp_handler, "block_index_path", None)
+    try:
+        tmp_handler.replace_items(items)
+        os.replace(tmp_path, path)
+        if tmp_sidecar is not None:
+            os.replace(tmp_sidecar, getattr(handler, "block_index_path"))
+    finally:
+        tmp_path.unlink(missing_ok=True)
+        if tmp_sidecar is not None:
+            tmp_sidecar.unlink(missing_ok=True)
+
+
+def _add_stats(total: Dict[str, int], part: Dict[str, int]) -> None:
+    for name, value in part.items():
+        total[name] += value
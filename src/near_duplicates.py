@@ -0,0 +1,223 @@
+# Что реализовано:
+# NearDuplicateIndex — поиск почти одинаковых вакансий (перепубликаций под новым id и url) по MinHash и LSH.
+# Текст вакансии (название + работодатель + описание без HTML) разбивается на символьные шинглы, по ним
+# считается MinHash-сигнатура из num_perm хэш-функций вида (a*x + b) mod p (векторно в numpy).
+# Сигнатура делится на bands полос по rows значений (число полос подбирается под порог сходства);
+# вакансии с совпадающей полосой попадают в одну корзину и становятся кандидатами, сходство
+# кандидатов оценивается по доле совпавших позиций сигнатуры. Сравнение идёт только с кандидатами
+# из корзин, а не со всеми записями, поэтому новые пакеты проверяются без квадратичного перебора.
+# Индекс инкрементальный (add_items / remove_items) и подключается к хранилищу через attach_index():
+# тогда add_items() хранилища отбрасывает новые вакансии, почти совпадающие с уже сохранёнными
+# (как remove_duplicates для одинаковых url — остаётся запись, которая была раньше).
+# find_near_duplicates() — проход по всему хранилищу пакетами (удаление — maintenance.remove_near_duplicates()).
+# numpy импортируется только при расчёте сигнатур.
+
+import random
+import re
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.indexes import ItemIndex
+from src.profiling import metrics
+from src.services import batched
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.work_files import FileHandler
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+SHINGLE_SIZE = 5
+# Простое число Мерсенна 2^31 - 1: произведение a*x помещается в uint64
+_PRIME = (1 << 31) - 1
+_SEED = 1
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD = re.compile(r"[\W_]+")
+
+Signature = Tuple[int, ...]
+
+
+def vacancy_text(item: Dict[str, Any]) -> str:
+    """Нормализованный текст вакансии для сравнения: название, работодатель и описание без HTML."""
+    parts = (item.get("title"), item.get("employer"), _TAG_RE.sub(" ", str(item.get("description") or "")))
+    text = " ".join(str(part) for part in parts if part)
+    return _NON_WORD.sub(" ", text.lower().replace("ё", "е")).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Множество хэшей (crc32) символьных шинглов длины size."""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8"))} if text else set()
+    bounds = zip(range(len(text) - size + 1), range(size, len(text) + 1))
+    return {zlib.crc32(text[start:end].encode("utf-8")) for start, end in bounds}
+
+
+def choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Число полос и строк в полосе: самый высокий порог LSH (1/bands)^(1/rows), не превышающий threshold
+    (кандидаты с меньшим сходством затем отсеиваются по сигнатуре, а пропусков дубликатов меньше)."""
+    options = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    below = [option for option in options if (1 / option[0]) ** (1 / option[1]) <= threshold]
+    return max(below or options[-1:], key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+
+class NearDuplicateIndex(ItemIndex):
+    """Индекс MinHash-сигнатур с LSH-корзинами для поиска почти одинаковых вакансий."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = SHINGLE_SIZE,
+    ) -> None:
+        """:param path: Файл для сохранения индекса
+        :param threshold: Порог сходства (оценка коэффициента Жаккара), с которого вакансии считаются дубликатами
+        :param num_perm: Длина MinHash-сигнатуры
+        :param shingle_size: Длина символьного шингла"""
+        super().__init__(path)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+        rng = random.Random(_SEED)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        self._coefficients: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+        self.clear()
+
+    def clear(self) -> None:
+        self._signatures: Dict[str, Signature] = {}
+        self._buckets: List[Dict[Signature, Set[str]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    # ------------------ Сигнатуры ------------------
+    def signature(self, item: Dict[str, Any]) -> Signature:
+        """MinHash-сигнатура вакансии."""
+        import numpy as np
+
+        hashes = shingles(vacancy_text(item), self.shingle_size)
+        if not hashes:
+            return (_PRIME,) * self.num_perm
+        if self._coefficients is None:
+            self._coefficients = (
+                np.array(self._a, dtype=np.uint64)[:, None],
+                np.array(self._b, dtype=np.uint64)[:, None],
+            )
+        a, b = self._coefficients
+        x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % np.uint64(_PRIME)
+        return tuple(((a * x[None, :] + b) % np.uint64(_PRIME)).min(axis=1).tolist())
+
+    def _bands(self, signature: Signature) -> Iterator[Tuple[int, Signature]]:
+        for band in range(self.bands):
+            start, end = band * self.rows, (band + 1) * self.rows
+            yield band, signature[start:end]
+
+    @staticmethod
+    def similarity(first: Signature, second: Signature) -> float:
+        """Оценка коэффициента Жаккара по доле совпавших позиций сигнатур."""
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+    # ------------------ Поиск ------------------
+    def find(self, item: Dict[str, Any], signature: Optional[Signature] = None) -> List[Tuple[str, float]]:
+        """Почти одинаковые вакансии индекса (кроме записи с тем же url) по убыванию сходства.
+        :param signature: Готовая сигнатура item (если уже посчитана)
+        :return: Список (url, оценка сходства) не ниже порога"""
+        signature = signature or self.signature(item)
+        candidates: Set[str] = set()
+        for band, key in self._bands(signature):
+            candidates |= self._buckets[band].get(key, set())
+        candidates.discard(item.get("url"))
+        matches = []
+        for url in candidates:
+            score = self.similarity(signature, self._signatures[url])
+            if score >= self.threshold:
+                matches.append((url, score))
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def filter_new(self, items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Делит пакет на новые вакансии и почти-дубликаты уже проиндексированных (или более ранних в пакете).
+        Новые вакансии сразу добавляются в индекс; вакансии с уже проиндексированным url пропускаются как есть.
+        :return: (новые вакансии, записи {url, duplicate_of, similarity} по отброшенным)"""
+        kept, duplicates = [], []
+        with metrics.span("near_duplicates_seconds"):
+            for item in items:
+                if item.get("url") in self._signatures:
+                    kept.append(item)
+                    continue
+                signature = self.signature(item)
+                matches = self.find(item, signature)
+                if matches:
+                    url, score = matches[0]
+                    duplicates.append({"url": item.get("url"), "duplicate_of": url, "similarity": score})
+                    continue
+                self._add(item.get("url"), signature)
+                kept.append(item)
+        metrics.inc("near_duplicates_total", len(duplicates))
+        return kept, duplicates
+
+    # ------------------ Обновление ------------------
+    def _add(self, url: Optional[str], signature: Signature) -> None:
+        if not url:
+            return
+        self._discard(url)
+        self._signatures[url] = signature
+        for band, key in self._bands(signature):
+            self._buckets[band].setdefault(key, set()).add(url)
+
+    def _discard(self, url: str) -> None:
+        signature = self._signatures.pop(url, None)
+        if signature is None:
+            return
+        for band, key in self._bands(signature):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(url)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def add_items(self, items: List[Dict[str, Any]]) -> None:
+        # Уже проиндексированный url не пересчитывается: add_items хранилища оставляет прежнюю запись
+        for item in items:
+            url = item.get("url")
+            if url and url not in self._signatures:
+                self._add(url, self.signature(item))
+
+    def remove_items(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            if item.get("url"):
+                self._discard(item["url"])
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "shingle_size": self.shingle_size,
+            "signatures": {url: list(signature) for url, signature in self._signatures.items()},
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        if state.get("num_perm") != self.num_perm or state.get("shingle_size") != self.shingle_size:
+            raise ValueError("Параметры сохранённого индекса дубликатов не совпадают с текущими")
+        self.clear()
+        for url, signature in state["signatures"].items():
+            self._add(url, tuple(signature))
+
+
+def find_near_duplicates(
+    handler: "FileHandler", threshold: float = DEFAULT_THRESHOLD, batch_size: int = 10000, **options: Any
+) -> List[Dict[str, Any]]:
+    """Почти одинаковые вакансии во всём хранилище (потоково, пакетами по batch_size).
+    Для каждой группы дубликатов первой считается запись, раньше встретившаяся в хранилище.
+    :param handler: Хранилище (FileHandler или ShardedHandler)
+    :param options: Параметры NearDuplicateIndex (num_perm, shingle_size)
+    :return: Записи {url, duplicate_of, similarity}"""
+    index = NearDuplicateIndex(threshold=threshold, **options)
+    duplicates: List[Dict[str, Any]] = []
+    for batch in batched(handler.iter_items(), batch_size):
+        duplicates.extend(index.filter_new(batch)[1])
+    return duplicates
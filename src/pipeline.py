@@ -0,0 +1,188 @@
+# Что реализовано:
+# Общие шаги обработки вакансий, которые используют и интерактивный режим, и CLI:
+# convert_api_to_vacancy() — преобразование элемента ответа API в объект Vacancy
+# (если элемент обогащён детальной карточкой, берутся полное описание, key_skills и experience).
+# filter_by_keywords(), filter_by_location(), filter_by_salary() — фильтры (через InvertedIndex и LocationIndex).
+# filter_vacancies() — все фильтры разом, top_vacancies() — сортировка по зарплате и ТОП N.
+# parse_salary_range() — разбор диапазона зарплат вида "100000-150000".
+# process_items() — конвертация и фильтрация больших пакетов по частям в ProcessPoolExecutor
+# (результаты возвращаются компактными кортежами Vacancy.to_record и склеиваются в исходном порядке);
+# для небольших пакетов и workers=1 всё выполняется в текущем процессе.
+# Конвертация и каждый фильтр замеряются в реестре metrics (convert_seconds, filter_seconds{stage=...}).
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.indexes import LocationIndex
+from src.profiling import metrics
+from src.text_index import InvertedIndex
+from src.vacancy_get import Vacancy, VacancyRecord
+
+# Размер части пакета для одного процесса и минимальный размер пакета для параллельной обработки
+DEFAULT_CHUNK_SIZE = 5000
+PARALLEL_THRESHOLD = 20000
+
+
+def convert_api_to_vacancy(item: dict) -> Vacancy:
+    salary_data = item.get("salary")
+    salary = salary_data.get("from") if salary_data else None
+    experience = item.get("experience")
+    if isinstance(experience, dict):
+        experience = experience.get("name")
+    key_skills = item.get("key_skills")
+    if isinstance(key_skills, list):
+        key_skills = [skill.get("name") if isinstance(skill, dict) else skill for skill in key_skills]
+
+    return Vacancy(
+        title=item.get("name") or "",
+        location=item.get("area", {}).get("name", "Не указано"),
+        published_at=item.get("published_at"),
+        url=item.get("alternate_url"),
+        salary=salary,
+        description=item.get("description") or (item.get("snippet") or {}).get("requirement", "Описание не указано"),
+        key_skills=key_skills,
+        experience=experience,
+        employer=(item.get("employer") or {}).get("name"),
+    )
+
+
+def convert_items(api_items: List[Dict[str, Any]], skip_invalid: bool = False) -> List[Vacancy]:
+    """Преобразует список элементов API в вакансии.
+    :param skip_invalid: Пропускать элементы, не прошедшие валидацию Vacancy (иначе ValueError)"""
+    with metrics.span("convert_seconds"):
+        if not skip_invalid:
+            vacancies = [convert_api_to_vacancy(item) for item in api_items]
+        else:
+            vacancies = []
+            for item in api_items:
+                try:
+                    vacancies.append(convert_api_to_vacancy(item))
+                except ValueError:
+                    metrics.inc("convert_invalid_total")
+    metrics.inc("convert_items_total", len(vacancies))
+    return vacancies
+
+
+def parse_salary_range(value: str) -> Tuple[int, int]:
+    """Разбирает диапазон зарплат "100000-150000". При неверном формате — ValueError."""
+    parts = value.split("-")
+    if len(parts) != 2:
+        raise ValueError("Диапазон зарплат должен иметь вид min-max")
+    min_salary, max_salary = (int(part.strip()) for part in parts)
+    return min_salary, max_salary
+
+
+def filter_by_keywords(vacancies: List[Vacancy], words: Sequence[str], mode: str = "or") -> List[Vacancy]:
+    """Оставляет вакансии, в названии или описании которых есть ключевые слова."""
+    if not words:
+        return vacancies
+    with metrics.span("filter_seconds", stage="keywords"):
+        text_index = InvertedIndex()
+        text_index.add_items(
+            [{"url": vac.url, "title": vac.title, "description": vac.description} for vac in vacancies]
+        )
+        matched = text_index.match(words, mode=mode)
+        return [vac for vac in vacancies if vac.url in matched]
+
+
+def filter_by_location(vacancies: List[Vacancy], location: Optional[str], match: str = "substring") -> List[Vacancy]:
+    """Оставляет вакансии с подходящей локацией (без учёта регистра)."""
+    if not location:
+        return vacancies
+    with metrics.span("filter_seconds", stage="location"):
+        location_index = LocationIndex()
+        location_index.add_items([{"url": vac.url, "location": vac.location} for vac in vacancies])
+        located = location_index.lookup(location, match=match)
+        return [vac for vac in vacancies if vac.url in located]
+
+
+def filter_by_salary(
+    vacancies: List[Vacancy], min_salary: Optional[int] = None, max_salary: Optional[int] = None
+) -> List[Vacancy]:
+    """Оставляет вакансии с зарплатой в диапазоне [min_salary, max_salary]."""
+    if min_salary is None and max_salary is None:
+        return vacancies
+    with metrics.span("filter_seconds", stage="salary"):
+        return [
+            vac
+            for vac in vacancies
+            if (min_salary is None or vac.salary >= min_salary) and (max_salary is None or vac.salary <= max_salary)
+        ]
+
+
+def filter_vacancies(
+    vacancies: List[Vacancy],
+    filter_words: Sequence[str] = (),
+    location: Optional[str] = None,
+    min_salary: Optional[int] = None,
+    max_salary: Optional[int] = None,
+) -> List[Vacancy]:
+    """Применяет фильтры по ключевым словам, локации и зарплате."""
+    vacancies = filter_by_keywords(vacancies, filter_words)
+    vacancies = filter_by_location(vacancies, location)
+    return filter_by_salary(vacancies, min_salary, max_salary)
+
+
+def _process_chunk(
+    items: List[Dict[str, Any]],
+    filter_words: Sequence[str],
+    location: Optional[str],
+    min_salary: Optional[int],
+    max_salary: Optional[int],
+    skip_invalid: bool,
+) -> List[VacancyRecord]:
+    """Конвертирует и фильтрует одну часть пакета (выполняется в дочернем процессе)."""
+    vacancies = convert_items(items, skip_invalid=skip_invalid)
+    vacancies = filter_vacancies(vacancies, filter_words, location, min_salary, max_salary)
+    return [vac.to_record() for vac in vacancies]
+
+
+def process_items(
+    api_items: List[Dict[str, Any]],
+    filter_words: Sequence[str] = (),
+    location: Optional[str] = None,
+    min_salary: Optional[int] = None,
+    max_salary: Optional[int] = None,
+    skip_invalid: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+) -> List[Vacancy]:
+    """Конвертирует элементы API в вакансии и применяет фильтры, при большом пакете — в нескольких процессах.
+    :param workers: Количество процессов (None — по числу ядер, 1 — без пула)
+    :param chunk_size: Количество элементов API в одной части
+    :param parallel_threshold: Пакеты меньше этого размера обрабатываются в текущем процессе
+    :return: Вакансии в исходном порядке элементов"""
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, chunk_size)
+    if workers <= 1 or len(api_items) < max(parallel_threshold, chunk_size + 1):
+        vacancies = convert_items(api_items, skip_invalid=skip_invalid)
+        return filter_vacancies(vacancies, filter_words, location, min_salary, max_salary)
+
+    bounds = range(0, len(api_items), chunk_size)
+    chunks = [api_items[start:end] for start, end in zip(bounds, [*bounds[1:], len(api_items)])]
+    workers = min(workers, len(chunks))
+    metrics.set_gauge("process_pool_workers", workers)
+    with metrics.span("process_seconds"):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            task = partial(
+                _process_chunk,
+                filter_words=list(filter_words),
+                location=location,
+                min_salary=min_salary,
+                max_salary=max_salary,
+                skip_invalid=skip_invalid,
+            )
+            vacancies = [Vacancy.from_record(record) for part in executor.map(task, chunks) for record in part]
+    metrics.inc("process_chunks_total", len(chunks))
+    metrics.inc("process_items_total", len(api_items))
+    return vacancies
+
+
+def top_vacancies(vacancies: List[Vacancy], top_n: Optional[int] = None) -> List[Vacancy]:
+    """Сортирует вакансии по убыванию зарплаты и оставляет первые top_n."""
+    with metrics.span("filter_seconds", stage="top"):
+        ordered = sorted(vacancies, reverse=True, key=lambda v: v.salary)
+        return ordered[:top_n] if top_n else ordered
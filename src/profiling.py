@@ -0,0 +1,221 @@
+# Что реализовано:
+# Лёгкий реестр метрик MetricsRegistry: счётчики (inc), значения (set_gauge) и таймеры (span / observe).
+# Глобальный объект metrics по умолчанию выключен — span() и inc() тогда почти ничего не стоят.
+# Метки (labels) передаются именованными аргументами: metrics.span("store_seconds", handler="JSONHandler").
+# Экспорт отчёта в JSON (to_dict / write_report) и в текстовый формат Prometheus (to_prometheus).
+# profile_run() — необязательная обёртка cProfile и tracemalloc вокруг всего запуска.
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+
+class TimerStat:
+    """Накопленная статистика таймера: количество, сумма, минимум и максимум (секунды)."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "avg": self.total / self.count if self.count else 0.0,
+        }
+
+
+class MetricsRegistry:
+    """Потокобезопасный реестр счётчиков, значений и таймеров с метками."""
+
+    def __init__(self, prefix: str = "hh", enabled: bool = False) -> None:
+        """:param prefix: Префикс имён метрик при экспорте в Prometheus
+        :param enabled: Собирать ли метрики"""
+        self.prefix = prefix
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Очищает все накопленные метрики."""
+        self._counters: Dict[Tuple[str, LabelsKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelsKey], float] = {}
+        self._timers: Dict[Tuple[str, LabelsKey], TimerStat] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, LabelsKey]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Увеличивает счётчик."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Устанавливает текущее значение метрики."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Добавляет одно измерение длительности в таймер."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            stat = self._timers.get(key)
+            if stat is None:
+                stat = self._timers[key] = TimerStat()
+            stat.add(seconds)
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[None]:
+        """Замеряет длительность блока кода и записывает её в таймер name."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    # ------------------ Экспорт ------------------
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Снимок всех метрик в виде словаря (для JSON-отчёта)."""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._gauges.items())
+                ],
+                "timers": [
+                    {"name": name, "labels": dict(labels), **stat.to_dict()}
+                    for (name, labels), stat in sorted(self._timers.items(), key=lambda pair: pair[0])
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Текстовый формат Prometheus: счётчики как counter, таймеры как summary (_count/_sum)."""
+        snapshot = self.to_dict()
+        lines: List[str] = []
+        declared = set()
+
+        def metric_name(name: str) -> str:
+            return f"{self.prefix}_{name}" if self.prefix else name
+
+        def declare(name: str, kind: str) -> None:
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for entry in snapshot["counters"]:
+            name = metric_name(entry["name"])
+            declare(name, "counter")
+            lines.append(f"{name}{_format_labels(entry['labels'])} {entry['value']}")
+        for entry in snapshot["gauges"]:
+            name = metric_name(entry["name"])
+            declare(name, "gauge")
+            lines.append(f"{name}{_format_labels(entry['labels'])} {entry['value']}")
+        for entry in snapshot["timers"]:
+            name = metric_name(entry["name"])
+            declare(name, "summary")
+            labels = _format_labels(entry["labels"])
+            lines.append(f"{name}_count{labels} {entry['count']}")
+            lines.append(f"{name}_sum{labels} {entry['sum']:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: Path, fmt: Optional[str] = None) -> None:
+        """Сохраняет отчёт в файл: fmt "json" или "prometheus" (по умолчанию — по расширению .prom)."""
+        path = Path(path)
+        if fmt is None:
+            fmt = "prometheus" if path.suffix in (".prom", ".txt") else "json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            if fmt == "prometheus":
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels.items()
+    )
+    return "{" + escaped + "}"
+
+
+# Глобальный реестр, который используют HHAPI, pipeline и хэндлеры файлов
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def profile_run(
+    cprofile_path: Optional[Path] = None,
+    trace_memory: bool = False,
+    registry: Optional[MetricsRegistry] = None,
+) -> Iterator[None]:
+    """Профилирует блок кода.
+    :param cprofile_path: Файл для статистики cProfile (открывается через pstats или snakeviz)
+    :param trace_memory: Включить tracemalloc и записать пиковое потребление памяти в метрики
+    :param registry: Реестр метрик (по умолчанию глобальный metrics)"""
+    import cProfile
+    import tracemalloc
+
+    registry = registry or metrics
+    profiler = cProfile.Profile() if cprofile_path else None
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    started = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            Path(cprofile_path).parent.mkdir(parents=True, exist_ok=True)  # type: ignore[arg-type]
+            profiler.dump_stats(str(cprofile_path))
+        registry.observe("run_seconds", time.perf_counter() - started)
+        if trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            registry.set_gauge("tracemalloc_current_bytes", current)
+            registry.set_gauge("tracemalloc_peak_bytes", peak)
+            if started_tracing:
+                tracemalloc.stop()
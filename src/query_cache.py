@@ -0,0 +1,84 @@
+# Что реализовано:
+# QueryCache — кэш результатов get_items() внутри процесса.
+# Ключ — файл хранилища, его версия (счётчик изменений хэндлера, mtime и размер файла) и нормализованные критерии.
+# Вытеснение LRU по оценке занимаемой памяти (max_bytes), а не по количеству записей.
+# Хэндлер сбрасывает записи своего файла при add_items / delete_items / replace_items.
+# Записи результата не копируются: изменять словари, полученные из get_items(), нельзя.
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from src.profiling import metrics
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def estimate_size(items: List[Dict[str, Any]]) -> int:
+    """Приблизительный объём памяти списка записей: сам список, словари и их значения."""
+    size = sys.getsizeof(items)
+    for item in items:
+        size += sys.getsizeof(item)
+        for value in item.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class QueryCache:
+    """Потокобезопасный LRU-кэш результатов запросов к хранилищам с ограничением по памяти."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """:param max_bytes: Максимальный суммарный объём закэшированных результатов (оценка, байт)"""
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[List[Dict[str, Any]], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, store: str, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Возвращает копию закэшированного списка или None."""
+        with self._lock:
+            entry = self._entries.get((store, key))
+            if entry is None:
+                metrics.inc("query_cache_misses_total")
+                return None
+            self._entries.move_to_end((store, key))
+        metrics.inc("query_cache_hits_total")
+        return list(entry[0])
+
+    def put(self, store: str, key: Hashable, items: List[Dict[str, Any]]) -> None:
+        """Сохраняет результат; при превышении max_bytes вытесняет давно не использованные записи."""
+        size = estimate_size(items)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((store, key), None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[(store, key)] = (list(items), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                metrics.inc("query_cache_evictions_total")
+        metrics.set_gauge("query_cache_bytes", self._bytes)
+
+    def invalidate(self, store: Optional[str] = None) -> None:
+        """Удаляет результаты одного хранилища (или все, если store=None)."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if store is None or k[0] == store]:
+                self._bytes -= self._entries.pop(cache_key)[1]
+
+    def clear(self) -> None:
+        self.invalidate()
+
+
+# Общий кэш по умолчанию для FileHandler.enable_cache()
+query_cache = QueryCache()
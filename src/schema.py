@@ -0,0 +1,155 @@
+# Что реализовано:
+# VACANCY_SCHEMA — объявленная схема записи вакансии, общая для всех хэндлеров: поле -> тип значения.
+# Типы: "str", "int" (salary), "isodate" (published_at — строка ISO 8601, как её пишет Vacancy.to_dict;
+# объект datetime в критериях или ячейке XLSX приводится к этой строке),
+# "list" (key_skills; в CSV/XLSX хранится одной строкой через "; ").
+# Записи JSON/TXT уже хранят значения в типах схемы. Табличные форматы (CSV, XLSX) отдают строки —
+# decode_rows() один раз переводит прочитанные строки в типы схемы по столбцам (один декодер на столбец,
+# без разбора типа для каждого значения); поля вне схемы остаются как есть.
+# criteria_checks() один раз приводит критерии get_items/delete_items к типам схемы, и фильтры сравнивают
+# значения записей напрямую, без str() для каждого значения (поля вне схемы сравниваются строками, как раньше).
+# criteria_key() — ключ кэша запросов из тех же приведённых критериев: порядок элементов значения-списка
+# (key_skills) различается, порядок допустимых значений — нет.
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+LIST_SEPARATOR = "; "
+
+VACANCY_SCHEMA: Dict[str, str] = {
+    "title": "str",
+    "location": "str",
+    "published_at": "isodate",
+    "url": "str",
+    "salary": "int",
+    "description": "str",
+    "key_skills": "list",
+    "experience": "str",
+    "employer": "str",
+}
+VACANCY_FIELDS = list(VACANCY_SCHEMA)
+
+
+def _decode_str(value: Any) -> Any:
+    return value
+
+
+def _decode_int(value: Any) -> Any:
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return int(float(text))
+    except ValueError:
+        # Не число — значение остаётся как есть, чтобы не потерять данные файла
+        return value
+
+
+def _decode_isodate(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _decode_list(value: Any) -> List[Any]:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if value is None or value == "":
+        return []
+    return [part.strip() for part in str(value).split(LIST_SEPARATOR.strip()) if part.strip()]
+
+
+DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "str": _decode_str,
+    "int": _decode_int,
+    "isodate": _decode_isodate,
+    "list": _decode_list,
+}
+
+
+def decode_value(field: str, value: Any) -> Any:
+    """Значение поля в типе схемы (поля вне схемы — без изменений)."""
+    kind = VACANCY_SCHEMA.get(field)
+    return DECODERS[kind](value) if kind else value
+
+
+def decode_rows(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Строки табличного файла -> записи с типами схемы (декодирование по столбцам).
+    Короткие строки дополняются None, лишние значения отбрасываются (как у csv.DictReader без restkey).
+    :param header: Заголовок файла
+    :param rows: Строки значений"""
+    width = len(header)
+    padded = [row if len(row) == width else (list(row) + [None] * width)[:width] for row in rows]
+    if not padded:
+        return []
+    columns = []
+    for field, column in zip(header, zip(*padded)):
+        kind = VACANCY_SCHEMA.get(field)
+        columns.append(column if kind in (None, "str") else list(map(DECODERS[kind], column)))
+    return [dict(zip(header, values)) for values in zip(*columns)]
+
+
+def criteria_checks(criteria: Dict[str, Any]) -> List[Callable[[Dict[str, Any]], bool]]:
+    """Проверки записи по критериям {поле: значение или список допустимых значений}.
+    Значения критериев приводятся к типам схемы один раз."""
+    return [_field_check(field, expected) for field, expected in criteria.items()]
+
+
+def _criterion_str(value: Any) -> Any:
+    return value if value is None else str(value)
+
+
+def _field_check(field: str, expected: Any) -> Callable[[Dict[str, Any]], bool]:
+    kind = VACANCY_SCHEMA.get(field)
+    many = isinstance(expected, (list, tuple, set))
+    if kind is None:
+        # Поля вне схемы: сравнение строкового представления (прежнее поведение)
+        if many:
+            texts = {str(value) for value in expected}
+            return lambda item: str(item.get(field)) in texts
+        text = str(expected)
+        return lambda item: str(item.get(field)) == text
+
+    decode = DECODERS[kind] if kind != "str" else _criterion_str
+    if kind == "list":
+        # Список строк — одно значение поля; список списков — допустимые значения
+        alternatives = many and all(isinstance(value, (list, tuple)) for value in expected)
+        values = [decode(value) for value in expected] if alternatives else [decode(expected)]
+        return lambda item: item.get(field) in values
+    if many:
+        allowed = {decode(value) for value in expected}
+        return lambda item: item.get(field) in allowed
+    value = decode(expected)
+    return lambda item: item.get(field) == value
+
+
+def criteria_key(criteria: Dict[str, Any]) -> Tuple[Tuple[str, Hashable], ...]:
+    """Ключ кэша для критериев: значения приведены к типам схемы так же, как в criteria_checks()."""
+    return tuple(sorted(((field, _criterion_key(field, expected)) for field, expected in criteria.items())))
+
+
+def _criterion_key(field: str, expected: Any) -> Hashable:
+    kind = VACANCY_SCHEMA.get(field)
+    many = isinstance(expected, (list, tuple, set))
+    if kind is None:
+        return frozenset(str(value) for value in expected) if many else str(expected)
+    decode = DECODERS[kind] if kind != "str" else _criterion_str
+    if kind == "list":
+        # Список строк — одно значение поля (порядок важен); список списков — допустимые значения
+        if many and all(isinstance(value, (list, tuple)) for value in expected):
+            return frozenset(tuple(decode(value)) for value in expected)
+        return tuple(decode(expected))
+    if many:
+        return frozenset(decode(value) for value in expected)
+    value: Hashable = decode(expected)
+    return value
@@ -0,0 +1,200 @@
+# Что реализовано:
+# SeenFilter — постоянный масштабируемый фильтр Блума по url всех вакансий, когда-либо сохранённых в хранилище.
+# Фильтр подключается к хранилищу через attach_index() и пополняется при каждом add_items(); удаление записей
+# (delete_items, compact, dedup, replace_items) его не меняет — вакансия остаётся «виденной» и повторно
+# не загружается. Фильтр — постоянный индекс (persistent): перестроение индексов хранилища его не очищает.
+# Клиенты API (PagedVacancyAPI, параметр seen=...) по нему отбрасывают уже сохранённые вакансии страницы
+# до конвертации и прекращают постраничную загрузку на странице, где все вакансии уже известны.
+# Фильтр состоит из секций (BloomSlice): когда секция заполнена до расчётной ёмкости, добавляется новая —
+# в growth раз больше и с вероятностью ложного срабатывания, уменьшенной в tightening раз, так что общая
+# вероятность не превышает error_rate при любом числе вакансий (около 2 байт на вакансию при 0.1%).
+# Ложное срабатывание (новая вакансия принята за известную) возможно с вероятностью error_rate; ложных
+# пропусков нет. Файл фильтра — <хранилище>.seen.bloom рядом с хранилищем (для хранилищ по умолчанию —
+# в DATA_FOLDER): JSON-заголовок с параметрами секций и биты секций подряд, запись через os.replace.
+
+import hashlib
+import json
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.indexes import ItemIndex
+
+SEEN_FILTER_SUFFIX = ".seen.bloom"
+DEFAULT_CAPACITY = 100000
+DEFAULT_ERROR_RATE = 0.001
+_MAGIC = b"SEEN1"
+
+
+def seen_filter_path(store: Path) -> Path:
+    """Файл фильтра для хранилища (файла или каталога секций)."""
+    return store.with_name(store.name + SEEN_FILTER_SUFFIX)
+
+
+def _key_hashes(key: Any) -> Tuple[int, int]:
+    """Два 64-битных хэша ключа для двойного хэширования (h1 + i*h2)."""
+    digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomSlice:
+    """Одна секция фильтра Блума фиксированного размера."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None, count: int = 0) -> None:
+        """:param capacity: Расчётное количество ключей
+        :param error_rate: Вероятность ложного срабатывания при заполнении до capacity
+        :param bits: Биты секции (при загрузке с диска)
+        :param count: Количество добавленных ключей"""
+        self.capacity = capacity
+        self.error_rate = error_rate
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.size = (size + 7) // 8 * 8
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray(self.size // 8)
+        self.count = count
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def _positions(self, hashes: Tuple[int, int]) -> Iterable[int]:
+        first, second = hashes
+        return ((first + number * second) % self.size for number in range(self.hashes))
+
+    def add(self, hashes: Tuple[int, int]) -> None:
+        bits = self.bits
+        for position in self._positions(hashes):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, hashes: Tuple[int, int]) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(hashes))
+
+
+class SeenFilter(ItemIndex):
+    """Масштабируемый фильтр Блума по url сохранённых вакансий (индекс хранилища)."""
+
+    persistent = True
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        growth: int = 2,
+        tightening: float = 0.5,
+        key: str = "url",
+    ) -> None:
+        """:param path: Файл фильтра (None — только в памяти)
+        :param capacity: Ёмкость первой секции
+        :param error_rate: Допустимая вероятность ложного срабатывания всего фильтра
+        :param growth: Во сколько раз каждая следующая секция больше предыдущей
+        :param tightening: Во сколько раз уменьшается вероятность ошибки следующей секции (0 < tightening < 1)
+        :param key: Поле записи хранилища с ключом вакансии"""
+        super().__init__(path)
+        if capacity < 1 or not 0 < error_rate < 1 or growth < 1 or not 0 < tightening < 1:
+            raise ValueError("Некорректные параметры фильтра")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.key = key
+        self._slices: List[BloomSlice] = []
+        self._dirty = False
+
+    def clear(self) -> None:
+        self._slices = []
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return sum(part.count for part in self._slices)
+
+    @property
+    def slices(self) -> List[BloomSlice]:
+        return list(self._slices)
+
+    def __contains__(self, key: Any) -> bool:
+        if key is None:
+            return False
+        hashes = _key_hashes(key)
+        return any(hashes in part for part in reversed(self._slices))
+
+    def add(self, key: Any) -> bool:
+        """Добавляет ключ. Возвращает False, если ключ (вероятно) уже был в фильтре."""
+        if key is None:
+            return False
+        hashes = _key_hashes(key)
+        if any(hashes in part for part in reversed(self._slices)):
+            return False
+        if not self._slices or self._slices[-1].full:
+            number = len(self._slices)
+            # Сумма ошибок секций: error_rate * (1 - r) * (1 + r + r^2 + ...) <= error_rate
+            error = self.error_rate * (1 - self.tightening) * self.tightening**number
+            self._slices.append(BloomSlice(self.capacity * self.growth**number, error))
+        self._slices[-1].add(hashes)
+        self._dirty = True
+        return True
+
+    def add_items(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            self.add(item.get(self.key))
+
+    def remove_items(self, items: List[Dict[str, Any]]) -> None:
+        """Из фильтра Блума нельзя удалять: удалённые вакансии остаются известными."""
+
+    # ------------------ Файл ------------------
+    def _dump_state(self) -> Dict[str, Any]:
+        """Заголовок файла: параметры фильтра и секций (биты секций пишутся после него)."""
+        return {
+            "key": self.key,
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "growth": self.growth,
+            "tightening": self.tightening,
+            "slices": [[part.capacity, part.error_rate, part.count] for part in self._slices],
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        """Восстанавливает параметры и пустые секции из заголовка (биты читает load())."""
+        self.key = state["key"]
+        self.capacity = state["capacity"]
+        self.error_rate = state["error_rate"]
+        self.growth = state["growth"]
+        self.tightening = state["tightening"]
+        self._slices = [BloomSlice(capacity, error, count=count) for capacity, error, count in state["slices"]]
+        self._dirty = False
+
+    def save(self) -> None:
+        """Сохраняет фильтр, если он менялся (через временный файл и os.replace)."""
+        if self._path is None or not self._dirty:
+            return
+        data = json.dumps(self._dump_state()).encode("utf-8")
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC + struct.pack("<I", len(data)) + data)
+            for part in self._slices:
+                f.write(part.bits)
+        os.replace(tmp_path, self._path)
+        self._dirty = False
+
+    def load(self) -> bool:
+        """Загружает фильтр из файла. Возвращает False, если файла нет; повреждённый файл — ValueError."""
+        if self._path is None or not self._path.exists():
+            return False
+        with open(self._path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{self._path}: не файл фильтра")
+            (length,) = struct.unpack("<I", f.read(4))
+            self._load_state(json.loads(f.read(length).decode("utf-8")))
+            for part in self._slices:
+                bits = f.read(len(part.bits))
+                if len(bits) != len(part.bits):
+                    self.clear()
+                    raise ValueError(f"{self._path}: файл фильтра обрезан")
+                part.bits = bytearray(bits)
+        self._dirty = False
+        return True
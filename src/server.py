@@ -0,0 +1,328 @@
+# Что реализовано:
+# VacancyServer — локальный HTTP-сервис только для чтения поверх хранилищ FileHandler (stdlib, без зависимостей).
+# GET /vacancies?location=&location_match=&salary_min=&salary_max=&date_from=&date_to=&q=&mode=&sort=&limit=&cursor=
+# отдаёт вакансии потоково в JSONL (Transfer-Encoding: chunked), GET /health — состояние хранилища.
+# Хранилище читается один раз в снимок (StoreSnapshot): записи и индексы LocationIndex, DateIndex, SalaryIndex,
+# InvertedIndex держатся в памяти, и параллельные запросы (ThreadingHTTPServer) не разбирают файл заново.
+# Снимок неизменяем; при изменении файла хранилища (mtime и размер, для секционированного — манифеста)
+# следующий запрос строит новый снимок, а запросы, начатые раньше, дочитывают старый.
+# Пагинация курсором (keyset): курсор — ключ сортировки и url последней отданной вакансии, следующая страница
+# начинается сразу после него, поэтому страницы не сдвигаются при повторных запросах.
+# Заголовки ответа: X-Next-Cursor и Link rel="next" (если есть следующая страница), X-Total-Count,
+# ETag (версия хранилища + параметры запроса); при совпадении If-None-Match — ответ 304 без тела.
+# Ошибки в параметрах — ответ 400 с JSON {"error": ...}.
+
+import base64
+import hashlib
+import json
+import threading
+from bisect import bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from src.indexes import DateIndex, LocationIndex, SalaryIndex, to_salary, to_timestamp
+from src.profiling import metrics
+from src.services import batched
+from src.text_index import InvertedIndex
+from src.work_files import FileHandler
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+SORT_FIELDS = ("-published_at", "published_at", "-salary", "salary", "relevance")
+# Строк JSONL в одном фрагменте chunked-ответа
+CHUNK_LINES = 200
+
+SortKey = Tuple[float, str]
+
+
+def store_version(handler: FileHandler) -> List[Any]:
+    """Версия хранилища: mtime и размер файла (для секционированного — файла манифеста)."""
+    path = Path(getattr(handler, "manifest_path", handler.filename))
+    if not path.exists():
+        return [str(path), None, None]
+    stat = path.stat()
+    return [str(path), stat.st_mtime_ns, stat.st_size]
+
+
+class StoreSnapshot:
+    """Неизменяемый снимок хранилища в памяти: записи по url и индексы для отбора."""
+
+    def __init__(self, handler: FileHandler, batch_size: int = 10000) -> None:
+        self.version = store_version(handler)
+        self.items: List[Dict[str, Any]] = []
+        self.by_url: Dict[str, Dict[str, Any]] = {}
+        self.location_index = LocationIndex()
+        self.date_index = DateIndex()
+        self.salary_index = SalaryIndex()
+        self.text_index = InvertedIndex()
+        with metrics.span("serve_load_seconds"):
+            for batch in batched(handler.iter_items(), batch_size):
+                batch = [item for item in batch if item.get("url") and item["url"] not in self.by_url]
+                self.items.extend(batch)
+                self.by_url.update((item["url"], item) for item in batch)
+                for index in (self.location_index, self.date_index, self.salary_index, self.text_index):
+                    index.add_items(batch)
+        self.etag_base = hashlib.sha1(json.dumps(self.version).encode("utf-8")).hexdigest()[:16]
+        self._orders: Dict[str, List[SortKey]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _ordered(self, sort: str) -> List[SortKey]:
+        """Все вакансии снимка, упорядоченные по sort (считается один раз на снимок)."""
+        with self._lock:
+            if sort not in self._orders:
+                key = _sort_key(sort)
+                self._orders[sort] = sorted((key(item), item["url"]) for item in self.items)
+            return self._orders[sort]
+
+    def query(self, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """Страница результатов запроса.
+        :param params: Разобранные параметры запроса (см. parse_params)
+        :return: Вакансии страницы, общее количество подходящих вакансий и курсор следующей страницы"""
+        candidates: Optional[Set[str]] = None
+        scores: Dict[str, float] = {}
+        sets: List[Set[str]] = []
+        if params["location"]:
+            sets.append(self.location_index.lookup(params["location"], params["location_match"]))
+        if params["salary_min"] is not None or params["salary_max"] is not None:
+            sets.append(self.salary_index.range(params["salary_min"], params["salary_max"]))
+        if params["date_from"] is not None or params["date_to"] is not None:
+            sets.append(self.date_index.range(params["date_from"], params["date_to"]))
+        if params["q"]:
+            scores = dict(self.text_index.search(params["q"], mode=params["mode"]))
+            sets.append(set(scores))
+        for urls in sorted(sets, key=len):
+            candidates = urls if candidates is None else candidates & urls
+
+        sort = params["sort"]
+        if sort == "relevance":
+            ordered = sorted((-scores.get(url, 0.0), url) for url in (candidates or set()))
+        elif candidates is None:
+            ordered = self._ordered(sort)
+        else:
+            key = _sort_key(sort)
+            ordered = sorted((key(self.by_url[url]), url) for url in candidates)
+
+        start = bisect_right(ordered, params["cursor"]) if params["cursor"] is not None else 0
+        end = start + params["limit"]
+        page = ordered[start:end]
+        next_cursor = encode_cursor(page[-1]) if page and end < len(ordered) else None
+        return [self.by_url[url] for _, url in page], len(ordered), next_cursor
+
+
+def _sort_key(sort: str) -> Callable[[Dict[str, Any]], float]:
+    """Числовой ключ сортировки записи (по убыванию — с обратным знаком)."""
+    field = sort.lstrip("-")
+    sign = -1.0 if sort.startswith("-") else 1.0
+    convert: Callable[[Any], Optional[float]] = to_timestamp if field == "published_at" else to_salary
+
+    def key(item: Dict[str, Any]) -> float:
+        return sign * float(convert(item.get(field)) or 0)
+
+    return key
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(value: str) -> SortKey:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+        return float(raw[0]), str(raw[1])
+    except (ValueError, TypeError, IndexError, KeyError):
+        raise ValueError("Некорректный курсор")
+
+
+def parse_params(query: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Разбирает и проверяет параметры /vacancies (ошибка — ValueError)."""
+
+    def value(name: str) -> Optional[str]:
+        values = query.get(name)
+        return values[-1].strip() if values and values[-1].strip() else None
+
+    def number(name: str) -> Optional[int]:
+        raw = value(name)
+        if raw is None:
+            return None
+        if not raw.lstrip("-").isdigit():
+            raise ValueError(f"Параметр {name} должен быть целым числом")
+        return int(raw)
+
+    def date(name: str) -> Optional[float]:
+        raw = value(name)
+        if raw is None:
+            return None
+        stamp = to_timestamp(raw)
+        if stamp is None:
+            raise ValueError(f"Параметр {name} должен быть датой ISO")
+        return stamp
+
+    q = value("q")
+    sort = value("sort") or ("relevance" if q else "-published_at")
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Сортировка возможна по: {', '.join(SORT_FIELDS)}")
+    if sort == "relevance" and not q:
+        raise ValueError("Сортировка relevance требует параметра q")
+    limit = number("limit")
+    limit = DEFAULT_LIMIT if limit is None else limit
+    if not 0 < limit <= MAX_LIMIT:
+        raise ValueError(f"limit должен быть от 1 до {MAX_LIMIT}")
+    location_match = value("location_match") or "substring"
+    if location_match not in ("exact", "prefix", "substring"):
+        raise ValueError("location_match должен быть exact, prefix или substring")
+    mode = value("mode") or "or"
+    if mode not in ("or", "and"):
+        raise ValueError("mode должен быть or или and")
+    cursor = value("cursor")
+    return {
+        "location": value("location"),
+        "location_match": location_match,
+        "salary_min": number("salary_min"),
+        "salary_max": number("salary_max"),
+        "date_from": date("date_from"),
+        "date_to": date("date_to"),
+        "q": q,
+        "mode": mode,
+        "sort": sort,
+        "limit": limit,
+        "cursor": decode_cursor(cursor) if cursor else None,
+    }
+
+
+class VacancyServer:
+    """Локальный HTTP-сервис запросов к хранилищу вакансий (только чтение)."""
+
+    def __init__(self, handler: FileHandler, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """:param handler: Хранилище вакансий (любой FileHandler или ShardedHandler)
+        :param host: Адрес, на котором слушает сервис
+        :param port: Порт (0 — любой свободный)"""
+        self.handler = handler
+        self._snapshot: Optional[StoreSnapshot] = None
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode("ascii")
+        return f"http://{host}:{port}"
+
+    def snapshot(self) -> StoreSnapshot:
+        """Текущий снимок хранилища; перестраивается, если файл хранилища изменился."""
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != store_version(self.handler):
+                self._snapshot = StoreSnapshot(self.handler)
+                metrics.inc("serve_reloads_total")
+            return self._snapshot
+
+    def serve_forever(self) -> None:
+        self.snapshot()
+        self._server.serve_forever()
+
+    def start(self) -> "VacancyServer":
+        """Запускает сервис в фоновом потоке."""
+        self.snapshot()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "VacancyServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _make_handler(self) -> Type[BaseHTTPRequestHandler]:
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                path = parsed.path.rstrip("/")
+                with metrics.span("serve_request_seconds", path=path or "/"):
+                    if path == "/vacancies":
+                        self._vacancies(parse_qs(parsed.query))
+                    elif path == "/health":
+                        snapshot = service.snapshot()
+                        self._send_json(200, {"status": "ok", "count": len(snapshot), "version": snapshot.version})
+                    else:
+                        self._send_json(404, {"error": "Не найдено"})
+
+            def _vacancies(self, query: Dict[str, List[str]]) -> None:
+                try:
+                    params = parse_params(query)
+                except ValueError as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+                snapshot = service.snapshot()
+                canonical = json.dumps(sorted((k, v) for k, v in query.items()), ensure_ascii=False)
+                etag = f'"{snapshot.etag_base}-{hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]}"'
+                if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+                    metrics.inc("serve_not_modified_total")
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                items, total, next_cursor = snapshot.query(params)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.send_header("ETag", etag)
+                self.send_header("X-Total-Count", str(total))
+                if next_cursor is not None:
+                    next_query = {k: v[-1] for k, v in query.items() if k != "cursor"}
+                    self.send_header("X-Next-Cursor", next_cursor)
+                    self.send_header(
+                        "Link", f'</vacancies?{urlencode({**next_query, "cursor": next_cursor})}>; rel="next"'
+                    )
+                self.end_headers()
+                for chunk in batched(items, CHUNK_LINES):
+                    self._write_chunk("".join(json.dumps(item, ensure_ascii=False) + "\n" for item in chunk))
+                self.wfile.write(b"0\r\n\r\n")
+                metrics.inc("serve_items_total", len(items))
+
+            def _write_chunk(self, text: str) -> None:
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+            def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def serve(handler: FileHandler, host: str = "127.0.0.1", port: int = 8000) -> None:
+    """Запускает сервис и обслуживает запросы до прерывания (Ctrl+C)."""
+    server = VacancyServer(handler, host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
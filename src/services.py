@@ -7,9 +7,13 @@
 # Фильтрация данных через filter_items по любым критериям и поддерживает сравнение с
 # множеством значений (list, tuple, set)..
 # Оба метода типизированы и документированы.
+# batched разбивает поток записей (например, iter_items() хранилища) на пакеты фиксированного размера.
 
 
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
 
 
 def remove_duplicates(
@@ -62,3 +66,13 @@ def filter_items(items: List[Dict], criteria: Optional[Dict] = None) -> List[Dic
         if match:
             filtered.append(item)
     return filtered
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Разбивает поток записей (или строк файла) на пакеты по size элементов (последний пакет может быть меньше)."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,392 @@
+# Что реализовано:
+# ShardedHandler — хранилище вакансий в виде каталога секций (шардов) вместо одного большого файла.
+# Записи раскладываются по секциям по месяцу публикации (partition_by="month", ключ "2025-09")
+# или по локации (partition_by="area", ключ — нормализованное название города).
+# Каждая секция — обычный файл одного из форматов HANDLERS (по умолчанию JSONL).
+# manifest.json описывает секции: файл, количество записей, диапазоны дат публикации и зарплат, локации.
+# add_items и delete_items читают и перезаписывают только затронутые секции.
+# query() и get_items() отбрасывают секции по манифесту: get_items() — по критерию location (area),
+# published_at (month, ключ месяца даты) и url (по карте url -> секция).
+# archive() переносит старые секции в подкаталог archive/ — они больше не читаются при запросах.
+# Версия для кэша запросов (enable_cache) — mtime и размер манифеста.
+# url уникален во всём хранилище, как и в обычном файле: перепубликация вакансии с той же ссылкой может попасть
+# в другую секцию (новый месяц), поэтому urls.json хранит карту url -> секция активных секций, и add_items
+# отбрасывает вакансии, url которых уже есть в любой секции (остаётся прежняя запись, как в remove_duplicates).
+# Если urls.json нет (хранилище старой версии), карта строится по секциям при первом обращении.
+
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.indexes import normalize_location, to_timestamp
+from src.profiling import metrics
+from src.services import remove_duplicates
+from src.store_stats import part_stats, ranges_overlap
+from src.work_files import HANDLERS, FileHandler, _location_check, _remove_items
+
+MANIFEST_NAME = "manifest.json"
+URLS_NAME = "urls.json"
+ARCHIVE_DIR = "archive"
+UNKNOWN_SHARD = "unknown"
+PARTITIONS = ("month", "area")
+
+
+class ShardedHandler(FileHandler):
+    """Хранилище вакансий, разбитое на секции по месяцу публикации или по локации."""
+
+    def __init__(
+        self, filename: Optional[str] = None, partition_by: str = "month", shard_format: str = "jsonl"
+    ) -> None:
+        """:param filename: Каталог хранилища
+        :param partition_by: "month" (по published_at) или "area" (по location)
+        :param shard_format: Формат файлов секций (json, csv, xlsx, txt, jsonl)"""
+        super().__init__(filename if filename is not None else "data/vacancies_sharded")
+        if partition_by not in PARTITIONS:
+            raise ValueError("Секционирование возможно только по 'month' или 'area'")
+        if shard_format not in HANDLERS:
+            raise ValueError(f"Неизвестный формат секций: {shard_format}")
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._urls: Optional[Dict[str, str]] = None
+        self._urls_changed = False
+        self._partition_by = partition_by
+        self._shard_format = shard_format
+        if self.manifest_path.exists():
+            # Параметры существующего хранилища берутся из манифеста
+            manifest = self._load_manifest()
+            self._partition_by = manifest["partition_by"]
+            self._shard_format = manifest["format"]
+
+    @property
+    def partition_by(self) -> str:
+        return self._partition_by
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.filename / MANIFEST_NAME
+
+    @property
+    def urls_path(self) -> Path:
+        return self.filename / URLS_NAME
+
+    # ------------------ Манифест ------------------
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self._manifest is None:
+            if self.manifest_path.exists():
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {
+                    "partition_by": self._partition_by,
+                    "format": self._shard_format,
+                    "shards": {},
+                    "archived": {},
+                }
+        return self._manifest
+
+    def _url_map(self) -> Dict[str, str]:
+        """Карта url -> ключ секции для всех активных секций (из urls.json или по содержимому секций)."""
+        if self._urls is None:
+            if self.urls_path.exists():
+                with open(self.urls_path, "r", encoding="utf-8") as f:
+                    self._urls = json.load(f)
+            else:
+                self._urls = {}
+                for key in sorted(self._load_manifest()["shards"]):
+                    self._urls.update((item["url"], key) for item in self._shard(key).iter_items() if item.get("url"))
+                self._urls_changed = True
+        return self._urls
+
+    def _forget_urls(self, keys: Iterable[str]) -> None:
+        """Убирает из карты url все записи секций keys."""
+        dropped = set(keys)
+        urls = self._url_map()
+        for url in [url for url, key in urls.items() if key in dropped]:
+            del urls[url]
+        self._urls_changed = True
+
+    def _save_manifest(self) -> None:
+        """Сохраняет манифест и изменившуюся карту url (через временный файл и os.replace)."""
+        if self._urls is not None and self._urls_changed:
+            tmp_urls = self.urls_path.with_name(URLS_NAME + ".tmp")
+            with open(tmp_urls, "w", encoding="utf-8") as f:
+                json.dump(self._urls, f, ensure_ascii=False)
+            os.replace(tmp_urls, self.urls_path)
+            self._urls_changed = False
+        tmp_path = self.manifest_path.with_name(MANIFEST_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._load_manifest(), f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+        self._mark_changed()
+
+    def _store_version(self) -> Tuple[int, int, int]:
+        """Версия хранилища — по файлу манифеста, который перезаписывается при каждом изменении секций."""
+        stat = os.stat(self.manifest_path)
+        return self._generation, stat.st_mtime_ns, stat.st_size
+
+    @property
+    def shards(self) -> Dict[str, Dict[str, Any]]:
+        """Описание активных секций из манифеста: ключ -> файл и статистика."""
+        return {key: dict(stats) for key, stats in self._load_manifest()["shards"].items()}
+
+    @property
+    def archived(self) -> Dict[str, Dict[str, Any]]:
+        """Описание секций, перенесённых в архив."""
+        return {key: dict(stats) for key, stats in self._load_manifest()["archived"].items()}
+
+    # ------------------ Секции ------------------
+    def shard_key(self, item: Dict[str, Any]) -> str:
+        """Ключ секции для записи."""
+        if self._partition_by == "area":
+            return normalize_location(item.get("location")) or UNKNOWN_SHARD
+        return _month_key(item.get("published_at"))
+
+    def _shard(self, key: str) -> FileHandler:
+        """Хэндлер файла секции (файл назначается при первом обращении)."""
+        shards = self._load_manifest()["shards"]
+        if key not in shards:
+            shards[key] = {"file": self._new_file_name(key)}
+        return HANDLERS[self._shard_format](str(self.filename / shards[key]["file"]))
+
+    def _new_file_name(self, key: str) -> str:
+        manifest = self._load_manifest()
+        used = {entry["file"] for group in ("shards", "archived") for entry in manifest[group].values()}
+        stem = re.sub(r"[^\w-]+", "_", key).strip("_") or UNKNOWN_SHARD
+        name, number = f"{stem}.{self._shard_format}", 1
+        while name in used:
+            number += 1
+            name = f"{stem}-{number}.{self._shard_format}"
+        return name
+
+    def _group(self, items: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            groups.setdefault(self.shard_key(item), []).append(item)
+        return groups
+
+    def _store_shard(self, key: str, items: List[Dict[str, Any]]) -> None:
+        """Перезаписывает секцию и обновляет её статистику; пустая секция удаляется."""
+        shard = self._shard(key)
+        shards = self._load_manifest()["shards"]
+        if not items:
+            Path(shard.filename).unlink(missing_ok=True)
+            del shards[key]
+            return
+        with self._span("write"):
+            shard._write_items(items)
+        shards[key].update(part_stats(items))
+
+    def _keys_for_criteria(self, criteria: Optional[Dict[str, Any]]) -> List[str]:
+        """Секции, в которых могут быть записи с заданными критериями (отбор по ключу секционирования)."""
+        keys = sorted(self._load_manifest()["shards"])
+        if not criteria:
+            return keys
+        wanted = set(keys)
+        if "url" in criteria:
+            urls = self._url_map()
+            wanted &= {urls[url] for url in _criterion_values(criteria["url"]) if url in urls}
+        if self._partition_by == "area" and "location" in criteria:
+            wanted &= {normalize_location(str(v)) or UNKNOWN_SHARD for v in _criterion_values(criteria["location"])}
+        if self._partition_by == "month" and "published_at" in criteria:
+            wanted &= {_month_key(value) for value in _criterion_values(criteria["published_at"])}
+        return [key for key in keys if key in wanted]
+
+    def _read_shards(self, keys: Iterable[str]) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        with self._span("read"):
+            for key in keys:
+                shard = self._shard(key)
+                shard._ensure_file()
+                items.extend(shard._read_items())
+        return items
+
+    # ------------------ Реализация FileHandler ------------------
+    def _ensure_file(self) -> None:
+        """Создаёт каталог хранилища и манифест, если их нет."""
+        self.filename.mkdir(parents=True, exist_ok=True)
+        if not self.manifest_path.exists():
+            self._save_manifest()
+
+    def _read_items(self) -> List[Dict[str, Any]]:
+        """Читает все активные секции (по порядку ключей)."""
+        return self._read_shards(sorted(self._load_manifest()["shards"]))
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Построчно отдаёт вакансии всех активных секций."""
+        self._ensure_file()
+        for key in sorted(self._load_manifest()["shards"]):
+            yield from self._shard(key).iter_items()
+
+    def shard_handler(self, key: str) -> FileHandler:
+        """Хэндлер файла существующей секции (например, для обслуживания отдельной секции)."""
+        if key not in self._load_manifest()["shards"]:
+            raise KeyError(key)
+        return self._shard(key)
+
+    def refresh_shard(self, key: str) -> None:
+        """Пересчитывает статистику секции после изменения её файла в обход хранилища; пустая секция удаляется."""
+        self.refresh_shards([key])
+
+    def refresh_shards(self, keys: Iterable[str]) -> None:
+        """Как refresh_shard() для нескольких секций: статистика и карта url обновляются за один проход по секции."""
+        keys = list(keys)
+        shards = self._load_manifest()["shards"]
+        missing = [key for key in keys if key not in shards]
+        if missing:
+            raise KeyError(missing[0])
+        self._forget_urls(keys)
+        urls = self._url_map()
+        for key in keys:
+            shard = self._shard(key)
+            stats = part_stats(_remember_urls(shard.iter_items(), urls, key))
+            if stats["count"]:
+                shards[key].update(stats)
+            else:
+                Path(shard.filename).unlink(missing_ok=True)
+                del shards[key]
+        self._save_manifest()
+
+    def _write_items(self, items: List[Dict[str, Any]]) -> None:
+        """Полностью перераспределяет записи по секциям."""
+        groups = self._group(items)
+        for key in set(self._load_manifest()["shards"]) | set(groups):
+            self._store_shard(key, groups.get(key, []))
+        self._urls = {item["url"]: key for key, group in groups.items() for item in group if item.get("url")}
+        self._urls_changed = True
+        self._save_manifest()
+
+    def add_items(self, items: List[Dict[str, Any]]) -> int:
+        """Добавляет вакансии, перезаписывая только секции, в которые они попадают.
+        :return: Количество добавленных вакансий"""
+        self._ensure_file()
+        items = self._drop_near_duplicates(items)
+        urls = self._url_map()
+        # Вакансия, url которой уже есть в другой секции (перепубликация в новом месяце), не добавляется
+        items = [item for item in remove_duplicates([], items, key="url") if item.get("url") not in urls]
+        added: List[Dict[str, Any]] = []
+        for key, group in sorted(self._group(items).items()):
+            current = self._read_shards([key])
+            with self._span("merge"):
+                combined = remove_duplicates(current, group, key="url")
+            self._store_shard(key, combined)
+            known = {item.get("url") for item in current}
+            new = [item for item in combined if item.get("url") not in known]
+            urls.update((item["url"], key) for item in new if item.get("url"))
+            added.extend(new)
+        self._urls_changed = self._urls_changed or bool(added)
+        self._save_manifest()
+        self._update_indexes(added=added)
+        return len(added)
+
+    def count(self) -> int:
+        """Количество вакансий в активных секциях (по манифесту, без чтения секций)."""
+        self._ensure_file()
+        return sum(stats.get("count", 0) for stats in self._load_manifest()["shards"].values())
+
+    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Возвращает вакансии; при критерии по ключу секционирования читаются только подходящие секции."""
+        self._ensure_file()
+        return self._cached_query(criteria, lambda: self._read_shards(self._keys_for_criteria(criteria)))
+
+    def delete_items(self, criteria: Optional[Dict[str, Any]] = None) -> None:
+        """Удаляет вакансии по критериям, перезаписывая только изменившиеся секции."""
+        self._ensure_file()
+        removed: List[Dict[str, Any]] = []
+        for key in self._keys_for_criteria(criteria):
+            items = self._read_shards([key])
+            with self._span("merge"):
+                remaining = _remove_items(items, criteria)
+            if len(remaining) != len(items):
+                kept = {item.get("url") for item in remaining}
+                dropped = [item for item in items if item.get("url") not in kept]
+                urls = self._url_map()
+                for item in dropped:
+                    url = item.get("url")
+                    if url:
+                        urls.pop(url, None)
+                removed.extend(dropped)
+                self._store_shard(key, remaining)
+                self._urls_changed = True
+        self._save_manifest()
+        self._update_indexes(removed=removed)
+
+    def _query_scope(
+        self,
+        location: Optional[str],
+        location_match: str,
+        date_low: Optional[float],
+        date_high: Optional[float],
+        salary_min: Optional[int],
+        salary_max: Optional[int],
+    ) -> Iterable[Dict[str, Any]]:
+        """Читает только секции, статистика которых пересекается с критериями запроса."""
+        self._ensure_file()
+        check = _location_check(location, location_match) if location is not None else None
+        keys = []
+        for key, stats in sorted(self._load_manifest()["shards"].items()):
+            if not ranges_overlap(stats.get("min_published_at"), stats.get("max_published_at"), date_low, date_high):
+                continue
+            if not ranges_overlap(stats.get("min_salary"), stats.get("max_salary"), salary_min, salary_max):
+                continue
+            if check is not None and not any(check({"location": loc}) for loc in stats.get("locations", [])):
+                continue
+            keys.append(key)
+        metrics.inc("shards_pruned_total", len(self._load_manifest()["shards"]) - len(keys))
+        return self._read_shards(keys)
+
+    # ------------------ Архив ------------------
+    def archive(self, before: Any) -> List[str]:
+        """Переносит в archive/ секции, все вакансии которых опубликованы раньше даты before.
+        :param before: Дата (datetime или строка ISO, например "2025-01-01")
+        :return: Ключи перенесённых секций"""
+        cutoff = to_timestamp(before)
+        if cutoff is None:
+            raise ValueError("Некорректная дата архивации")
+        self._ensure_file()
+        manifest = self._load_manifest()
+        moved = []
+        for key, stats in sorted(manifest["shards"].items()):
+            newest = stats.get("max_published_at")
+            if newest is None or newest >= cutoff:
+                continue
+            if self._indexes:
+                self._update_indexes(removed=self._read_shards([key]))
+            archive_dir = self.filename / ARCHIVE_DIR
+            archive_dir.mkdir(exist_ok=True)
+            shutil.move(str(self.filename / stats["file"]), str(archive_dir / stats["file"]))
+            manifest["archived"][key] = {**manifest["shards"].pop(key), "file": f"{ARCHIVE_DIR}/{stats['file']}"}
+            moved.append(key)
+        if moved:
+            # Архивные секции не читаются: их вакансии снова можно добавить в хранилище
+            self._forget_urls(moved)
+        self._save_manifest()
+        return moved
+
+
+# ------------------ Вспомогательные функции ------------------
+def _month_key(value: Any) -> str:
+    """Ключ месяца публикации вида "2025-09" (в часовом поясе, указанном в дате)."""
+    if isinstance(value, str):
+        if to_timestamp(value) is None:
+            return UNKNOWN_SHARD
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if not isinstance(value, datetime):
+        return UNKNOWN_SHARD
+    return value.strftime("%Y-%m")
+
+
+def _remember_urls(items: Iterable[Dict[str, Any]], urls: Dict[str, str], key: str) -> Iterator[Dict[str, Any]]:
+    """Пропускает записи дальше, запоминая в карте urls их секцию key."""
+    for item in items:
+        url = item.get("url")
+        if url:
+            urls[url] = key
+        yield item
+
+
+def _criterion_values(value: Any) -> List[Any]:
+    """Значения критерия get_items (одно значение или список допустимых)."""
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
@@ -0,0 +1,169 @@
+# Что реализовано:
+# SnapshotDiff — сравнение двух снимков вакансий (двух хранилищ или хранилища и свежей выгрузки) по url.
+# Сравнение — hash join: записи старого снимка кладутся в словарь url -> запись, новый снимок читается
+# потоково. Для больших снимков (partitions > 1) оба снимка сначала раскладываются по url во временные
+# JSONL-файлы (grace hash join), и в памяти одновременно держится только одна часть старого снимка.
+# На выходе — поток событий added / removed / changed: вакансия целиком, список изменившихся полей,
+# прежние значения (<поле>_old) и разница зарплат salary_delta. События можно записать в любой формат
+# FileHandler (колонки CSV/XLSX — DIFF_FIELDS). Счётчики событий доступны в SnapshotDiff.counts.
+
+import json
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.indexes import to_salary
+from src.profiling import metrics
+from src.work_files import LIST_SEPARATOR, VACANCY_FIELDS, FileHandler
+
+# Поля, изменение которых считается изменением вакансии (published_at меняется при каждом поднятии)
+COMPARED_FIELDS = ("title", "location", "salary", "description", "key_skills", "experience", "employer")
+DIFF_FIELDS = (
+    ["change"]
+    + VACANCY_FIELDS
+    + ["changed_fields", "salary_delta"]
+    + [f"{field}_old" for field in COMPARED_FIELDS if field != "description"]
+)
+
+# Снимок: хранилище (читается через iter_items) или итерируемые записи
+Records = Union[FileHandler, Iterable[Dict[str, Any]]]
+
+
+class SnapshotDiff:
+    """Потоковое сравнение двух снимков вакансий по url."""
+
+    def __init__(
+        self,
+        old: Records,
+        new: Records,
+        fields: Sequence[str] = COMPARED_FIELDS,
+        partitions: int = 1,
+        workdir: Optional[Path] = None,
+    ) -> None:
+        """:param old: Старый снимок (FileHandler или итерируемые записи)
+        :param new: Новый снимок (FileHandler или итерируемые записи, например выгрузка из API)
+        :param fields: Сравниваемые поля
+        :param partitions: Количество частей для сравнения больших снимков (1 — всё в памяти)
+        :param workdir: Каталог для временных файлов частей (по умолчанию системный)"""
+        self._old = old
+        self._new = new
+        self._fields = tuple(fields)
+        self._partitions = max(1, partitions)
+        self._workdir = workdir
+        self.counts = {"added": 0, "removed": 0, "changed": 0, "unchanged": 0}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with metrics.span("diff_seconds"):
+            if self._partitions == 1:
+                yield from self._join(_records(self._old), _records(self._new))
+                return
+            with tempfile.TemporaryDirectory(dir=self._workdir) as tmp:
+                old_parts = _spill(_records(self._old), Path(tmp) / "old", self._partitions)
+                new_parts = _spill(_records(self._new), Path(tmp) / "new", self._partitions)
+                for old_path, new_path in zip(old_parts, new_parts):
+                    yield from self._join(_read_part(old_path), _read_part(new_path))
+
+    def write(self, handler: FileHandler) -> Dict[str, int]:
+        """Записывает события в хранилище (содержимое файла заменяется). Возвращает счётчики событий."""
+        handler.replace_items(self)
+        return dict(self.counts)
+
+    def _join(self, old: Iterable[Dict[str, Any]], new: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Hash join одной части: старые записи в словаре, новые читаются потоково."""
+        previous: Dict[str, Dict[str, Any]] = {}
+        for item in old:
+            if item.get("url"):
+                previous[item["url"]] = item
+        seen = set()
+        for item in new:
+            url = item.get("url")
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            before = previous.pop(url, None)
+            if before is None:
+                yield self._event("added", item)
+                continue
+            # Поле, которого нет в одном из снимков (например, из более старой версии формата), не сравнивается
+            changed = [
+                field
+                for field in self._fields
+                if field in before and field in item and _normalize(field, before) != _normalize(field, item)
+            ]
+            if not changed:
+                self.counts["unchanged"] += 1
+                continue
+            yield self._event("changed", item, before, changed)
+        for item in previous.values():
+            yield self._event("removed", item)
+
+    def _event(
+        self,
+        change: str,
+        item: Dict[str, Any],
+        before: Optional[Dict[str, Any]] = None,
+        changed: Sequence[str] = (),
+    ) -> Dict[str, Any]:
+        self.counts[change] += 1
+        metrics.inc("diff_events_total", change=change)
+        event = {"change": change, **item, "changed_fields": list(changed)}
+        if before is not None:
+            for field in changed:
+                if field != "description":
+                    event[f"{field}_old"] = before.get(field)
+            if "salary" in changed:
+                event["salary_delta"] = (to_salary(item.get("salary")) or 0) - (to_salary(before.get("salary")) or 0)
+        return event
+
+
+def diff_snapshots(old: Records, new: Records, **options: Any) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Сравнивает два небольших снимка и возвращает список событий и счётчики."""
+    diff = SnapshotDiff(old, new, **options)
+    events = list(diff)
+    return events, diff.counts
+
+
+# ------------------ Вспомогательные функции ------------------
+def _records(source: Records) -> Iterator[Dict[str, Any]]:
+    """Записи снимка: хранилище читается построчно через iter_items()."""
+    if isinstance(source, FileHandler):
+        return source.iter_items()
+    return iter(source)
+
+
+def _normalize(field: str, item: Dict[str, Any]) -> Any:
+    """Значение поля для сравнения: зарплата — число, списки и строки из CSV приводятся к одному виду."""
+    value = item.get(field)
+    if field == "salary":
+        return to_salary(value) or 0
+    if field == "key_skills":
+        if isinstance(value, str):
+            value = value.split(LIST_SEPARATOR.strip())
+        return [str(skill).strip() for skill in value or [] if str(skill).strip()]
+    return "" if value is None else str(value).strip()
+
+
+def _partition(url: str, partitions: int) -> int:
+    return zlib.crc32(url.encode("utf-8")) % partitions
+
+
+def _spill(items: Iterator[Dict[str, Any]], prefix: Path, partitions: int) -> List[Path]:
+    """Раскладывает записи по частям (по хэшу url) во временные JSONL-файлы."""
+    paths = [prefix.with_name(f"{prefix.name}-{number}.jsonl") for number in range(partitions)]
+    files = [open(path, "w", encoding="utf-8") for path in paths]
+    try:
+        for item in items:
+            url = item.get("url")
+            if url:
+                files[_partition(url, partitions)].write(json.dumps(item, ensure_ascii=False) + "\n")
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def _read_part(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
@@ -0,0 +1,228 @@
+# Что реализовано:
+# Поточная обработка вакансий по стадиям вместо последовательных «скачать всё -> конвертировать -> сохранить»:
+# загрузчик (поток) кладёт страницы API в ограниченную очередь, обработчики (workers потоков) конвертируют
+# и фильтруют страницы (pipeline.convert_items / filter_vacancies), BatchWriter в фоновом потоке
+# сохраняет прошедшие фильтры вакансии в хранилище пакетами — каждые batch_size записей или flush_interval секунд.
+# Пока загружается следующая страница, предыдущие уже конвертируются и пишутся на диск.
+# Очереди ограничены (queue_size): если обработка или запись отстаёт, загрузчик ждёт, и в памяти одновременно
+# держится не больше queue_size страниц на стадию (backpressure).
+# Ошибка обработки или записи останавливает остальные стадии, ошибка загрузки — только загрузку (уже загруженные
+# страницы дообрабатываются); ошибка пробрасывается из run_staged(). При остановке (в том числе по ошибке
+# или Ctrl+C) BatchWriter записывает уже накопленные вакансии.
+# Длительность стадий, размер очередей и сбросы на диск замеряются в реестре metrics (staged_*).
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from src.pipeline import convert_items, filter_vacancies
+from src.profiling import metrics
+from src.vacancy_get import Vacancy
+from src.work_files import FileHandler
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 2.0
+# Период проверки флага остановки при ожидании в очереди, с
+_POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class StageError(Exception):
+    """Обёртка для ошибки, возникшей в потоке одной из стадий."""
+
+
+class BatchWriter:
+    """Фоновая запись вакансий в хранилище пакетами по размеру или по времени."""
+
+    def __init__(
+        self,
+        handler: FileHandler,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """:param handler: Хранилище, в которое добавляются вакансии (add_items)
+        :param batch_size: Сбрасывать на диск, когда накопилось столько записей
+        :param flush_interval: Сбрасывать на диск не реже, чем раз в столько секунд (если есть что писать)
+        :param queue_size: Максимум пакетов, ожидающих записи (put() блокируется при заполнении)"""
+        self.handler = handler
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.flushes = 0
+        self.error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        self._buffer: List[Dict[str, Any]] = []
+        self._thread = threading.Thread(target=self._run, name="staged-writer", daemon=True)
+        self._closed = False
+
+    def start(self) -> "BatchWriter":
+        self._thread.start()
+        return self
+
+    def put(self, records: List[Dict[str, Any]]) -> None:
+        """Передаёт записи на запись (ждёт, если очередь заполнена). Ошибка записи — StageError."""
+        while True:
+            if self.error is not None:
+                raise StageError("Ошибка записи в хранилище") from self.error
+            if self._closed:
+                raise StageError("Запись в хранилище уже остановлена")
+            try:
+                self._queue.put(records, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def close(self) -> None:
+        """Дописывает всё накопленное и останавливает поток записи. Ошибка записи — StageError."""
+        if not self._closed:
+            self._closed = True
+            if self._thread.is_alive():
+                self._queue.put(_DONE)
+                self._thread.join()
+        if self.error is not None:
+            raise StageError("Ошибка записи в хранилище") from self.error
+
+    def __enter__(self) -> "BatchWriter":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        with metrics.span("staged_flush_seconds"):
+            self.handler.add_items(batch)
+        self.written += len(batch)
+        self.flushes += 1
+        metrics.inc("staged_flushes_total")
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                try:
+                    records = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    records = None
+                if records is _DONE:
+                    break
+                if records:
+                    self._buffer.extend(records)
+                if len(self._buffer) >= self.batch_size or time.monotonic() >= deadline:
+                    self._flush()
+                    deadline = time.monotonic() + self.flush_interval
+            self._flush()
+        except BaseException as e:
+            self.error = e
+            # Освобождаем очередь, чтобы put() и close() не ждали остановившийся поток
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+
+def run_staged(
+    pages: Iterable[List[Dict[str, Any]]],
+    handler: Optional[FileHandler] = None,
+    filter_words: Sequence[str] = (),
+    location: Optional[str] = None,
+    min_salary: Optional[int] = None,
+    max_salary: Optional[int] = None,
+    workers: int = DEFAULT_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    skip_invalid: bool = True,
+) -> List[Vacancy]:
+    """Загружает, конвертирует, фильтрует и сохраняет вакансии параллельными стадиями.
+    :param pages: Страницы элементов API (например, HHAPI.iter_pages(keyword)) — читаются в отдельном потоке
+    :param handler: Хранилище для прошедших фильтры вакансий (None — без сохранения)
+    :param workers: Количество потоков конвертации и фильтрации
+    :param queue_size: Максимум страниц в очереди между стадиями
+    :param batch_size: Размер пакета записи в хранилище
+    :param flush_interval: Максимальный интервал между записями в хранилище, с
+    :param skip_invalid: Пропускать элементы, не прошедшие валидацию Vacancy
+    :return: Прошедшие фильтры вакансии в порядке страниц"""
+    workers = max(1, workers)
+    page_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    results: Dict[int, List[Vacancy]] = {}
+    writer = BatchWriter(handler, batch_size, flush_interval, queue_size) if handler is not None else None
+
+    def offer(item: Any) -> bool:
+        """Кладёт элемент в очередь страниц, пока не выставлен флаг остановки."""
+        while not stop.is_set():
+            try:
+                page_queue.put(item, timeout=_POLL_INTERVAL)
+                metrics.set_gauge("staged_queue_size", page_queue.qsize())
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fail(error: BaseException) -> None:
+        errors.append(error.__cause__ or error if isinstance(error, StageError) else error)
+        stop.set()
+
+    def fetch() -> None:
+        try:
+            with metrics.span("staged_stage_seconds", stage="fetch"):
+                for number, page in enumerate(pages):
+                    metrics.inc("staged_pages_total")
+                    if not offer((number, page)):
+                        break
+        except BaseException as e:
+            # Уже загруженные страницы дообрабатываются и записываются, ошибка пробрасывается после
+            errors.append(e)
+        finally:
+            for _ in range(workers):
+                offer(_DONE)
+
+    def process() -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    task = page_queue.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if task is _DONE:
+                    return
+                number, page = task
+                with metrics.span("staged_stage_seconds", stage="process"):
+                    vacancies = filter_vacancies(
+                        convert_items(page, skip_invalid=skip_invalid), filter_words, location, min_salary, max_salary
+                    )
+                results[number] = vacancies
+                if writer is not None and vacancies:
+                    writer.put([vac.to_dict() for vac in vacancies])
+        except BaseException as e:
+            fail(e)
+
+    threads = [threading.Thread(target=fetch, name="staged-fetch", daemon=True)]
+    threads += [threading.Thread(target=process, name=f"staged-process-{n}", daemon=True) for n in range(workers)]
+    if writer is not None:
+        writer.start()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(_POLL_INTERVAL)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        if writer is not None:
+            try:
+                writer.close()
+            except StageError as e:
+                errors.append(e.__cause__ or e)
+    if errors:
+        raise errors[0]
+    return [vac for _, vacancies in sorted(results.items()) for vac in vacancies]
@@ -0,0 +1,39 @@
+# Что реализовано:
+# Сводка части хранилища (секции ShardedHandler, блока сжатого файла) для отбора частей без их чтения:
+# part_stats() за один проход считает количество записей, диапазоны дат публикации и зарплат и локации,
+# ranges_overlap() проверяет, может ли часть с таким диапазоном подойти под диапазон запроса.
+
+from typing import Any, Dict, Iterable, Optional
+
+from src.indexes import normalize_location, to_salary, to_timestamp
+
+
+def part_stats(items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Сводка части хранилища (за один проход): количество, диапазоны дат и зарплат, локации."""
+    stats: Dict[str, Any] = dict.fromkeys(("min_published_at", "max_published_at", "min_salary", "max_salary"))
+    count = 0
+    locations = set()
+    for item in items:
+        count += 1
+        locations.add(normalize_location(item.get("location")))
+        for field, value in (
+            ("published_at", to_timestamp(item.get("published_at"))),
+            ("salary", to_salary(item.get("salary"))),
+        ):
+            if value is None:
+                continue
+            low, high = f"min_{field}", f"max_{field}"
+            stats[low] = value if stats[low] is None else min(stats[low], value)
+            stats[high] = value if stats[high] is None else max(stats[high], value)
+    return {"count": count, **stats, "locations": sorted(locations)}
+
+
+def ranges_overlap(
+    part_low: Optional[float], part_high: Optional[float], low: Optional[float], high: Optional[float]
+) -> bool:
+    """Пересекается ли диапазон части [part_low, part_high] с диапазоном запроса [low, high]."""
+    if low is None and high is None:
+        return True
+    if part_low is None or part_high is None:
+        return False
+    return (low is None or part_high >= low) and (high is None or part_low <= high)
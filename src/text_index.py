@@ -0,0 +1,216 @@
+# Что реализовано:
+# Инвертированный полнотекстовый индекс InvertedIndex по названию и описанию вакансий.
+# Токенизация: удаление HTML-тегов (<highlighttext> из snippet hh.ru), нижний регистр, ё -> е.
+# Нормализация русских слов лёгким стеммером (отсечение окончаний), чтобы "Разработка",
+# "разработки" и "разработке" попадали в один терм.
+# Поиск по ключевым словам в режимах "or" / "and" и ранжирование BM25.
+# Индекс обновляется инкрементально (add_items / remove_items) и сохраняется в JSON-файл.
+
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.indexes import ItemIndex
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[0-9a-zа-я]+(?:[+#]+|(?:[.\-][0-9a-zа-я]+)*)")
+_CYRILLIC_RE = re.compile(r"[а-я]")
+_VOWELS = "аеиоуыэюя"
+
+# Окончания русских слов (прилагательные, глаголы, существительные, возвратные частицы),
+# отсортированные по убыванию длины, чтобы отсекалось самое длинное совпадение.
+_RU_ENDINGS = sorted(
+    set(
+        (
+            "ившись ывшись ивши ывши ими ыми его ого ему ому ее ие ые ое ей ий ый ой ем им ым "
+            "ом их ых ую юю ая яя ою ею ила ыла ена ейте уйте ите или ыли ил ыл ен ило ыло ено ят "
+            "ует уют ит ыт ены ить ыть ишь ев ов ье иями ями ами еи ии ией иям ям ием ам ах иях ях "
+            "ию ью ия ья ость ости остью ся сь а е и й о у ы ь ю я"
+        ).split()
+    ),
+    key=len,
+    reverse=True,
+)
+
+_MIN_STEM = 3
+
+
+def stem_ru(word: str) -> str:
+    """Лёгкий стеммер для русских слов: отсекает одно окончание после первой гласной."""
+    rv_start = next((i + 1 for i, ch in enumerate(word) if ch in _VOWELS), len(word))
+    for ending in _RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= max(rv_start, _MIN_STEM):
+            return word[: -len(ending)]
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Разбивает текст на нормализованные термы (нижний регистр, ё -> е, стемминг)."""
+    if not text:
+        return []
+    text = _TAG_RE.sub(" ", text).lower().replace("ё", "е")
+    terms = []
+    for token in _TOKEN_RE.findall(text):
+        terms.append(stem_ru(token) if _CYRILLIC_RE.search(token) else token)
+    return terms
+
+
+class InvertedIndex(ItemIndex):
+    """Инвертированный индекс по полям title и description с ранжированием BM25."""
+
+    FIELDS = ("title", "description")
+
+    def __init__(self, path: Optional[Path] = None, k1: float = 1.5, b: float = 0.75) -> None:
+        """:param path: Файл для сохранения индекса
+        :param k1: Параметр насыщения частоты терма BM25
+        :param b: Параметр нормализации по длине документа BM25"""
+        super().__init__(path)
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def clear(self) -> None:
+        """Полностью очищает индекс."""
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._urls: List[Optional[str]] = []
+        self._lengths: List[int] = []
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def _document_terms(self, item: Dict[str, Any]) -> List[str]:
+        terms: List[str] = []
+        for field in self.FIELDS:
+            value = item.get(field)
+            terms.extend(tokenize(value if isinstance(value, str) else None))
+        return terms
+
+    def add_items(self, items: List[Dict[str, Any]]) -> None:
+        """Добавляет записи в индекс; запись с уже известным url переиндексируется."""
+        replaced = [item for item in items if item.get("url") in self._doc_ids]
+        if replaced:
+            self.remove_items(replaced)
+        for item in items:
+            url = item.get("url")
+            if not url or url in self._doc_ids:
+                continue
+            doc_id = len(self._urls)
+            terms = self._document_terms(item)
+            self._doc_ids[url] = doc_id
+            self._urls.append(url)
+            self._lengths.append(len(terms))
+            self._total_length += len(terms)
+            for term in terms:
+                postings = self._postings.setdefault(term, {})
+                postings[doc_id] = postings.get(doc_id, 0) + 1
+
+    def remove_items(self, items: List[Dict[str, Any]]) -> None:
+        """Удаляет записи из индекса по url."""
+        for item in items:
+            doc_id = self._doc_ids.pop(item.get("url"), None)  # type: ignore[arg-type]
+            if doc_id is None:
+                continue
+            for term in set(self._document_terms(item)):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[term]
+            # Если текст записи изменился с момента индексации, в постингах могут остаться
+            # "осиротевшие" doc_id — они отбрасываются при поиске и при сохранении.
+            self._total_length -= self._lengths[doc_id]
+            self._lengths[doc_id] = 0
+            self._urls[doc_id] = None
+
+    def _query_terms(self, query: Iterable[str] | str) -> List[str]:
+        words = [query] if isinstance(query, str) else list(query)
+        terms: List[str] = []
+        for word in words:
+            for term in tokenize(word):
+                if term not in terms:
+                    terms.append(term)
+        return terms
+
+    def _candidates(self, terms: List[str], mode: str) -> Set[int]:
+        if mode not in ("or", "and"):
+            raise ValueError("Режим поиска должен быть 'or' или 'and'")
+        if not terms:
+            return set()
+        postings = sorted((self._postings.get(term, {}) for term in terms), key=len)
+        if mode == "and":
+            result = set(postings[0])
+            for posting in postings[1:]:
+                result.intersection_update(posting)
+                if not result:
+                    break
+        else:
+            result = set()
+            for posting in postings:
+                result.update(posting)
+        return {doc_id for doc_id in result if self._urls[doc_id] is not None}
+
+    def match(self, query: Iterable[str] | str, mode: str = "or") -> Set[str]:
+        """Возвращает множество url записей, содержащих термы запроса (без ранжирования)."""
+        terms = self._query_terms(query)
+        return {self._urls[doc_id] for doc_id in self._candidates(terms, mode)}  # type: ignore[misc]
+
+    def search(
+        self, query: Iterable[str] | str, mode: str = "or", limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Поиск по ключевым словам с ранжированием BM25.
+        :param query: Строка запроса или список ключевых слов
+        :param mode: "or" — хотя бы одно слово, "and" — все слова
+        :param limit: Максимальное количество результатов
+        :return: Список пар (url, score) по убыванию релевантности"""
+        terms = self._query_terms(query)
+        candidates = self._candidates(terms, mode)
+        if not candidates:
+            return []
+        n_docs = len(self)
+        avg_length = self._total_length / n_docs if n_docs else 0.0
+        scores: Dict[int, float] = dict.fromkeys(candidates, 0.0)
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id in candidates.intersection(postings):
+                tf = postings[doc_id]
+                norm = 1 - self.b + self.b * (self._lengths[doc_id] / avg_length if avg_length else 0.0)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        ranked = sorted(scores.items(), key=lambda pair: (-pair[1], pair[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self._urls[doc_id], score) for doc_id, score in ranked]  # type: ignore[misc]
+
+    def _dump_state(self) -> Dict[str, Any]:
+        """Компактное состояние: url, длины документов и постинги [doc_id, tf, doc_id, tf, ...]."""
+        alive = [doc_id for doc_id, url in enumerate(self._urls) if url is not None]
+        remap = {old: new for new, old in enumerate(alive)}
+        postings = {}
+        for term, posting in self._postings.items():
+            flat: List[int] = []
+            for doc_id, tf in posting.items():
+                if doc_id in remap:
+                    flat.extend((remap[doc_id], tf))
+            if flat:
+                postings[term] = flat
+        return {
+            "urls": [self._urls[doc_id] for doc_id in alive],
+            "lengths": [self._lengths[doc_id] for doc_id in alive],
+            "postings": postings,
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.clear()
+        # В файле только живые документы: url без пропусков (None)
+        urls: List[str] = list(state.get("urls", []))
+        self._urls = list(urls)
+        self._lengths = list(state.get("lengths", []))
+        self._doc_ids = {url: doc_id for doc_id, url in enumerate(urls)}
+        self._total_length = sum(self._lengths)
+        for term, flat in state.get("postings", {}).items():
+            self._postings[term] = dict(zip(flat[::2], flat[1::2]))
@@ -1,36 +1,25 @@
 # Особенности интерфейса:
 # Пользователь вводит поисковый запрос.
 # Можно указать количество вакансий для ТОПа.
-# Возможна фильтрация по ключевым словам в описании.
+# Возможна фильтрация по ключевым словам в названии и описании (через InvertedIndex).
 # Можно указать диапазон зарплаты.
 # Пользователь может фильтровать вакансии по локации.
 # Вакансии выводятся в человекочитаемом виде, без списков и словарей.
 # Вакансии сохраняются в JSON файл в папку data. (расширяемо для CSV/XLSX/TXT).
+# Загрузка, фильтрация и сохранение идут параллельными стадиями (src/staged.py): в файл пишутся
+# все вакансии, прошедшие фильтры, пакетами по мере обработки страниц; ТОП N выводится на экран.
 
 import os
 from typing import List, Optional
 
 from src.get_api import HHAPI
+from src.pipeline import parse_salary_range, top_vacancies
+from src.staged import run_staged
 from src.vacancy_get import Vacancy
 from src.work_files import JSONHandler
 
-# Папка для хранения JSON файлов
+# Папка для хранения JSON файлов (создаётся при сохранении)
 DATA_FOLDER = os.path.join(os.getcwd(), "data")
-os.makedirs(DATA_FOLDER, exist_ok=True)
-
-
-def convert_api_to_vacancy(item: dict) -> Vacancy:
-    salary_data = item.get("salary")
-    salary = salary_data.get("from") if salary_data else None
-
-    return Vacancy(
-        title=item.get("name") or "",
-        location=item.get("area", {}).get("name", "Не указано"),
-        published_at=item.get("published_at"),
-        url=item.get("alternate_url"),
-        salary=salary,
-        description=item.get("snippet", {}).get("requirement", "Описание не указано"),
-    )
 
 
 def display_vacancy(vac: Vacancy) -> None:
@@ -70,10 +59,7 @@ def user_interaction() -> None:
 
     if salary_range_input:
         try:
-            parts = salary_range_input.split("-")
-            if len(parts) != 2:
-                raise ValueError
-            min_salary, max_salary = map(lambda x: int(x.strip()), parts)
+            min_salary, max_salary = parse_salary_range(salary_range_input)
             print(f"Выбран диапазон: {min_salary} - {max_salary}")
         except ValueError:
             print("Некорректный формат диапазона зарплат")
@@ -81,45 +67,27 @@ def user_interaction() -> None:
     else:
         min_salary, max_salary = None, None
 
-    # Получаем вакансии
+    # Загрузка страниц, конвертация с фильтрами и запись в JSON в папку data идут параллельными стадиями:
+    # в файл попадают все вакансии, прошедшие фильтры, по мере обработки страниц
+    json_file_path = os.path.join(DATA_FOLDER, "vacancies.json")
     hh_api = HHAPI()
-    api_items = hh_api.get_vacancies(search_query)
-    if not api_items:
-        print("Вакансии не найдены")
-        return
-
-    vacancies: List[Vacancy] = [convert_api_to_vacancy(item) for item in api_items]
-
-    # Фильтр по ключевым словам
-    if filter_words:
-        vacancies = [vac for vac in vacancies if any(word.lower() in vac.description.lower() for word in filter_words)]
-        print(f"Найдено {len(vacancies)} вакансий по ключевым словам")
-
-    # Фильтр по локации
-    if location_filter:
-        vacancies = [vac for vac in vacancies if location_filter.lower() in vac.location.lower()]
-        print(f"Найдено {len(vacancies)} вакансий для локации: {location_filter}")
-
-    # Фильтр по диапазону зарплаты
-    if min_salary is not None and max_salary is not None:
-        vacancies = [vac for vac in vacancies if min_salary <= vac.salary <= max_salary]
-        print(f"Найдено {len(vacancies)} вакансий в диапазоне зарплат {min_salary}-{max_salary}")
-
+    vacancies: List[Vacancy] = run_staged(
+        hh_api.iter_pages(search_query),
+        JSONHandler(json_file_path),
+        filter_words,
+        location_filter,
+        min_salary,
+        max_salary,
+    )
     if not vacancies:
-        print("Вакансии не найдены после фильтрации")
+        print("Вакансии не найдены")
         return
+    print(f"Найдено {len(vacancies)} вакансий после фильтрации")
 
     # Сортировка по зарплате
-    vacancies.sort(reverse=True, key=lambda v: v.salary)
-    if top_n:
-        vacancies = vacancies[:top_n]
+    vacancies = top_vacancies(vacancies, top_n)
 
     print(f"=== ТОП {len(vacancies)} вакансий ===")
     for vac in vacancies:
         display_vacancy(vac)
-
-    # Сохраняем в JSON в папку data
-    json_file_path = os.path.join(DATA_FOLDER, "vacancies.json")
-    json_handler = JSONHandler(json_file_path)
-    json_handler.add_items([vac.to_dict() for vac in vacancies])
     print(f"Вакансии сохранены в JSON файл ({json_file_path})")
@@ -1,12 +1,17 @@
 # Что реализовано:
 # __slots__ для экономии памяти.
 # 6 атрибутов: title, location, published_at, url, salary, description.
+# Необязательные атрибуты из детальной карточки вакансии: key_skills (ключевые навыки) и experience (опыт).
+# Необязательный атрибут employer — название работодателя.
 # Приватные методы валидации: проверяют корректность данных при инициализации.
 # Магические методы сравнения: __lt__, __le__, __eq__, __gt__, __ge__ — по зарплате.
 # Если зарплата не указана — устанавливается 0.
+# to_record() / from_record() — компактный кортеж для передачи между процессами без повторной валидации.
 
 from datetime import datetime
-from typing import Optional, Union
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+VacancyRecord = Tuple[Any, ...]
 
 
 class Vacancy:
@@ -19,6 +24,9 @@ class Vacancy:
         "__url",
         "__salary",
         "__description",
+        "__key_skills",
+        "__experience",
+        "__employer",
     )
 
     def __init__(
@@ -29,6 +37,9 @@ class Vacancy:
         description: str,
         published_at: Optional[str] = None,
         url: Optional[str] = None,
+        key_skills: Optional[Sequence[str]] = None,
+        experience: Optional[str] = None,
+        employer: Optional[str] = None,
     ) -> None:
         """Инициализация вакансии.
         :param title: Название вакансии
@@ -36,13 +47,19 @@ class Vacancy:
         :param published_at: Дата публикации в формате ISO
         :param url: Ссылка на вакансию
         :param salary: Зарплата (если не указана, 0)
-        :param description: Краткое описание вакансии"""
+        :param description: Краткое описание вакансии
+        :param key_skills: Ключевые навыки (из детальной карточки вакансии)
+        :param experience: Требуемый опыт работы (из детальной карточки вакансии)
+        :param employer: Название работодателя"""
         self.__title = self.__validate_title(title)
         self.__location = self.__validate_location(location)
         self.__published_at = self.__validate_date(published_at)
         self.__url = self.__validate_url(url)
         self.__salary = self.__validate_salary(salary)
         self.__description = self.__validate_description(description)
+        self.__key_skills = self.__validate_key_skills(key_skills)
+        self.__experience = self.__validate_experience(experience)
+        self.__employer = self.__validate_employer(employer)
 
     # ================= Валидация =================
 
@@ -87,6 +104,26 @@ class Vacancy:
             return "Описание не указано"
         return value.strip()
 
+    def __validate_key_skills(self, value: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        """Проверка и нормализация списка ключевых навыков (строка через ";" — как в CSV/XLSX)."""
+        if not value:
+            return ()
+        if isinstance(value, str):
+            value = value.split(";")
+        return tuple(skill.strip() for skill in value if isinstance(skill, str) and skill.strip())
+
+    def __validate_experience(self, value: Optional[str]) -> str:
+        """Проверка и нормализация требуемого опыта работы."""
+        if not value or not isinstance(value, str):
+            return "Не указано"
+        return value.strip()
+
+    def __validate_employer(self, value: Optional[str]) -> str:
+        """Проверка и нормализация названия работодателя."""
+        if not value or not isinstance(value, str):
+            return "Не указано"
+        return value.strip()
+
     def to_dict(self) -> dict:
         """Возвращает словари всех атрибутов вакансии"""
         return {
@@ -96,8 +133,42 @@ class Vacancy:
             "url": self.url,
             "salary": self.salary,
             "description": self.description,
+            "key_skills": self.key_skills,
+            "experience": self.experience,
+            "employer": self.employer,
         }
 
+    def to_record(self) -> VacancyRecord:
+        """Компактное представление вакансии (кортеж уже проверенных значений) для pickle."""
+        return (
+            self.__title,
+            self.__location,
+            self.__published_at,
+            self.__url,
+            self.__salary,
+            self.__description,
+            self.__key_skills,
+            self.__experience,
+            self.__employer,
+        )
+
+    @classmethod
+    def from_record(cls, record: VacancyRecord) -> "Vacancy":
+        """Восстанавливает вакансию из to_record() без повторной валидации."""
+        vacancy = cls.__new__(cls)
+        (
+            vacancy.__title,
+            vacancy.__location,
+            vacancy.__published_at,
+            vacancy.__url,
+            vacancy.__salary,
+            vacancy.__description,
+            vacancy.__key_skills,
+            vacancy.__experience,
+            vacancy.__employer,
+        ) = record
+        return vacancy
+
     # ================= Свойства =================
 
     @property
@@ -124,6 +195,18 @@ class Vacancy:
     def description(self) -> str:
         return self.__description
 
+    @property
+    def key_skills(self) -> List[str]:
+        return list(self.__key_skills)
+
+    @property
+    def experience(self) -> str:
+        return self.__experience
+
+    @property
+    def employer(self) -> str:
+        return self.__employer
+
     # ================= Сравнение =================
 
     def __eq__(self, other: object) -> bool:
@@ -0,0 +1,386 @@
+# Что реализовано:
+# WatchDaemon — фоновый режим: сохранённые поиски (запросы + фильтры + хранилище) опрашиваются по расписанию.
+# Каждый поиск (SavedSearch) опрашивается со своим интервалом; к интервалу добавляется случайный сдвиг
+# (jitter), чтобы поиски не били в API одновременно. Между циклами процесс не перезапускается:
+# клиенты API работают через одну requests.Session (соединения переиспользуются), хранилища открываются
+# один раз и держат кэш запросов (QueryCache), множества уже сохранённых и уже полученных url — в памяти.
+# Опрос инкрементальный: с начала второго цикла каждому источнику передаётся date_from (дата самой свежей
+# вакансии, полученной этим поиском из этого источника), а страница, на которой нет новых url, прекращает
+# постраничную загрузку. Полученные url запоминаются и отметка сдвигается только после успешной записи
+# в хранилище, поэтому вакансии цикла с ошибкой будут получены снова. Хранятся url только вакансий не старше
+# отметки источника (более старые date_from всё равно не вернёт) и не больше MAX_SEEN_URLS на источник.
+# Для каждого поиска ведётся статистика: свежесть (сколько секунд назад был успешный опрос), длительность
+# циклов, найдено и добавлено вакансий, последняя ошибка. stats() отдаёт её списком, а с stats_path она
+# после каждого цикла сохраняется в JSON-файл. Те же величины пишутся в реестр metrics (watch_*).
+# Ошибка цикла (в том числе непредвиденная) учитывается в статистике и не останавливает опрос остальных поисков.
+# Сохранённые поиски задаются JSON-файлом: список объектов с полями SavedSearch (load_saved_searches()).
+
+import heapq
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from src.federation import merge_sources
+from src.get_api import PagedVacancyAPI, get_provider
+from src.indexes import to_timestamp
+from src.pipeline import process_items
+from src.profiling import metrics
+from src.query_cache import QueryCache
+from src.work_files import FileHandler, get_handler
+
+DEFAULT_INTERVAL = 900.0
+DEFAULT_JITTER = 0.1
+MAX_SEEN_URLS = 10000
+
+
+class SavedSearch:
+    """Сохранённый поиск: запросы, фильтры, источники, хранилище и интервал опроса."""
+
+    FIELDS = (
+        "name",
+        "queries",
+        "store",
+        "store_format",
+        "interval",
+        "keywords",
+        "location",
+        "salary_min",
+        "salary_max",
+        "sources",
+        "api_urls",
+        "pages",
+        "per_page",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        queries: Sequence[str],
+        store: str,
+        store_format: Optional[str] = None,
+        interval: float = DEFAULT_INTERVAL,
+        keywords: Sequence[str] = (),
+        location: Optional[str] = None,
+        salary_min: Optional[int] = None,
+        salary_max: Optional[int] = None,
+        sources: Sequence[str] = ("hh",),
+        api_urls: Optional[Dict[str, str]] = None,
+        pages: int = 5,
+        per_page: int = 100,
+    ) -> None:
+        """:param name: Имя поиска (в статистике и метриках)
+        :param queries: Поисковые запросы
+        :param store: Файл или каталог хранилища для найденных вакансий
+        :param store_format: Формат хранилища (по умолчанию — по расширению)
+        :param interval: Интервал опроса, с
+        :param keywords: Ключевые слова для фильтрации
+        :param location: Локация для фильтрации
+        :param salary_min: Минимальная зарплата
+        :param salary_max: Максимальная зарплата
+        :param sources: Источники вакансий (имена из get_api.PROVIDERS)
+        :param api_urls: Адреса API источников (по умолчанию — адреса источников)
+        :param pages: Максимум страниц на запрос за цикл
+        :param per_page: Вакансий на странице"""
+        if not queries:
+            raise ValueError(f"В сохранённом поиске {name} нет запросов")
+        if interval <= 0:
+            raise ValueError(f"Интервал опроса поиска {name} должен быть положительным")
+        self.name = name
+        self.queries = list(queries)
+        self.store = store
+        self.store_format = store_format
+        self.interval = float(interval)
+        self.keywords = list(keywords)
+        self.location = location
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.sources = list(sources)
+        self.api_urls = dict(api_urls or {})
+        self.pages = pages
+        self.per_page = per_page
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SavedSearch":
+        unknown = set(data) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Неизвестные поля сохранённого поиска: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+def load_saved_searches(path: str) -> List[SavedSearch]:
+    """Читает сохранённые поиски из JSON-файла (список объектов или {"searches": [...]})."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("searches", [])
+    searches = [SavedSearch.from_dict(entry) for entry in data]
+    names = [search.name for search in searches]
+    if len(set(names)) != len(names):
+        raise ValueError("Имена сохранённых поисков должны быть уникальными")
+    return searches
+
+
+class _SearchState:
+    """Состояние поиска между циклами: отметки самой свежей вакансии по источникам и статистика."""
+
+    def __init__(self) -> None:
+        self.watermarks: Dict[str, float] = {}
+        # url, уже полученные этим поиском из источника (в том числе не прошедшие фильтры) -> дата публикации
+        self.seen: Dict[str, Dict[str, Optional[float]]] = {}
+        self.cycles = 0
+        self.errors = 0
+        self.last_started: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.total_duration = 0.0
+        self.last_found = 0
+        self.last_added = 0
+        self.total_added = 0
+        self.last_error: Optional[str] = None
+
+
+class WatchDaemon:
+    """Периодический инкрементальный опрос сохранённых поисков в одном долгоживущем процессе."""
+
+    def __init__(
+        self,
+        searches: Sequence[SavedSearch],
+        jitter: float = DEFAULT_JITTER,
+        stats_path: Optional[str] = None,
+        timeout: float = 10,
+        clock: Callable[[], float] = time.time,
+        seed: Optional[int] = None,
+    ) -> None:
+        """:param searches: Сохранённые поиски
+        :param jitter: Случайный сдвиг интервала, доля интервала (0.1 — ±10%)
+        :param stats_path: Файл JSON для статистики (обновляется после каждого цикла)
+        :param timeout: Таймаут HTTP-запроса, с
+        :param clock: Источник текущего времени (для тестов)
+        :param seed: Начальное значение генератора сдвигов"""
+        self.searches = list(searches)
+        self.jitter = max(0.0, jitter)
+        self.stats_path = Path(stats_path) if stats_path else None
+        self._timeout = timeout
+        self._clock = clock
+        self._random = random.Random(seed)
+        self._stop = threading.Event()
+        self._session: Any = None
+        self._clients: Dict[Tuple[str, str, int, int], PagedVacancyAPI] = {}
+        self._stores: Dict[Tuple[str, Optional[str]], FileHandler] = {}
+        self._known: Dict[str, Set[str]] = {}
+        self._cache = QueryCache()
+        self._states = {search.name: _SearchState() for search in self.searches}
+
+    # ------------------ Тёплые ресурсы ------------------
+    def _client(self, source: str, search: SavedSearch) -> PagedVacancyAPI:
+        """Клиент источника (один на источник и параметры страниц, с общей сессией requests)."""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        url = search.api_urls.get(source, "")
+        key = (source, url, search.pages, search.per_page)
+        if key not in self._clients:
+            self._clients[key] = get_provider(
+                source,
+                base_url=url or None,
+                per_page=search.per_page,
+                pages=search.pages,
+                timeout=self._timeout,
+                session=self._session,
+            )
+        return self._clients[key]
+
+    def _store(self, search: SavedSearch) -> FileHandler:
+        """Хранилище поиска (открывается один раз; url сохранённых вакансий держатся в памяти)."""
+        key = (str(Path(search.store).resolve()), search.store_format)
+        if key not in self._stores:
+            handler = get_handler(search.store, search.store_format)
+            handler.enable_cache(self._cache)
+            self._stores[key] = handler
+            self._known[str(handler.filename)] = {item["url"] for item in handler.iter_items() if item.get("url")}
+        return self._stores[key]
+
+    # ------------------ Опрос ------------------
+    def _fetch_new(self, search: SavedSearch, known: Set[str]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Новые вакансии по всем запросам, по источникам: загрузка страниц прекращается на странице без новых url."""
+        state = self._states[search.name]
+        batches = []
+        for source in search.sources:
+            client = self._client(source, search)
+            watermark = state.watermarks.get(source)
+            since = datetime.fromtimestamp(watermark, timezone.utc) if watermark is not None else None
+            seen = state.seen.get(source, {})
+            # url этого цикла запоминаются в state.seen только после успешной записи (_advance)
+            fetched: Set[Any] = set()
+            items: List[Dict[str, Any]] = []
+            for query in search.queries:
+                for page in client.iter_pages(query, since):
+                    fresh = [
+                        item
+                        for item in page
+                        if item.get("alternate_url") not in known
+                        and item.get("alternate_url") not in seen
+                        and item.get("alternate_url") not in fetched
+                    ]
+                    fetched.update(item.get("alternate_url") for item in fresh)
+                    items.extend(fresh)
+                    if not fresh:
+                        break
+            batches.append((source, items))
+        return batches
+
+    @staticmethod
+    def _advance(state: _SearchState, source: str, items: List[Dict[str, Any]]) -> None:
+        """После успешной записи: запоминает url цикла, сдвигает отметку источника на самую свежую вакансию
+        и забывает url старше отметки."""
+        seen = state.seen.setdefault(source, {})
+        for item in items:
+            if item.get("alternate_url"):
+                seen[item["alternate_url"]] = to_timestamp(item.get("published_at"))
+        stamps = [stamp for stamp in (to_timestamp(item.get("published_at")) for item in items) if stamp is not None]
+        if stamps and max(stamps) > state.watermarks.get(source, float("-inf")):
+            state.watermarks[source] = max(stamps)
+        watermark = state.watermarks.get(source)
+        if watermark is not None:
+            for url in [url for url, stamp in seen.items() if stamp is not None and stamp < watermark]:
+                del seen[url]
+        # Источник без даты публикации или без date_from: храним только последние MAX_SEEN_URLS url
+        for url in list(seen)[: max(0, len(seen) - MAX_SEEN_URLS)]:
+            del seen[url]
+
+    def poll(self, search: SavedSearch) -> Dict[str, Any]:
+        """Один цикл опроса поиска: новые вакансии фильтруются и добавляются в хранилище.
+        :return: Статистика поиска после цикла"""
+        state = self._states[search.name]
+        handler = self._store(search)
+        known = self._known[str(handler.filename)]
+
+        state.last_started = self._clock()
+        started = time.perf_counter()
+        try:
+            batches = self._fetch_new(search, known)
+            api_items = merge_sources(batches)
+            vacancies = process_items(
+                api_items,
+                search.keywords,
+                search.location,
+                search.salary_min,
+                search.salary_max,
+                skip_invalid=True,
+                workers=1,
+            )
+            records = [vac.to_dict() for vac in vacancies if vac.url not in known]
+            if records:
+                handler.add_items(records)
+                known.update(record["url"] for record in records)
+            for source, items in batches:
+                self._advance(state, source, items)
+            metrics.inc("watch_new_items_total", len(records), search=search.name)
+            state.last_found, state.last_added = len(api_items), len(records)
+            state.total_added += len(records)
+            state.last_success = self._clock()
+            state.last_error = None
+        except (ConnectionError, ValueError, OSError) as e:
+            state.errors += 1
+            state.last_error = str(e)
+            metrics.inc("watch_errors_total", search=search.name)
+        except Exception as e:
+            # Непредвиденная ошибка (например, в ответе источника) не должна останавливать демон
+            state.errors += 1
+            state.last_error = f"{type(e).__name__}: {e}"
+            metrics.inc("watch_errors_total", search=search.name)
+            print(f"Поиск {search.name}: ошибка цикла опроса: {state.last_error}", file=sys.stderr)
+        finally:
+            state.cycles += 1
+            state.last_duration = time.perf_counter() - started
+            state.total_duration += state.last_duration
+            metrics.observe("watch_cycle_seconds", state.last_duration, search=search.name)
+        self._write_stats()
+        return self.search_stats(search.name)
+
+    def next_delay(self, search: SavedSearch) -> float:
+        """Интервал до следующего опроса со случайным сдвигом ±jitter."""
+        return search.interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def run(self, max_cycles: Optional[int] = None) -> None:
+        """Опрашивает поиски по расписанию до stop() (или до max_cycles циклов в сумме).
+        Первый опрос каждого поиска — сразу при запуске (со сдвигом в пределах jitter)."""
+        now = self._clock()
+        queue = [
+            (now + self._random.uniform(0, self.jitter) * search.interval, number)
+            for number, search in enumerate(self.searches)
+        ]
+        heapq.heapify(queue)
+        cycles = 0
+        while queue and not self._stop.is_set() and (max_cycles is None or cycles < max_cycles):
+            due, number = heapq.heappop(queue)
+            if self._stop.wait(max(0.0, due - self._clock())):
+                break
+            search = self.searches[number]
+            self.poll(search)
+            cycles += 1
+            heapq.heappush(queue, (self._clock() + self.next_delay(search), number))
+
+    def stop(self) -> None:
+        """Останавливает run() (можно вызывать из другого потока или обработчика сигнала)."""
+        self._stop.set()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self._clients.clear()
+
+    # ------------------ Статистика ------------------
+    def search_stats(self, name: str) -> Dict[str, Any]:
+        state = self._states[name]
+        now = self._clock()
+        freshness = None if state.last_success is None else round(now - state.last_success, 3)
+        if freshness is not None:
+            metrics.set_gauge("watch_freshness_seconds", freshness, search=name)
+        return {
+            "name": name,
+            "cycles": state.cycles,
+            "errors": state.errors,
+            "freshness_seconds": freshness,
+            "last_success": _iso(state.last_success),
+            "last_duration_seconds": _round(state.last_duration),
+            "avg_duration_seconds": _round(state.total_duration / state.cycles if state.cycles else None),
+            "last_found": state.last_found,
+            "last_added": state.last_added,
+            "total_added": state.total_added,
+            "newest_published_at": _iso(max(state.watermarks.values(), default=None)),
+            "last_error": state.last_error,
+        }
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Статистика по всем поискам."""
+        return [self.search_stats(search.name) for search in self.searches]
+
+    def _write_stats(self) -> None:
+        """Сохраняет статистику в stats_path (через временный файл и os.replace)."""
+        if self.stats_path is None:
+            return
+        self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.stats_path.with_name(self.stats_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, self.stats_path)
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return None if timestamp is None else datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
@@ -1,58 +1,385 @@
 # Что реализовано:
 # Абстрактный класс FileHandler с методами add_items, get_items, delete_items.
-# Наследники для JSON, CSV, XLSX, TXT.
+# Наследники для JSON, CSV, XLSX, TXT реализуют только чтение (_read_items) и запись (_write_items) файла;
+# get_handler() выбирает хэндлер по формату или расширению файла.
 # Не перезаписываются данные, добавляются новые вакансии.
 # Приватный атрибут файла с именем, есть значение по умолчанию.
 # Везде используется remove_duplicates(current, items, key="url").
 # Файлы создаются при необходимости (_ensure_file или проверка os.path.exists).
 # Данные корректно сохраняются и читаются для всех форматов: JSON, CSV, XLSX, TXT.
+# Поля записей описаны общей схемой VACANCY_SCHEMA (src/schema.py): CSV и XLSX при чтении один раз приводят
+# столбцы к её типам (int salary, список key_skills), а фильтры get_items/delete_items сравнивают значения
+# напрямую с критериями, приведёнными к тем же типам.
 # Методы delete_items удаляют элементы по критериям и перезаписывают файл.
+# К любому хэндлеру можно подключить индексы (attach_index), они обновляются при add_items/delete_items.
+# Файлы индексов сохраняются пакетами — после каждых INDEX_SAVE_BATCH изменённых записей, а остаток —
+# при save_indexes() / close() (хэндлер можно использовать как контекстный менеджер).
+# search() ищет вакансии по ключевым словам через подключённый InvertedIndex и читает только найденные url
+# (get_items с критерием url: кэш, карта url секций и оглавление блоков сжатых файлов).
+# С подключённым NearDuplicateIndex add_items() не добавляет почти-дубликаты сохранённых вакансий
+# (перепубликации под новым url, src/near_duplicates.py).
+# query() отбирает вакансии по локации, датам и зарплате: множества url из подключённых вторичных
+# индексов (LocationIndex, DateIndex, SalaryIndex) пересекаются, и проверяются только строки-кандидаты.
+# iter_items() и _write_stream() читают и пишут файл построчно (JSONL, CSV, чтение XLSX; JSON — потоковым
+# разбором массива по JSON_CHUNK_SIZE символов) — для обработки больших хранилищ без загрузки в память целиком.
+# Фазы read, filter, merge, write замеряются в реестре metrics (store_seconds{handler, phase}).
+# enable_cache() включает кэш результатов get_items() по критериям и версии файла (src/query_cache.py);
+# изменения через add_items/delete_items/replace_items сбрасывают его.
+# Для каталога с секциями (manifest.json) get_handler() возвращает ShardedHandler из src/sharding.py,
+# для файлов .jsonl.gz, .csv.gz, .jsonl.zst, .csv.zst — сжатые блоками хэндлеры из src/compressed.py.
+# openpyxl импортируется только внутри XLSXHandler — при работе с JSON/CSV/TXT он не загружается.
 
 
 import csv
 import json
+import os
+import textwrap
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
-from openpyxl import Workbook, load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, List, Optional, Set, TextIO, Tuple, Type, TypeVar
 
 from config import DATA_FOLDER
-from src.services import remove_duplicates
+from src.indexes import DateIndex, ItemIndex, LocationIndex, SalaryIndex, normalize_location, to_salary, to_timestamp
+from src.near_duplicates import NearDuplicateIndex
+from src.profiling import metrics
+from src.query_cache import QueryCache, query_cache
+from src.schema import LIST_SEPARATOR, VACANCY_FIELDS, criteria_checks, criteria_key, decode_rows
+from src.services import batched, remove_duplicates
+from src.text_index import InvertedIndex
+
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+    from openpyxl.worksheet.worksheet import Worksheet
+
+IndexT = TypeVar("IndexT", bound=ItemIndex)
+
+# Строк табличного файла, декодируемых за один проход по столбцам при потоковом чтении
+DECODE_BATCH = 1000
+# Символов JSON-файла, читаемых за раз при потоковом разборе массива
+JSON_CHUNK_SIZE = 1 << 16
+_JSON_SEPARATORS = frozenset(" \t\r\n,")
+# Изменённых записей, после которых файлы подключённых индексов перезаписываются
+INDEX_SAVE_BATCH = 10000
 
 
 # ------------------ Абстрактный класс ------------------
 class FileHandler(ABC):
     """Абстрактный класс для работы с файлами вакансий."""
 
-    def __init__(self, filename: Optional[str] = None) -> None:
-        """:param filename: Имя файла"""
+    def __init__(self, filename: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> None:
+        """:param filename: Имя файла
+        :param fields: Колонки табличных форматов CSV/XLSX (по умолчанию VACANCY_FIELDS)"""
         if filename is None:
             filename = "data/vacancies_data"
 
         self.__filename: Path = DATA_FOLDER / filename
         Path(self.__filename).parent.mkdir(exist_ok=True, parents=True)
+        self._indexes: List[ItemIndex] = []
+        self.fields: List[str] = list(fields) if fields is not None else list(VACANCY_FIELDS)
+        self._cache: Optional[QueryCache] = None
+        self._generation = 0
+        self._unsaved_changes = 0
 
     @abstractmethod
-    def add_items(self, items: List[Dict[str, Any]]) -> None: ...
+    def _ensure_file(self) -> None: ...
 
-    """Добавляет вакансии в файл."""
+    """Создаёт файл, если его нет."""
 
     @abstractmethod
-    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]: ...
+    def _read_items(self) -> List[Dict[str, Any]]: ...
 
-    """Возвращает вакансии из файла с возможной фильтрацией."""
+    """Читает все вакансии из файла."""
 
     @abstractmethod
-    def delete_items(self, criteria: Optional[Dict[str, Any]] = None) -> None: ...
+    def _write_items(self, items: List[Dict[str, Any]]) -> None: ...
+
+    """Перезаписывает файл переданными вакансиями."""
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Построчно отдаёт вакансии из файла (форматы, которые это позволяют, не читают файл целиком)."""
+        self._ensure_file()
+        yield from self._read_items()
 
-    """Удаляет вакансии из файла по критериям."""
+    def _write_stream(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Перезаписывает файл вакансиями из итератора (форматы, которые это позволяют, пишут построчно)."""
+        self._write_items(list(items))
+
+    def _options(self) -> Dict[str, Any]:
+        """Параметры конструктора, кроме имени файла (для такого же хранилища в другом файле)."""
+        return {"fields": self.fields}
+
+    def _span(self, phase: str) -> ContextManager[None]:
+        """Замер фазы работы с файлом (read, filter, merge, write) в реестре metrics."""
+        return metrics.span("store_seconds", handler=type(self).__name__, phase=phase)
+
+    def add_items(self, items: List[Dict[str, Any]]) -> int:
+        """Добавляет вакансии в файл.
+        :return: Количество добавленных вакансий (без дубликатов по url)"""
+        self._ensure_file()
+        items = self._drop_near_duplicates(items)
+        current = self.get_items()
+        with self._span("merge"):
+            combined = remove_duplicates(current, items, key="url")
+        with self._span("write"):
+            self._write_items(combined)
+        self._mark_changed(combined)
+        self._notify_added(current, combined)
+        return len(combined) - len(current)
+
+    def count(self) -> int:
+        """Количество вакансий в хранилище (с включённым кэшем — без повторного чтения после add_items)."""
+        return len(self.get_items())
+
+    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Возвращает вакансии из файла с возможной фильтрацией."""
+        self._ensure_file()
+        return self._cached_query(criteria, self._read_items)
+
+    def delete_items(self, criteria: Optional[Dict[str, Any]] = None) -> None:
+        """Удаляет вакансии из файла по критериям."""
+        items = self.get_items()
+        with self._span("merge"):
+            remaining = _remove_items(items, criteria)
+        with self._span("write"):
+            self._write_items(remaining)
+        self._mark_changed(remaining)
+        self._notify_removed(items, remaining)
+
+    def replace_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Заменяет содержимое файла потоком вакансий (без объединения с текущими) и перестраивает индексы."""
+        self._ensure_file()
+        with self._span("write"):
+            self._write_stream(items)
+        self._mark_changed()
+        self.rebuild_indexes()
+
+    # ------------------ Кэш запросов ------------------
+    def enable_cache(self, cache: Optional[QueryCache] = None) -> QueryCache:
+        """Включает кэш результатов get_items() (по умолчанию — общий для процесса query_cache)."""
+        self._cache = cache if cache is not None else query_cache
+        return self._cache
+
+    def _store_version(self) -> Tuple[int, int, int]:
+        """Версия содержимого хранилища: счётчик изменений через этот хэндлер, mtime и размер файла."""
+        stat = os.stat(self.filename)
+        return self._generation, stat.st_mtime_ns, stat.st_size
+
+    def _mark_changed(self, items: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Отмечает изменение файла: сбрасывает его результаты в кэше и кэширует новое содержимое (если известно)."""
+        self._generation += 1
+        if self._cache is None:
+            return
+        self._cache.invalidate(str(self.filename))
+        if items is not None:
+            self._cache.put(str(self.filename), (self._store_version(), None), items)
+
+    def _cached_query(
+        self, criteria: Optional[Dict[str, Any]], load: Callable[[], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Результат get_items() через кэш.
+        :param load: Чтение записей, среди которых есть все подходящие под criteria"""
+        if self._cache is None:
+            with self._span("read"):
+                items = load()
+            with self._span("filter"):
+                return _filter_items(items, criteria)
+
+        store, version = str(self.filename), self._store_version()
+        key = _criteria_key(criteria)
+        cached = self._cache.get(store, (version, key))
+        if cached is not None:
+            return cached
+        # Отбор по критериям можно сделать по закэшированному полному содержимому, не читая файл
+        full = self._cache.get(store, (version, None)) if key is not None else None
+        if full is None:
+            with self._span("read"):
+                full = load()
+            if key is None:
+                self._cache.put(store, (version, None), full)
+        with self._span("filter"):
+            result = _filter_items(full, criteria)
+        if key is not None:
+            self._cache.put(store, (version, key), result)
+        return result
 
     @property
     def filename(self) -> Path:
         return self.__filename
 
+    # ------------------ Индексы ------------------
+    def attach_index(self, index: ItemIndex, rebuild: bool = False) -> ItemIndex:
+        """Подключает индекс к хранилищу.
+        :param index: Индекс, который будет обновляться при add_items/delete_items
+        :param rebuild: Перестроить индекс по текущему содержимому файла
+        :return: Подключённый индекс"""
+        if rebuild:
+            index.rebuild(self.get_items())
+            index.save()
+        self._indexes.append(index)
+        return index
+
+    @property
+    def indexes(self) -> List[ItemIndex]:
+        return list(self._indexes)
+
+    def rebuild_indexes(self, batch_size: int = 10000) -> None:
+        """Перестраивает подключённые индексы по содержимому файла пакетами по batch_size записей.
+        Постоянные индексы (ItemIndex.persistent) не очищаются, а только дополняются."""
+        if not self._indexes:
+            return
+        for index in self._indexes:
+            if not index.persistent:
+                index.clear()
+        for batch in batched(self.iter_items(), batch_size):
+            for index in self._indexes:
+                index.add_items(batch)
+        self.save_indexes()
+
+    def save_indexes(self) -> None:
+        """Сохраняет файлы подключённых индексов (изменения, накопленные с последнего сохранения)."""
+        for index in self._indexes:
+            index.save()
+        self._unsaved_changes = 0
+
+    def close(self) -> None:
+        """Сохраняет индексы; хэндлером можно пользоваться и дальше."""
+        self.save_indexes()
+
+    def __enter__(self) -> "FileHandler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _drop_near_duplicates(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Отбрасывает новые вакансии, почти совпадающие с сохранёнными (если подключён NearDuplicateIndex)."""
+        index = self._find_index(NearDuplicateIndex)
+        if index is None:
+            return items
+        return index.filter_new(items)[0]
+
+    def _notify_added(self, current: List[Dict[str, Any]], combined: List[Dict[str, Any]]) -> None:
+        """Передаёт индексам записи, которых не было в файле до add_items."""
+        if not self._indexes:
+            return
+        known = {item.get("url") for item in current}
+        self._update_indexes(added=[item for item in combined if item.get("url") not in known])
+
+    def _notify_removed(self, items: List[Dict[str, Any]], remaining: List[Dict[str, Any]]) -> None:
+        """Передаёт индексам записи, удалённые в delete_items."""
+        if not self._indexes:
+            return
+        kept = {item.get("url") for item in remaining}
+        self._update_indexes(removed=[item for item in items if item.get("url") not in kept])
+
+    def _update_indexes(self, added: Iterable[Dict[str, Any]] = (), removed: Iterable[Dict[str, Any]] = ()) -> None:
+        added, removed = list(added), list(removed)
+        if not added and not removed:
+            return
+        for index in self._indexes:
+            if removed:
+                index.remove_items(removed)
+            if added:
+                index.add_items(added)
+        self._unsaved_changes += len(added) + len(removed)
+        if self._unsaved_changes >= INDEX_SAVE_BATCH:
+            self.save_indexes()
+
+    def _find_index(self, index_type: Type[IndexT]) -> Optional[IndexT]:
+        """Возвращает первый подключённый индекс заданного типа."""
+        return next((index for index in self._indexes if isinstance(index, index_type)), None)
+
+    def query(
+        self,
+        location: Optional[str] = None,
+        location_match: str = "substring",
+        date_from: Any = None,
+        date_to: Any = None,
+        salary_min: Optional[int] = None,
+        salary_max: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Отбор вакансий по локации, диапазону дат публикации и диапазону зарплат.
+        Критерии, для которых подключён индекс, превращаются в множества url и пересекаются
+        (от меньшего к большему); остальные проверяются только на строках-кандидатах.
+        :param location: Локация
+        :param location_match: "exact", "prefix" или "substring"
+        :param date_from: Начало диапазона дат (datetime или строка ISO)
+        :param date_to: Конец диапазона дат (datetime или строка ISO)
+        :param salary_min: Минимальная зарплата
+        :param salary_max: Максимальная зарплата
+        :return: Список вакансий в порядке хранения"""
+        candidate_sets: List[Set[str]] = []
+        checks: List[Callable[[Dict[str, Any]], bool]] = []
+
+        if location is not None:
+            location_index = self._find_index(LocationIndex)
+            if location_index is not None:
+                candidate_sets.append(location_index.lookup(location, location_match))
+            else:
+                checks.append(_location_check(location, location_match))
+
+        if date_from is not None or date_to is not None:
+            date_index = self._find_index(DateIndex)
+            if date_index is not None:
+                candidate_sets.append(date_index.between(date_from, date_to))
+            else:
+                low, high = to_timestamp(date_from), to_timestamp(date_to)
+                checks.append(_range_check("published_at", to_timestamp, low, high))
+
+        if salary_min is not None or salary_max is not None:
+            salary_index = self._find_index(SalaryIndex)
+            if salary_index is not None:
+                candidate_sets.append(salary_index.range(salary_min, salary_max))
+            else:
+                checks.append(_range_check("salary", to_salary, salary_min, salary_max))
+
+        candidates: Optional[Set[str]] = None
+        for urls in sorted(candidate_sets, key=len):
+            candidates = set(urls) if candidates is None else candidates & urls
+            if not candidates:
+                return []
+
+        result = []
+        scope = self._query_scope(
+            location, location_match, to_timestamp(date_from), to_timestamp(date_to), salary_min, salary_max
+        )
+        for item in scope:
+            if candidates is not None and item.get("url") not in candidates:
+                continue
+            if all(check(item) for check in checks):
+                result.append(item)
+        return result
+
+    def _query_scope(
+        self,
+        location: Optional[str],
+        location_match: str,
+        date_low: Optional[float],
+        date_high: Optional[float],
+        salary_min: Optional[int],
+        salary_max: Optional[int],
+    ) -> Iterable[Dict[str, Any]]:
+        """Записи, которые query() проверяет по критериям (в секционированных хранилищах — только нужные секции)."""
+        return self.get_items()
+
+    def search(
+        self, query: Iterable[str] | str, mode: str = "or", limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Полнотекстовый поиск по title/description через подключённый InvertedIndex.
+        :param query: Строка запроса или список ключевых слов
+        :param mode: "or" — хотя бы одно слово, "and" — все слова
+        :param limit: Максимальное количество результатов
+        :return: Вакансии по убыванию релевантности (BM25)"""
+        text_index = self._find_index(InvertedIndex)
+        if text_index is None:
+            raise ValueError("К хранилищу не подключён полнотекстовый индекс (InvertedIndex)")
+        ranked = text_index.search(query, mode=mode, limit=limit)
+        if not ranked:
+            return []
+        by_url = {item.get("url"): item for item in self.get_items({"url": [url for url, _ in ranked]})}
+        return [by_url[url] for url, _ in ranked if url in by_url]
+
 
 # ------------------ JSON ------------------
 class JSONHandler(FileHandler):
@@ -64,27 +391,31 @@ class JSONHandler(FileHandler):
             with open(self.filename, "w", encoding="utf-8") as f:
                 json.dump([], f, ensure_ascii=False, indent=4)
 
-    def add_items(self, items: List[Dict[str, Any]]) -> None:
-        """добавления новых вакансий в файл."""
-        self._ensure_file()
-        current = self.get_items()
-        combined = remove_duplicates(current, items, key="url")
+    def _read_items(self) -> List[Dict[str, Any]]:
+        """читает вакансии из JSON."""
+        with open(self.filename, "r", encoding="utf-8") as f:
+            items: List[Dict[str, Any]] = json.load(f)
+        return items
+
+    def _write_items(self, items: List[Dict[str, Any]]) -> None:
+        """перезаписывает JSON-файл."""
         with open(self.filename, "w", encoding="utf-8") as f:
-            json.dump(combined, f, ensure_ascii=False, indent=4)
+            json.dump(items, f, ensure_ascii=False, indent=4)
 
-    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """читает вакансии из XLSX и фильтрует их."""
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """потоково разбирает JSON-массив: в памяти — буфер чтения и одна вакансия."""
         self._ensure_file()
         with open(self.filename, "r", encoding="utf-8") as f:
-            items = json.load(f)
-        return _filter_items(items, criteria)
+            yield from _iter_json_array(f)
 
-    def delete_items(self, criteria: Optional[Dict[str, Any]] = None) -> None:
-        """удаление вакансий из файла"""
-        items = self.get_items()
-        remaining = _remove_items(items, criteria)
+    def _write_stream(self, items: Iterable[Dict[str, Any]]) -> None:
+        """пишет JSON-массив по одной вакансии (результат совпадает с json.dump(..., indent=4))."""
         with open(self.filename, "w", encoding="utf-8") as f:
-            json.dump(remaining, f, ensure_ascii=False, indent=4)
+            separator = "[\n"
+            for item in items:
+                f.write(separator + textwrap.indent(json.dumps(item, ensure_ascii=False, indent=4), "    "))
+                separator = ",\n"
+            f.write("[]" if separator == "[\n" else "\n]")
 
 
 # ------------------ CSV ------------------
@@ -93,48 +424,44 @@ class CSVHandler(FileHandler):
         """создаёт файл с заголовком, если его нет."""
         if not Path(self.filename).exists():
             with open(self.filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(
-                    f, fieldnames=["title", "location", "published_at", "url", "salary", "description"]
-                )
+                writer = csv.DictWriter(f, fieldnames=self.fields)
                 writer.writeheader()
 
-    def add_items(self, items: List[Dict[str, Any]]) -> None:
-        """добавления новых вакансий в файл."""
-        self._ensure_file()
-        current = self.get_items()
-        combined = remove_duplicates(current, items, key="url")
+    def _read_items(self) -> List[Dict[str, Any]]:
+        """читает вакансии из CSV (значения приводятся к типам схемы по столбцам)."""
+        with open(self.filename, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            return decode_rows(header, list(reader)) if header else []
+
+    def _write_items(self, items: List[Dict[str, Any]]) -> None:
+        """перезаписывает CSV-файл."""
+        self._write_stream(items)
+
+    def _write_stream(self, items: Iterable[Dict[str, Any]]) -> None:
+        """построчно пишет CSV-файл."""
         with open(self.filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f, fieldnames=["title", "location", "published_at", "url", "salary", "description"]
-            )
+            writer = csv.DictWriter(f, fieldnames=self.fields)
             writer.writeheader()
-            writer.writerows(combined)
+            writer.writerows({k: _flat_value(v) for k, v in item.items()} for item in items)
 
-    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """читает вакансии из XLSX и фильтрует их."""
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """построчно читает вакансии из CSV (декодирование пакетами по DECODE_BATCH строк)."""
         self._ensure_file()
         with open(self.filename, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            items = list(reader)
-        return _filter_items(items, criteria)
-
-    def delete_items(self, criteria: Optional[Dict[str, Any]] = None) -> None:
-        """удаление вакансий из файла"""
-        items = self.get_items()
-        remaining = _remove_items(items, criteria)
-        with open(self.filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f, fieldnames=["title", "location", "published_at", "url", "salary", "description"]
-            )
-            writer.writeheader()
-            writer.writerows(remaining)
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            for rows in batched(reader, DECODE_BATCH):
+                yield from decode_rows(header, rows)
 
 
 class XLSXHandler(FileHandler):
-    HEADERS = ["title", "location", "published_at", "url", "salary", "description"]
-
-    def _get_worksheet(self) -> Tuple[Workbook, Worksheet]:
+    def _get_worksheet(self) -> Tuple["Workbook", "Worksheet"]:
         """возвращает активный лист; гарантирует, что он не None."""
+        from openpyxl import load_workbook
+
         wb = load_workbook(self.filename)
         ws = wb.active
         if ws is None:
@@ -144,49 +471,51 @@ class XLSXHandler(FileHandler):
     def _ensure_file(self) -> None:
         """создаёт файл с заголовком, если его нет."""
         if not Path(self.filename).exists():
+            from openpyxl import Workbook
+
             wb = Workbook()
             ws = wb.active
             if ws is None:  # страховка для mypy
                 ws = wb.create_sheet("Vacancies")
             ws.title = "Vacancies"
-            ws.append(self.HEADERS)
+            ws.append(self.fields)
             wb.save(self.filename)
 
-    def add_items(self, items: List[Dict[str, Any]]) -> None:
-        """добавления новых вакансий в файл."""
-        self._ensure_file()
-        current = self.get_items()
-        combined = remove_duplicates(current, items, key="url")
-        wb, ws = self._get_worksheet()
-
-        # очищаем все кроме заголовка
-        ws.delete_rows(2, ws.max_row)
-        for item in combined:
-            ws.append([item.get(f, "") for f in self.HEADERS])
-
-        wb.save(self.filename)
-
-    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """читает вакансии из XLSX и фильтрует их."""
-        self._ensure_file()
+    def _read_items(self) -> List[Dict[str, Any]]:
+        """читает вакансии из XLSX."""
         wb, ws = self._get_worksheet()
         rows = list(ws.values)
         if not rows:
             return []
         keys = [str(k) for k in rows[0]]  # гарантируем, что ключи строковые
-        items: List[Dict[str, Any]] = [dict(zip(keys, row)) for row in rows[1:]]
-        return _filter_items(items, criteria)
+        return decode_rows(keys, rows[1:])
 
-    def delete_items(self, criteria: Optional[Dict[str, Any]] = None) -> None:
-        """удаление вакансий из файла"""
-        items = self.get_items()
-        remaining = _remove_items(items, criteria)
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """читает вакансии из XLSX в режиме read_only (строки не загружаются в память целиком)."""
+        from openpyxl import load_workbook
+
+        self._ensure_file()
+        wb = load_workbook(self.filename, read_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)  # type: ignore[union-attr]
+            header = next(rows, None)
+            if header is None:
+                return
+            keys = [str(k) for k in header]
+            for batch in batched(rows, DECODE_BATCH):
+                yield from decode_rows(keys, batch)
+        finally:
+            wb.close()
+
+    def _write_items(self, items: List[Dict[str, Any]]) -> None:
+        """перезаписывает лист XLSX."""
         wb, ws = self._get_worksheet()
 
-        # очищаем все кроме заголовка
-        ws.delete_rows(2, ws.max_row)
-        for item in remaining:
-            ws.append([item.get(f, "") for f in self.HEADERS])
+        # очищаем лист и заново пишем заголовок (в старых файлах он мог быть короче)
+        ws.delete_rows(1, ws.max_row)
+        ws.append(self.fields)
+        for item in items:
+            ws.append([_flat_value(item.get(f, "")) for f in self.fields])
 
         wb.save(self.filename)
 
@@ -195,80 +524,168 @@ class XLSXHandler(FileHandler):
 class TXTHandler(FileHandler):
     def _ensure_file(self) -> None:
         """создаёт файл с заголовком, если его нет."""
-        Path(self.filename).touch(exist_ok=True)
-
-    def add_items(self, items: List[Dict[str, Any]]) -> None:
-        """добавления новых вакансий в файл."""
-        self._ensure_file()
-        current = self.get_items()
-        combined = remove_duplicates(current, items, key="url")
-        with open(self.filename, "w", encoding="utf-8") as f:
-            for item in combined:
-                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        if not Path(self.filename).exists():  # touch() у существующего файла изменил бы mtime
+            Path(self.filename).touch()
 
-    def get_items(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """читает вакансии из XLSX и фильтрует их."""
-        self._ensure_file()
+    def _read_items(self) -> List[Dict[str, Any]]:
+        """читает вакансии из TXT (одна JSON-запись на строку)."""
         items = []
         with open(self.filename, "r", encoding="utf-8") as f:
             for line in f:
                 if line.strip():
                     items.append(json.loads(line.strip()))
-        return _filter_items(items, criteria)
+        return items
 
-    def delete_items(self, criteria: Optional[Dict[str, Any]] = None) -> None:
-        """удаление вакансий из файла"""
-        items = self.get_items()
-        remaining = _remove_items(items, criteria)
+    def _write_items(self, items: List[Dict[str, Any]]) -> None:
+        """перезаписывает TXT-файл."""
+        self._write_stream(items)
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """построчно читает вакансии из TXT."""
+        self._ensure_file()
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _write_stream(self, items: Iterable[Dict[str, Any]]) -> None:
+        """построчно пишет TXT-файл."""
         with open(self.filename, "w", encoding="utf-8") as f:
-            for item in remaining:
+            for item in items:
                 f.write(json.dumps(item, ensure_ascii=False) + "\n")
 
 
+# ------------------ Выбор хэндлера по формату ------------------
+HANDLERS: Dict[str, Type[FileHandler]] = {
+    "json": JSONHandler,
+    "csv": CSVHandler,
+    "xlsx": XLSXHandler,
+    "txt": TXTHandler,
+    "jsonl": TXTHandler,
+}
+
+
+# Сжатые блоками хранилища (src/compressed.py)
+COMPRESSED_FORMATS = ["csv.gz", "csv.zst", "jsonl.gz", "jsonl.zst"]
+
+# Форматы хранилищ: файловые хэндлеры, сжатые файлы и каталог с секциями (src/sharding.py)
+STORE_FORMATS = sorted([*HANDLERS, *COMPRESSED_FORMATS, "sharded"])
+
+
+def get_handler(filename: str, fmt: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> FileHandler:
+    """Создаёт хэндлер по формату (json, csv, xlsx, txt, jsonl, jsonl.gz, csv.gz, jsonl.zst, csv.zst, sharded)
+    или по расширению файла.
+    :param fields: Колонки табличных форматов (по умолчанию VACANCY_FIELDS)"""
+    if fmt is None and (DATA_FOLDER / filename / "manifest.json").exists():
+        fmt = "sharded"
+    if fmt is None and "".join(Path(filename).suffixes[-2:]).lstrip(".").lower() in COMPRESSED_FORMATS:
+        fmt = "".join(Path(filename).suffixes[-2:]).lstrip(".")
+    fmt = (fmt or Path(filename).suffix.lstrip(".")).lower()
+    if fmt == "sharded":
+        from src.sharding import ShardedHandler
+
+        return ShardedHandler(filename)
+    if fmt in COMPRESSED_FORMATS:
+        from src.compressed import compressed_handler
+
+        return compressed_handler(filename, fmt, fields)
+    if fmt not in HANDLERS:
+        raise ValueError(f"Неизвестный формат файла: {fmt or filename}")
+    return HANDLERS[fmt](filename, fields)
+
+
 # ------------------ Вспомогательные функции ------------------
+def _flat_value(value: Any) -> Any:
+    """Списки (например, key_skills) в CSV/XLSX хранятся одной строкой через "; "."""
+    if isinstance(value, (list, tuple)):
+        return LIST_SEPARATOR.join(str(v) for v in value)
+    return value
+
+
+def _iter_json_array(f: TextIO, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """Потоково отдаёт элементы JSON-массива из файла: читается по chunk_size символов, разбирается
+    по одному элементу (json.JSONDecoder.raw_decode), в памяти — только недоразобранный остаток буфера."""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    opened = False
+    while True:
+        while position < len(buffer) and buffer[position] in _JSON_SEPARATORS:
+            position += 1
+        if position < len(buffer):
+            if not opened:
+                if buffer[position] != "[":
+                    raise ValueError(f"{getattr(f, 'name', 'JSON')}: ожидался массив вакансий")
+                opened, position = True, position + 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Число или литерал в конце буфера может продолжаться в следующем фрагменте
+                if end < len(buffer) or eof:
+                    yield item
+                    position = end
+                    continue
+        if eof:
+            raise ValueError(f"{getattr(f, 'name', 'JSON')}: массив вакансий не закрыт")
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+
+
+def _location_check(location: str, match: str) -> Callable[[Dict[str, Any]], bool]:
+    """Проверка локации записи без индекса (та же нормализация, что и в LocationIndex)."""
+    query = normalize_location(location)
+    if match not in ("exact", "prefix", "substring"):
+        raise ValueError("Тип совпадения должен быть 'exact', 'prefix' или 'substring'")
+
+    def check(item: Dict[str, Any]) -> bool:
+        value = normalize_location(item.get("location"))
+        if match == "exact":
+            return value == query
+        if match == "prefix":
+            return value.startswith(query)
+        return query in value
+
+    return check
+
+
+def _range_check(
+    field: str, convert: Callable[[Any], Optional[float]], low: Optional[float], high: Optional[float]
+) -> Callable[[Dict[str, Any]], bool]:
+    """Проверка попадания значения поля записи в диапазон [low, high] без индекса."""
+
+    def check(item: Dict[str, Any]) -> bool:
+        value = convert(item.get(field))
+        if value is None:
+            return False
+        return (low is None or value >= low) and (high is None or value <= high)
+
+    return check
+
+
+def _criteria_key(criteria: Optional[Dict[str, Any]]) -> Optional[Tuple[Tuple[str, Any], ...]]:
+    """Критерии, приведённые к типам схемы, как ключ кэша (None — без критериев)."""
+    if not criteria:
+        return None
+    return criteria_key(criteria)
+
+
 def _filter_items(items: List[Dict[str, Any]], criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-    """фильтрации списка вакансий"""
+    """фильтрации списка вакансий (критерии приводятся к типам схемы один раз)"""
     if not criteria:
         return items
-    result = []
-    for item in items:
-        match = True
-        for k, v in criteria.items():
-            val = item.get(k)
-            if isinstance(v, (list, tuple, set)):
-                if str(val) not in map(str, v):
-                    match = False
-                    break
-            else:
-                if str(val) != str(v):
-                    match = False
-                    break
-        if match:
-            result.append(item)
-    return result
+    checks = criteria_checks(criteria)
+    return [item for item in items if all(check(item) for check in checks)]
 
 
 def _remove_items(items: List[Dict[str, Any]], criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-    """удалениt элементов из списка словарей по заданным условиям."""
+    """удаление элементов из списка словарей по заданным условиям."""
     if not criteria:
         return []
-    remaining = []
-    for item in items:
-        remove = True
-        for k, v in criteria.items():
-            val = item.get(k)
-            if isinstance(v, (list, tuple, set)):
-                if str(val) in map(str, v):
-                    continue
-                else:
-                    remove = False
-                    break
-            else:
-                if str(val) == str(v):
-                    continue
-                else:
-                    remove = False
-                    break
-        if not remove:
-            remaining.append(item)
-    return remaining
+    checks = criteria_checks(criteria)
+    return [item for item in items if not all(check(item) for check in checks)]
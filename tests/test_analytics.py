@@ -0,0 +1,79 @@
+# Что проверяется:
+# Перцентили зарплат по локациям совпадают с numpy по всему набору при чтении хранилища частями.
+# Количество вакансий по дням и ТОП работодателей.
+# Повторный отчёт берётся из кэша, после изменения хранилища кэш пересчитывается.
+# Подкоманда CLI stats выводит строки отчёта.
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import numpy as np
+import pytest
+
+from benchmarks.corpus import generate_records
+from src.analytics import StoreAnalytics
+from src.cli import main
+from src.work_files import CSVHandler, TXTHandler
+
+RECORDS = list(generate_records(500))
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> TXTHandler:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    handler.add_items(RECORDS)
+    return handler
+
+
+def test_salary_percentiles_match_numpy(store: TXTHandler, tmp_path: Path) -> None:
+    analytics = StoreAnalytics(store, chunk_size=64, cache_path=None)
+    rows = {row["location"]: row for row in analytics.salary_percentiles(percentiles=(50, 90))}
+    moscow = [record["salary"] for record in RECORDS if record["location"] == "Москва" and record["salary"]]
+    assert rows["Москва"]["count"] == len(moscow)
+    assert rows["Москва"]["p50"] == pytest.approx(np.percentile(moscow, 50))
+    assert rows["Москва"]["p90"] == pytest.approx(np.percentile(moscow, 90))
+
+    csv_store = CSVHandler(str(tmp_path / "store.csv"))
+    csv_store.add_items(RECORDS)
+    assert StoreAnalytics(csv_store, chunk_size=100, cache_path=None).salary_percentiles(percentiles=(50, 90)) == [
+        rows[row["location"]] for row in analytics.salary_percentiles(percentiles=(50, 90))
+    ]
+
+
+def test_counts_and_employers(store: TXTHandler) -> None:
+    analytics = StoreAnalytics(store, chunk_size=100, cache_path=None)
+    daily = analytics.counts_by_day()
+    assert sum(row["count"] for row in daily) == len(RECORDS)
+    assert [row["date"] for row in daily] == sorted(row["date"] for row in daily)
+    top = analytics.top_employers(3)
+    assert len(top) == 3
+    assert top[0]["count"] == max(
+        sum(record["employer"] == employer for record in RECORDS) for employer in {r["employer"] for r in RECORDS}
+    )
+    assert top[0]["median_salary"] > 0
+
+
+def test_cache_by_store_version(store: TXTHandler, tmp_path: Path) -> None:
+    analytics = StoreAnalytics(store, cache_path=tmp_path / "cache.json")
+    first = analytics.counts("location")
+    reads = []
+    original = store.iter_items
+
+    def counted_iter_items() -> Iterator[Dict[str, Any]]:
+        reads.append(1)
+        return original()
+
+    store.iter_items = counted_iter_items  # type: ignore[method-assign]
+    assert analytics.counts("location") == first
+    assert reads == []
+
+    store.delete_items({"location": "Москва"})
+    assert "Москва" not in [row["location"] for row in analytics.counts("location")]
+    assert reads == [1]
+
+
+def test_cli_stats(store: TXTHandler, capsys: pytest.CaptureFixture) -> None:
+    assert main(["stats", "--store", str(store.filename), "--report", "employers", "--limit", "2", "--no-cache"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(rows) == 2 and {"employer", "count", "median_salary"} <= set(rows[0])
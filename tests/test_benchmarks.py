@@ -0,0 +1,59 @@
+# Что проверяется:
+# Синтетический корпус детерминирован и конвертируется в Vacancy без ошибок.
+# Локальный стенд FakeHHServer отдаёт постраничные ответы, HHAPI собирает все страницы.
+# При ответах 429 HHAPI повторяет запрос и в итоге получает все вакансии.
+# Бенчмарки запускаются на маленьком корпусе и сохраняют результаты.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks import run
+from benchmarks.corpus import generate_api_items, generate_records
+from benchmarks.fake_hh import FakeHHServer
+from src.get_api import HHAPI
+from src.pipeline import convert_items
+
+
+def test_corpus_is_deterministic() -> None:
+    assert list(generate_api_items(5, seed=1)) == list(generate_api_items(5, seed=1))
+    assert list(generate_api_items(5, seed=1)) != list(generate_api_items(5, seed=2))
+    vacancies = convert_items(list(generate_api_items(200)))
+    records = list(generate_records(200))
+    assert [vac.to_dict()["url"] for vac in vacancies] == [record["url"] for record in records]
+    assert [vac.salary for vac in vacancies] == [record["salary"] for record in records]
+
+
+def test_hhapi_harvests_all_pages() -> None:
+    with FakeHHServer(count=250) as server:
+        api = HHAPI(base_url=server.url, per_page=100, pages=10)
+        items = api.get_vacancies("python")
+    assert len(items) == 250
+    assert len({item["alternate_url"] for item in items}) == 250
+
+
+def test_hhapi_retries_on_429() -> None:
+    with FakeHHServer(count=50, rate_limit_every=2, retry_after=0) as server:
+        api = HHAPI(base_url=server.url, per_page=10, pages=10, backoff=0)
+        items = api.get_vacancies("python")
+        assert server.throttled_count > 0
+    assert len(items) == 50
+
+
+def test_hhapi_gives_up_after_retries() -> None:
+    with FakeHHServer(count=50, rate_limit_every=1, retry_after=0) as server:
+        api = HHAPI(base_url=server.url, max_retries=2, backoff=0)
+        with pytest.raises(ConnectionError):
+            api._get_page("python", 0)
+        assert server.requests_count == 3
+
+
+def test_benchmark_suite_smoke(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(run, "RESULTS_DIR", tmp_path)
+    assert run.main(["--size", "200", "--repeat", "1", "--label", "base", "--only", "convert", "json_"]) == 0
+    assert (
+        run.main(["--size", "200", "--repeat", "1", "--label", "new", "--only", "convert", "--compare", "base"]) == 0
+    )
+    report = json.loads((tmp_path / "base.json").read_text(encoding="utf-8"))
+    assert set(report["results"]) == {"convert_items", "json_add_items", "json_get_items", "json_delete_items"}
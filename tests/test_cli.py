@@ -0,0 +1,115 @@
+# Что проверяется:
+# Подкоманда search по локальному стенду API: несколько запросов, фильтры, ТОП N, вывод JSONL в stdout.
+# Постраничная загрузка (--pages) и параллельные запросы (--workers).
+# sync сохраняет вакансии в хранилище без дубликатов, query и export работают с сохранённым файлом.
+# --metrics сохраняет отчёт с замерами запросов к API и конвертации.
+# Ошибка API возвращает код завершения 1.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Generator, List
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.cli import main
+
+
+def make_item(number: int, area: str, salary: int) -> Dict[str, Any]:
+    return {
+        "name": f"Python Developer {number}",
+        "area": {"name": area},
+        "published_at": f"2025-09-{number:02d}T12:00:00+0300",
+        "alternate_url": f"https://hh.ru/vacancy/{number}",
+        "salary": {"from": salary, "to": None, "currency": "RUR"},
+        "snippet": {"requirement": "Разработка backend на Django" if number % 2 else "Поддержка frontend"},
+    }
+
+
+ITEMS: List[Dict[str, Any]] = [make_item(n, "Москва" if n % 3 else "Казань", 50000 * n) for n in range(1, 7)]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Локальный стенд /vacancies с постраничной выдачей по 2 вакансии."""
+
+    def do_GET(self) -> None:
+        params = parse_qs(urlparse(self.path).query)
+        page = int(params.get("page", ["0"])[0])
+        per_page = int(params.get("per_page", ["2"])[0])
+        text = params.get("text", [""])[0]
+        items = ITEMS if text != "empty" else []
+        start, end = page * per_page, (page + 1) * per_page
+        body = {
+            "items": items[start:end],
+            "pages": (len(items) + per_page - 1) // per_page,
+            "page": page,
+        }
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def api_url() -> Generator[str, None, None]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/vacancies"
+    server.shutdown()
+    server.server_close()
+
+
+def test_search_streams_jsonl(api_url: str, capsys: pytest.CaptureFixture) -> None:
+    code = main(
+        ["search", "python", "django", "--api-url", api_url, "--per-page", "2", "--pages", "5", "--workers", "2"]
+        + ["--keywords", "django", "--location", "моск", "--top", "2"]
+    )
+    assert code == 0
+    lines = capsys.readouterr().out.splitlines()
+    records = [json.loads(line) for line in lines]
+    # Нечётные номера содержат Django, кратные трём — Казань; остаются 1 и 5, по убыванию зарплаты
+    assert [record["url"] for record in records] == ["https://hh.ru/vacancy/5", "https://hh.ru/vacancy/1"]
+
+
+def test_sync_query_export(api_url: str, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    store = str(tmp_path / "store.json")
+    assert main(["sync", "python", "--api-url", api_url, "--per-page", "2", "--pages", "5", "--store", store]) == 0
+    assert main(["sync", "python", "--api-url", api_url, "--per-page", "2", "--pages", "5", "--store", store]) == 0
+    summaries = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert summaries[0]["added"] == 6
+    assert summaries[1]["added"] == 0 and summaries[1]["total"] == 6
+
+    assert main(["query", "--store", store, "--salary", "100000-250000", "--date-from", "2025-09-03"]) == 0
+    urls = [json.loads(line)["url"] for line in capsys.readouterr().out.splitlines()]
+    assert urls == ["https://hh.ru/vacancy/3", "https://hh.ru/vacancy/4", "https://hh.ru/vacancy/5"]
+
+    csv_path = tmp_path / "export.csv"
+    assert main(["export", "--store", store, "--format", "csv", "--output", str(csv_path)]) == 0
+    assert len(csv_path.read_text(encoding="utf-8").splitlines()) == 7
+
+
+def test_metrics_report(api_url: str, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    report_path = tmp_path / "metrics.json"
+    args = ["--metrics", str(report_path), "search", "python", "--api-url", api_url, "--per-page", "2", "--pages", "2"]
+    assert main(args) == 0
+    capsys.readouterr()
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    timers = {entry["name"]: entry for entry in report["timers"]}
+    assert timers["api_request_seconds"]["count"] == 2
+    assert "convert_seconds" in timers
+    counters = {entry["name"]: entry["value"] for entry in report["counters"]}
+    assert counters["api_response_bytes_total"] > 0
+
+
+def test_search_api_error_exit_code(capsys: pytest.CaptureFixture) -> None:
+    code = main(["search", "python", "--api-url", "http://127.0.0.1:9/vacancies", "--timeout", "1"])
+    assert code == 1
+    assert "Ошибка API" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+# Что проверяется:
+# jsonl.gz и csv.gz (через get_handler) возвращают те же записи, что и несжатые файлы, и занимают меньше места;
+# файл читается обычным gzip.
+# add_items дописывает блоки в конец, не меняя старых байт; дубликаты по url не добавляются, а поиск по url
+# и query() по датам распаковывают только подходящие блоки.
+# Оглавление блоков восстанавливается, если его нет; compact_store подменяет файл вместе с оглавлением
+# и сохраняет размер блоков.
+# zstd без пакета zstandard — понятная ошибка ValueError.
+
+import gzip
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.corpus import generate_records
+from src import compressed
+from src.compressed import CompressedJSONLHandler
+from src.maintenance import compact_store
+from src.work_files import CSVHandler, TXTHandler, get_handler
+
+# Вакансии по возрастанию даты публикации: блоки получают непересекающиеся диапазоны дат
+RECORDS: List[Dict[str, Any]] = sorted(generate_records(500), key=lambda record: record["published_at"])
+
+
+@pytest.mark.parametrize("name, plain_class", [("store.jsonl.gz", TXTHandler), ("store.csv.gz", CSVHandler)])
+def test_round_trip_and_size(tmp_path: Path, name: str, plain_class: type) -> None:
+    handler = get_handler(str(tmp_path / name))
+    plain = plain_class(str(tmp_path / name.replace(".gz", "")))
+    handler.add_items(RECORDS)
+    plain.add_items(RECORDS)
+
+    assert handler.get_items() == plain.get_items()
+    assert list(handler.iter_items()) == plain.get_items()
+    assert handler.get_items({"location": "Москва"}) == plain.get_items({"location": "Москва"})
+    assert handler.filename.stat().st_size * 3 < plain.filename.stat().st_size
+    assert gzip.decompress(handler.filename.read_bytes()).count(b"hh.ru/vacancy/") == len(RECORDS)
+
+
+def test_append_and_block_skipping(tmp_path: Path) -> None:
+    handler = CompressedJSONLHandler(str(tmp_path / "store.jsonl.gz"), block_size=100)
+    handler.add_items(RECORDS[:300])
+    head = handler.filename.read_bytes()
+    handler.add_items(RECORDS[250:])
+    assert handler.filename.read_bytes().startswith(head)
+    assert [block["count"] for block in handler.blocks()] == [100, 100, 100, 100, 100]
+    assert len(handler.get_items()) == len(RECORDS)
+
+    with patch.object(compressed, "decompress_block", wraps=compressed.decompress_block) as decompress:
+        assert handler.get_items({"url": RECORDS[450]["url"]}) == [RECORDS[450]]
+        assert decompress.call_count == 1
+        handler.add_items([RECORDS[10]])
+        assert decompress.call_count <= 2
+        decompress.reset_mock()
+        result = handler.query(date_from=RECORDS[420]["published_at"])
+        assert result == [record for record in RECORDS if record["published_at"] >= RECORDS[420]["published_at"]]
+        assert decompress.call_count == 1
+    assert len(handler.get_items()) == len(RECORDS)
+
+
+def test_index_rebuild_and_compaction(tmp_path: Path) -> None:
+    handler = CompressedJSONLHandler(str(tmp_path / "store.jsonl.gz"), block_size=64)
+    handler.add_items(RECORDS)
+    blocks = [{k: v for k, v in block.items()} for block in handler.blocks()]
+    handler.block_index_path.unlink()
+    assert CompressedJSONLHandler(str(handler.filename)).blocks() == blocks
+
+    stats = compact_store(handler)
+    assert stats["kept"] == len(RECORDS)
+    assert not list(tmp_path.glob("*.compact*"))
+    reopened = CompressedJSONLHandler(str(handler.filename))
+    assert reopened.get_items() == RECORDS
+    assert reopened.block_index_path.exists()
+    # Временный файл компактизации пишется с теми же параметрами хэндлера (блоки по 64 записи)
+    assert len(reopened.blocks()) == len(blocks)
+
+
+def test_zstd_requires_package(tmp_path: Path) -> None:
+    try:
+        import zstandard  # type: ignore[import-not-found]  # noqa: F401
+    except ImportError:
+        with pytest.raises(ValueError, match="zstandard"):
+            get_handler(str(tmp_path / "store.jsonl.zst"))
+    else:
+        handler = get_handler(str(tmp_path / "store.jsonl.zst"))
+        handler.add_items(RECORDS)
+        assert handler.get_items() == RECORDS
@@ -0,0 +1,116 @@
+# Что проверяется:
+# enrich_items() по локальному стенду добавляет описание без HTML, key_skills и опыт.
+# Повторный запуск берёт карточки из дискового кэша без запросов, изменённая версия запрашивается заново.
+# Ошибка запроса карточки оставляет вакансию без обогащения.
+# Новые версии карточек дописываются в файл кэша; когда устаревших строк больше порога и больше актуальных,
+# файл компактизируется до одной строки на вакансию, и перечитанный кэш отдаёт последние версии.
+# key_skills и experience сохраняются в хранилищах JSON и CSV.
+# CLI search --enrich проверяет ключевые слова уже по полному описанию.
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from benchmarks.fake_hh import FakeHHServer
+from src.cli import main
+from src.enrichment import DetailCache, enrich_items, strip_html
+from src.get_api import HHAPI
+from src.pipeline import convert_items
+from src.work_files import CSVHandler, JSONHandler
+
+
+@pytest.fixture
+def server() -> Iterator[FakeHHServer]:
+    with FakeHHServer(count=10) as fake:
+        yield fake
+
+
+def test_strip_html() -> None:
+    assert strip_html("<p>Опыт &amp; <b>Python</b></p>\n<ul><li>SQL</li></ul>") == "Опыт & Python SQL"
+    assert strip_html(None) == ""
+
+
+def test_enrich_and_cache(server: FakeHHServer, tmp_path: Path) -> None:
+    api = HHAPI(base_url=server.url)
+    cache = DetailCache(tmp_path / "details.jsonl")
+    enriched = enrich_items(server.items, api, cache, workers=4)
+    assert server.detail_requests == 10
+    assert "<p>" not in enriched[0]["description"]
+    assert "Обязанности" in enriched[0]["description"]
+    assert "experience" not in server.items[0]
+
+    vacancy = convert_items(enriched)[0]
+    assert vacancy.experience == "От 1 года до 3 лет"
+    details = server.vacancy_details(server.items[0]["id"])
+    assert details is not None
+    assert vacancy.key_skills == [skill["name"] for skill in details["key_skills"]]
+
+    server.detail_requests = 0
+    reloaded = DetailCache(tmp_path / "details.jsonl")
+    assert enrich_items(server.items, api, reloaded) == enriched
+    assert server.detail_requests == 0
+
+    changed = [{**server.items[0], "updated_at": "2025-10-01T10:00:00+0300"}] + server.items[1:]
+    enrich_items(changed, api, reloaded)
+    assert server.detail_requests == 1
+
+
+def test_cache_compacts_stale_versions(tmp_path: Path) -> None:
+    path = tmp_path / "details.jsonl"
+    cache = DetailCache(path, compact_min_stale=5)
+    for version in ("v1", "v2"):
+        cache.put_many([(str(number), version, {"description": f"{version} {number}"}) for number in range(3)])
+    # 3 устаревшие строки — меньше порога: файл только дописывается
+    assert cache.stale == 3 and len(path.read_text(encoding="utf-8").splitlines()) == 6
+
+    cache.put_many([(str(number), "v3", {"description": f"v3 {number}"}) for number in range(3)])
+    assert cache.stale == 0 and len(path.read_text(encoding="utf-8").splitlines()) == 3
+    reloaded = DetailCache(path)
+    assert len(reloaded) == 3 and reloaded.stale == 0
+    assert reloaded.get("1", "v3") == {"description": "v3 1"} and reloaded.get("1", "v2") is None
+
+
+def test_enrich_failure_keeps_item(server: FakeHHServer, tmp_path: Path) -> None:
+    missing = {**server.items[0], "id": "1"}
+    enriched = enrich_items([missing], HHAPI(base_url=server.url), DetailCache(tmp_path / "details.jsonl"))
+    assert enriched == [missing]
+    assert len(DetailCache(tmp_path / "details.jsonl")) == 0
+
+
+@pytest.mark.parametrize("handler_class, name", [(JSONHandler, "store.json"), (CSVHandler, "store.csv")])
+def test_store_round_trip(server: FakeHHServer, tmp_path: Path, handler_class: type, name: str) -> None:
+    enriched = enrich_items(server.items[:3], HHAPI(base_url=server.url), DetailCache(tmp_path / "details.jsonl"))
+    records = [vac.to_dict() for vac in convert_items(enriched)]
+    handler = handler_class(tmp_path / name)
+    handler.add_items(records)
+    restored = convert_items(
+        [
+            {
+                "name": item["title"],
+                "area": {"name": item["location"]},
+                "published_at": item["published_at"],
+                "alternate_url": item["url"],
+                "description": item["description"],
+                "key_skills": item["key_skills"],
+                "experience": item["experience"],
+            }
+            for item in handler.get_items()
+        ]
+    )
+    assert [vac.key_skills for vac in restored] == [record["key_skills"] for record in records]
+    assert [vac.experience for vac in restored] == [record["experience"] for record in records]
+
+
+def test_cli_search_enrich(server: FakeHHServer, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    args = ["search", "python", "--api-url", server.url, "--per-page", "10", "--keywords", "обязанности"]
+    assert main(args) == 0
+    assert capsys.readouterr().out == ""
+
+    cache = str(tmp_path / "details.jsonl")
+    assert main(args + ["--enrich", "--details-cache", cache]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 10
+    assert all(record["experience"] == "От 1 года до 3 лет" for record in records)
+    assert any(record["key_skills"] for record in records)
@@ -0,0 +1,97 @@
+# Что проверяется:
+# Реестр источников: get_provider() по имени, неизвестный источник — ValueError, ключ SuperJob в заголовке.
+# Вакансии SuperJob и Хабр Карьеры с локальных стендов приводятся к общей схеме и конвертируются в Vacancy.
+# federated_search() объединяет источники и убирает дубликаты между ними (название + работодатель + город).
+# Медленный источник пропускается по своему сроку ожидания и не задерживает остальные.
+# Источник, упавший при нормализации ответа, отмечается в отчёте как error, остальные возвращают вакансии.
+# CLI search --sources опрашивает несколько источников; недоступный источник не прерывает поиск.
+
+import json
+import time
+from typing import Any, Dict
+
+import pytest
+
+from benchmarks.corpus import generate_api_items
+from benchmarks.fake_hh import FakeHabrServer, FakeHHServer, FakeSuperJobServer
+from src.cli import main
+from src.federation import dedup_key, federated_search
+from src.get_api import HHAPI, PROVIDERS, HabrCareerAPI, SuperJobAPI, get_provider
+from src.pipeline import convert_items
+
+HH_ITEMS = list(generate_api_items(40))
+EXTRA_ITEMS = list(generate_api_items(15, seed=7, start_id=200000000))
+
+
+def test_provider_registry() -> None:
+    assert {"hh", "superjob", "habr"} <= set(PROVIDERS)
+    assert isinstance(get_provider("habr", per_page=5), HabrCareerAPI)
+    assert get_provider("superjob", api_key="secret")._headers == {"X-Api-App-Id": "secret"}
+    with pytest.raises(ValueError):
+        get_provider("unknown")
+
+
+def test_sources_normalize_to_common_schema() -> None:
+    with FakeSuperJobServer(items=HH_ITEMS) as superjob, FakeHabrServer(items=HH_ITEMS) as habr:
+        for api in (SuperJobAPI(superjob.url, per_page=15, pages=5), HabrCareerAPI(habr.url, per_page=15, pages=5)):
+            items = api.get_vacancies("python")
+            assert len(items) == len(HH_ITEMS)
+            assert {item["source"] for item in items} == {api.name}
+            vacancies = convert_items(items)
+            assert [vac.title for vac in vacancies] == [item["name"] for item in HH_ITEMS]
+            assert [vac.employer for vac in vacancies] == [item["employer"]["name"] for item in HH_ITEMS]
+            assert [vac.salary for vac in vacancies] == [(item["salary"] or {}).get("from") or 0 for item in HH_ITEMS]
+            assert [dedup_key(item) for item in items] == [dedup_key(item) for item in HH_ITEMS]
+
+
+def test_federated_search_deduplicates_across_sources() -> None:
+    with FakeHHServer(items=HH_ITEMS) as hh, FakeSuperJobServer(items=HH_ITEMS[:10] + EXTRA_ITEMS) as superjob:
+        providers = [HHAPI(hh.url, per_page=20, pages=5), SuperJobAPI(superjob.url, per_page=20, pages=5)]
+        items, report = federated_search("python", providers)
+
+    hh_keys = {dedup_key(item) for item in HH_ITEMS}
+    extra = [item for item in EXTRA_ITEMS if dedup_key(item) not in hh_keys]
+    assert report["hh"]["status"] == report["superjob"]["status"] == "ok"
+    assert report["superjob"]["count"] == 25
+    assert [item["alternate_url"] for item in items[:40]] == [item["alternate_url"] for item in HH_ITEMS]
+    assert [item["id"] for item in items[40:]] == [item["id"] for item in extra]
+
+
+def test_slow_source_does_not_block_others() -> None:
+    with FakeHHServer(items=HH_ITEMS) as hh, FakeHabrServer(items=EXTRA_ITEMS, latency=1.0) as habr:
+        providers = [HabrCareerAPI(habr.url), HHAPI(hh.url, per_page=50)]
+        started = time.monotonic()
+        items, report = federated_search("python", providers, timeouts={"habr": 0.3}, default_timeout=5)
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert report["habr"]["status"] == "timeout" and report["hh"]["status"] == "ok"
+    assert len(items) == len(HH_ITEMS)
+
+
+class BrokenSuperJobAPI(SuperJobAPI):
+    def normalize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        raise KeyError("profession")
+
+
+def test_failing_source_is_reported() -> None:
+    with FakeHHServer(items=HH_ITEMS) as hh, FakeSuperJobServer(items=EXTRA_ITEMS) as superjob:
+        providers = [BrokenSuperJobAPI(superjob.url), HHAPI(hh.url, per_page=50)]
+        items, report = federated_search("python", providers, default_timeout=5)
+
+    assert report["superjob"]["status"] == "error" and "profession" in report["superjob"]["error"]
+    assert report["hh"]["status"] == "ok"
+    assert [item["alternate_url"] for item in items] == [item["alternate_url"] for item in HH_ITEMS]
+
+
+def test_cli_search_multiple_sources(capsys: pytest.CaptureFixture) -> None:
+    with FakeHHServer(items=HH_ITEMS[:10]) as hh, FakeSuperJobServer(items=EXTRA_ITEMS) as superjob:
+        args = ["search", "python", "--api-url", hh.url, "--per-page", "50", "--sources", "hh", "superjob"]
+        assert main(args + ["--source-url", f"superjob={superjob.url}"]) == 0
+        urls = [json.loads(line)["url"] for line in capsys.readouterr().out.splitlines()]
+        assert any("superjob.ru" in url for url in urls) and any("hh.ru" in url for url in urls)
+
+        assert main(args + ["--source-url", "superjob=http://127.0.0.1:9/2.0/vacancies", "--timeout", "1"]) == 0
+        captured = capsys.readouterr()
+        assert len(captured.out.splitlines()) == 10
+        assert "Источник superjob пропущен" in captured.err
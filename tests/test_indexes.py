@@ -0,0 +1,96 @@
+# Что проверяется:
+# LocationIndex — поиск по точному значению, префиксу и подстроке, обновление при удалении.
+# DateIndex и SalaryIndex — запросы по диапазону, повторное добавление того же url.
+# Сохранение и загрузка индексов из файла.
+# FileHandler.query() — пересечение индексов и тот же результат без подключённых индексов.
+
+from pathlib import Path
+from typing import Type
+
+import pytest
+
+from src.indexes import DateIndex, LocationIndex, SalaryIndex
+from src.work_files import CSVHandler, FileHandler, JSONHandler, TXTHandler
+
+vacancies = [
+    {
+        "title": "Python Developer",
+        "location": "Москва",
+        "published_at": "2025-09-01T12:00:00+03:00",
+        "url": "https://hh.ru/vacancy/1",
+        "salary": 150000,
+        "description": "Backend",
+    },
+    {
+        "title": "Data Scientist",
+        "location": "Московская область",
+        "published_at": "2025-09-03T12:00:00+03:00",
+        "url": "https://hh.ru/vacancy/2",
+        "salary": 200000,
+        "description": "ML",
+    },
+    {
+        "title": "QA Engineer",
+        "location": "Санкт-Петербург",
+        "published_at": "2025-09-05T12:00:00+03:00",
+        "url": "https://hh.ru/vacancy/3",
+        "salary": 90000,
+        "description": "Тестирование",
+    },
+]
+
+
+def test_location_index_lookup() -> None:
+    index = LocationIndex()
+    index.add_items(vacancies)
+    assert index.lookup("москва") == {"https://hh.ru/vacancy/1"}
+    assert index.lookup("Моск", match="prefix") == {"https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"}
+    assert index.lookup("петербург", match="substring") == {"https://hh.ru/vacancy/3"}
+    index.remove_items([vacancies[0]])
+    assert index.lookup("Моск", match="prefix") == {"https://hh.ru/vacancy/2"}
+    with pytest.raises(ValueError):
+        index.lookup("Москва", match="regex")
+
+
+def test_sorted_indexes_ranges(tmp_path: Path) -> None:
+    dates = DateIndex(tmp_path / "dates.idx")
+    dates.add_items(vacancies)
+    assert dates.between("2025-09-02", "2025-09-04") == {"https://hh.ru/vacancy/2"}
+    assert dates.between(date_from="2025-09-03") == {"https://hh.ru/vacancy/2", "https://hh.ru/vacancy/3"}
+
+    salaries = SalaryIndex()
+    salaries.add_items(vacancies)
+    salaries.add_items([{**vacancies[2], "salary": "300000"}])  # тот же url, строковая зарплата из CSV
+    assert len(salaries) == 3
+    assert salaries.range(100000, 250000) == {"https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"}
+    assert salaries.range(low=250000) == {"https://hh.ru/vacancy/3"}
+
+    dates.save()
+    loaded = DateIndex(tmp_path / "dates.idx")
+    assert loaded.load()
+    assert loaded.between("2025-09-04") == {"https://hh.ru/vacancy/3"}
+
+
+@pytest.mark.parametrize(
+    "HandlerClass, filename",
+    [(JSONHandler, "query.json"), (CSVHandler, "query.csv"), (TXTHandler, "query.txt")],
+)
+def test_handler_query_with_and_without_indexes(
+    tmp_path: Path, HandlerClass: Type[FileHandler], filename: str
+) -> None:
+    plain = HandlerClass(str(tmp_path / ("plain_" + filename)))
+    indexed = HandlerClass(str(tmp_path / filename))
+    for index in (LocationIndex(), DateIndex(), SalaryIndex()):
+        indexed.attach_index(index)
+    plain.add_items(vacancies)
+    indexed.add_items(vacancies)
+
+    for handler in (plain, indexed):
+        found = handler.query(location="моск", location_match="prefix", salary_min=160000)
+        assert [item["url"] for item in found] == ["https://hh.ru/vacancy/2"]
+        found = handler.query(date_from="2025-09-02", salary_max=100000)
+        assert [item["url"] for item in found] == ["https://hh.ru/vacancy/3"]
+        assert handler.query(location="Казань") == []
+
+    indexed.delete_items(criteria={"url": "https://hh.ru/vacancy/2"})
+    assert indexed.query(location="моск", location_match="prefix", salary_min=160000) == []
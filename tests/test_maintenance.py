@@ -0,0 +1,125 @@
+# Что проверяется:
+# compact_store() оставляет для каждого url самую свежую версию и удаляет вакансии старше окна хранения.
+# Файл заменяется атомарно, временный файл не остаётся; формат файла сохраняется (JSONL, JSON, CSV).
+# Подключённые индексы перестраиваются, у секционированного хранилища пересчитывается манифест, а самая
+# свежая версия url выбирается по всем секциям (версии одной вакансии в секциях разных месяцев).
+# Постоянный SeenFilter при перестроении индексов не очищается: удалённые компактизацией url остаются известными.
+# Подкоманда CLI compact выводит счётчики.
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.cli import main
+from src.indexes import LocationIndex
+from src.maintenance import compact_store
+from src.seen_filter import SeenFilter, seen_filter_path
+from src.sharding import ShardedHandler
+from src.work_files import CSVHandler, JSONHandler, TXTHandler
+
+NOW = datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+
+def make_record(number: int, day: str, salary: int, location: str = "Москва") -> Dict[str, Any]:
+    return {
+        "title": f"Python Developer {number}",
+        "location": location,
+        "published_at": f"{day}T12:00:00+03:00",
+        "url": f"https://hh.ru/vacancy/{number}",
+        "salary": salary,
+        "description": "Разработка на Python",
+    }
+
+
+# Версии одной вакансии дописываются в JSONL, например, при повторных выгрузках
+HISTORY: List[Dict[str, Any]] = [
+    make_record(1, "2025-09-20", 100000),
+    make_record(2, "2025-06-01", 90000),
+    make_record(1, "2025-09-25", 120000, "Казань"),
+    make_record(3, "2025-09-28", 150000),
+    make_record(1, "2025-09-22", 110000),
+]
+
+
+def write_history(path: Path) -> TXTHandler:
+    with open(path, "w", encoding="utf-8") as f:
+        for record in HISTORY:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return TXTHandler(str(path))
+
+
+def test_compact_keeps_latest_and_expires(tmp_path: Path) -> None:
+    handler = write_history(tmp_path / "store.jsonl")
+    index = LocationIndex()
+    handler.attach_index(index)
+    stats = compact_store(handler, retention_days=30, now=NOW)
+    assert stats == {"scanned": 5, "kept": 2, "expired": 1, "superseded": 2}
+    items = list(handler.iter_items())
+    assert [(item["url"], item["salary"]) for item in items] == [
+        ("https://hh.ru/vacancy/1", 120000),
+        ("https://hh.ru/vacancy/3", 150000),
+    ]
+    assert index.lookup("казань") == {"https://hh.ru/vacancy/1"}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["store.jsonl"]
+
+
+def test_compact_keeps_seen_filter(tmp_path: Path) -> None:
+    handler = write_history(tmp_path / "store.jsonl")
+    index = LocationIndex()
+    handler.attach_index(index, rebuild=True)
+    seen = SeenFilter(seen_filter_path(handler.filename), capacity=100)
+    handler.attach_index(seen, rebuild=True)
+    compact_store(handler, retention_days=30, now=NOW)
+
+    expired = "https://hh.ru/vacancy/2"
+    assert expired not in index.lookup("москва")
+    assert expired in seen and len(seen) == 3
+    loaded = SeenFilter(seen.path)
+    assert loaded.load() and expired in loaded
+
+    handler.replace_items([make_record(4, "2025-09-30", 130000)])
+    assert all(f"https://hh.ru/vacancy/{number}" in seen for number in (1, 2, 3, 4))
+
+
+@pytest.mark.parametrize("handler_class, name", [(JSONHandler, "store.json"), (CSVHandler, "store.csv")])
+def test_compact_other_formats(tmp_path: Path, handler_class: type, name: str) -> None:
+    handler = handler_class(str(tmp_path / name))
+    handler._write_items(HISTORY)
+    compact_store(handler)
+    assert sorted(item["url"] for item in handler.get_items()) == [f"https://hh.ru/vacancy/{n}" for n in (1, 2, 3)]
+
+
+def test_compact_sharded_store(tmp_path: Path) -> None:
+    handler = ShardedHandler(str(tmp_path / "store"))
+    handler.add_items(HISTORY)
+    stats = compact_store(handler, retention_days=30, now=NOW)
+    assert stats["expired"] == 1
+    assert sorted(handler.shards) == ["2025-09"]
+    assert handler.shards["2025-09"]["count"] == 2
+
+
+def test_compact_sharded_across_months(tmp_path: Path) -> None:
+    handler = ShardedHandler(str(tmp_path / "store"))
+    # Полная перезапись раскладывает версии одного url по секциям разных месяцев
+    handler._write_items(HISTORY + [make_record(1, "2025-08-30", 1), make_record(2, "2025-10-02", 95000)])
+    assert sorted(handler.shards) == ["2025-06", "2025-08", "2025-09", "2025-10"]
+
+    stats = compact_store(handler)
+    assert stats == {"scanned": 7, "kept": 3, "expired": 0, "superseded": 4}
+    assert sorted(handler.shards) == ["2025-09", "2025-10"]
+    assert sorted((item["url"], item["salary"]) for item in handler.get_items()) == [
+        ("https://hh.ru/vacancy/1", 120000),
+        ("https://hh.ru/vacancy/2", 95000),
+        ("https://hh.ru/vacancy/3", 150000),
+    ]
+    assert handler.add_items([make_record(2, "2025-06-01", 90000)]) == 0
+
+
+def test_cli_compact(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    write_history(tmp_path / "store.jsonl")
+    assert main(["compact", "--store", str(tmp_path / "store.jsonl")]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["kept"] == 3 and summary["superseded"] == 2
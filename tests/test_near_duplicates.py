@@ -0,0 +1,104 @@
+# Что проверяется:
+# MinHash-сигнатуры: перепубликация с мелкими правками находится, разные вакансии — нет.
+# Подбор числа полос LSH под порог сходства.
+# С подключённым NearDuplicateIndex add_items() не добавляет перепубликации (в том числе внутри пакета),
+# а обновление вакансии с тем же url дубликатом не считается.
+# Проход по всему хранилищу: поиск и удаление почти-дубликатов, сохранение и загрузка индекса, CLI dedup.
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.cli import main
+from src.maintenance import remove_near_duplicates
+from src.near_duplicates import NearDuplicateIndex, choose_bands, find_near_duplicates
+from src.work_files import TXTHandler
+
+DESCRIPTIONS = [
+    "Разработка backend-сервисов на Python и Django, проектирование REST API, код-ревью, работа с PostgreSQL.",
+    "Ведение бухгалтерского учёта в 1С, подготовка налоговой отчётности, сверка с контрагентами и банками.",
+    "Активные продажи B2B-клиентам, проведение переговоров и презентаций, ведение клиентской базы в CRM.",
+    "Автоматизация тестирования веб-приложений, написание автотестов на pytest и Selenium, настройка CI.",
+]
+
+
+def make_record(number: int, title: str, employer: str, description: str) -> Dict[str, Any]:
+    return {
+        "title": title,
+        "location": "Москва",
+        "published_at": f"2025-09-{number % 28 + 1:02d}T12:00:00+03:00",
+        "url": f"https://hh.ru/vacancy/{number}",
+        "salary": 100000 + number,
+        "description": description,
+        "employer": employer,
+    }
+
+
+ORIGINALS: List[Dict[str, Any]] = [
+    make_record(1, "Python разработчик", "Яндекс", DESCRIPTIONS[0]),
+    make_record(2, "Главный бухгалтер", "ООО Ромашка", DESCRIPTIONS[1]),
+    make_record(3, "Менеджер по продажам", "МТС", DESCRIPTIONS[2]),
+    make_record(4, "QA инженер", "Ozon", DESCRIPTIONS[3]),
+]
+# Перепубликации под новыми url: другой регистр, HTML-разметка и дописанное предложение
+REPOSTS: List[Dict[str, Any]] = [
+    make_record(11, "Python-разработчик", "Яндекс", f"<p>{DESCRIPTIONS[0]}</p>"),
+    make_record(12, "ГЛАВНЫЙ БУХГАЛТЕР", "ООО Ромашка", DESCRIPTIONS[1] + " Офис у метро."),
+]
+
+
+def test_signatures_find_reposts_only() -> None:
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add_items(ORIGINALS)
+    assert [url for url, _ in index.find(REPOSTS[0])] == [ORIGINALS[0]["url"]]
+    assert [url for url, _ in index.find(REPOSTS[1])] == [ORIGINALS[1]["url"]]
+    other = make_record(20, "Python разработчик", "Яндекс", DESCRIPTIONS[3])
+    assert index.find(other) == []
+    assert index.find(ORIGINALS[0]) == []  # запись с тем же url не считается своим дубликатом
+
+    assert choose_bands(0.8, 128) == (16, 8)
+    assert choose_bands(0.5, 128) == (32, 4)
+
+
+def test_add_items_skips_near_duplicates(tmp_path: Path) -> None:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    handler.add_items(ORIGINALS[:2])
+    index = handler.attach_index(NearDuplicateIndex(), rebuild=True)
+
+    updated = {**ORIGINALS[0], "salary": 500000}
+    batch = [REPOSTS[0], updated, ORIGINALS[2], {**ORIGINALS[2], "url": "https://hh.ru/vacancy/33"}]
+    handler.add_items(batch)
+    assert [item["url"] for item in handler.get_items()] == [record["url"] for record in ORIGINALS[:3]]
+    assert len(index) == 3
+
+
+def test_store_wide_pass(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    store = tmp_path / "store.jsonl"
+    handler = TXTHandler(str(store))
+    handler.add_items(ORIGINALS + REPOSTS)
+
+    duplicates = find_near_duplicates(handler, batch_size=3)
+    assert [(record["url"], record["duplicate_of"]) for record in duplicates] == [
+        (REPOSTS[0]["url"], ORIGINALS[0]["url"]),
+        (REPOSTS[1]["url"], ORIGINALS[1]["url"]),
+    ]
+    assert all(record["similarity"] >= 0.8 for record in duplicates)
+
+    index = NearDuplicateIndex(tmp_path / "minhash.json")
+    index.add_items(handler.get_items())
+    index.save()
+    loaded = NearDuplicateIndex(tmp_path / "minhash.json")
+    assert loaded.load() and len(loaded) == 6
+    assert [url for url, _ in loaded.find({**REPOSTS[1], "url": "https://hh.ru/vacancy/99"})][0] in {
+        ORIGINALS[1]["url"],
+        REPOSTS[1]["url"],
+    }
+
+    assert main(["dedup", "--store", str(store), "--dry-run"]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 2
+    assert main(["dedup", "--store", str(store)]) == 0
+    assert json.loads(capsys.readouterr().out)["removed"] == 2
+    assert [item["url"] for item in handler.get_items()] == [record["url"] for record in ORIGINALS]
+    assert remove_near_duplicates(handler) == {"scanned": 4, "kept": 4, "removed": 0}
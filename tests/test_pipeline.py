@@ -0,0 +1,26 @@
+# Что проверяется:
+# process_items() в пуле процессов даёт тот же результат и порядок, что и последовательная обработка.
+# Небольшие пакеты обрабатываются без пула, невалидные элементы пропускаются или вызывают ValueError.
+
+import pytest
+
+from benchmarks.corpus import generate_api_items
+from src.pipeline import convert_items, filter_vacancies, process_items
+
+
+def test_process_items_pool_matches_serial() -> None:
+    api_items = list(generate_api_items(400))
+    expected = filter_vacancies(convert_items(api_items), ["python", "django"], "москва", 100000, None)
+    result = process_items(
+        api_items, ["python", "django"], "москва", 100000, workers=2, chunk_size=50, parallel_threshold=0
+    )
+    assert expected
+    assert [vac.to_dict() for vac in result] == [vac.to_dict() for vac in expected]
+
+
+def test_process_items_serial_fallback_and_invalid() -> None:
+    api_items = list(generate_api_items(30)) + [{"name": "", "alternate_url": "https://hh.ru/vacancy/1"}]
+    assert len(process_items(api_items, skip_invalid=True)) == 30
+    assert len(process_items(api_items, skip_invalid=True, workers=2, chunk_size=8, parallel_threshold=0)) == 30
+    with pytest.raises(ValueError):
+        process_items(api_items, workers=2, chunk_size=8, parallel_threshold=0)
@@ -0,0 +1,77 @@
+# Что проверяется:
+# Выключенный реестр ничего не собирает.
+# Счётчики, значения и таймеры с метками, экспорт в JSON и в формат Prometheus.
+# profile_run() сохраняет статистику cProfile и пиковую память tracemalloc.
+# Хэндлеры файлов замеряют фазы read, filter, merge и write.
+
+import json
+import pstats
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from src.profiling import MetricsRegistry, metrics, profile_run
+from src.work_files import JSONHandler
+
+
+@pytest.fixture
+def enabled_metrics() -> Generator[MetricsRegistry, None, None]:
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_registry_collects_nothing() -> None:
+    registry = MetricsRegistry()
+    registry.inc("requests_total")
+    with registry.span("work_seconds"):
+        pass
+    assert registry.to_dict() == {"counters": [], "gauges": [], "timers": []}
+
+
+def test_registry_export(tmp_path: Path) -> None:
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("api_requests_total", source="hh", status=200)
+    registry.inc("api_requests_total", source="hh", status=200)
+    registry.set_gauge("queue_size", 3)
+    registry.observe("api_request_seconds", 0.5, source="hh")
+    registry.observe("api_request_seconds", 1.5, source="hh")
+
+    report = registry.to_dict()
+    assert report["counters"][0]["value"] == 2
+    timer = report["timers"][0]
+    assert timer["count"] == 2 and timer["sum"] == 2.0 and timer["max"] == 1.5
+
+    text = registry.to_prometheus()
+    assert "# TYPE hh_api_requests_total counter" in text
+    assert 'hh_api_requests_total{source="hh",status="200"} 2' in text
+    assert 'hh_api_request_seconds_count{source="hh"} 2' in text
+
+    registry.write_report(tmp_path / "metrics.prom")
+    registry.write_report(tmp_path / "metrics.json")
+    assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == text
+    assert json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8")) == report
+
+
+def test_profile_run(tmp_path: Path, enabled_metrics: MetricsRegistry) -> None:
+    with profile_run(tmp_path / "run.prof", trace_memory=True):
+        data = [str(i) for i in range(10000)]
+    assert len(data) == 10000
+    assert pstats.Stats(str(tmp_path / "run.prof")).get_stats_profile().func_profiles
+    gauges = {entry["name"]: entry["value"] for entry in enabled_metrics.to_dict()["gauges"]}
+    assert gauges["tracemalloc_peak_bytes"] > 0
+
+
+def test_handler_phases_are_timed(tmp_path: Path, enabled_metrics: MetricsRegistry) -> None:
+    handler = JSONHandler(str(tmp_path / "metrics.json"))
+    handler.add_items([{"title": "Python", "url": "https://hh.ru/vacancy/1", "salary": 1}])
+    handler.delete_items({"url": "https://hh.ru/vacancy/1"})
+    phases = {
+        entry["labels"]["phase"]
+        for entry in enabled_metrics.to_dict()["timers"]
+        if entry["name"] == "store_seconds" and entry["labels"]["handler"] == "JSONHandler"
+    }
+    assert phases == {"read", "filter", "merge", "write"}
@@ -0,0 +1,113 @@
+# Что проверяется:
+# Повторный get_items() с теми же критериями и отбор по критериям после полного чтения не читают файл.
+# add_items / delete_items сбрасывают кэш и кэшируют новое содержимое; изменение файла другим хэндлером
+# обнаруживается по mtime и размеру.
+# LRU-вытеснение по объёму памяти; слишком большие результаты не кэшируются.
+# Кэш работает и для секционированного хранилища.
+# Ключ кэша строится из критериев в типах схемы: списки key_skills, различающиеся порядком, — разные запросы,
+# а "150000" и 150000 для salary — один.
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import pytest
+
+from benchmarks.corpus import generate_records
+from src.query_cache import QueryCache, estimate_size
+from src.sharding import ShardedHandler
+from src.work_files import FileHandler, JSONHandler, TXTHandler
+
+RECORDS: List[Dict[str, Any]] = list(generate_records(200))
+
+
+def count_reads(handler: FileHandler) -> List[int]:
+    reads: List[int] = []
+    original = handler._read_items
+
+    def counted_read_items() -> List[Dict[str, Any]]:
+        reads.append(1)
+        return original()
+
+    handler._read_items = counted_read_items  # type: ignore[method-assign]
+    return reads
+
+
+@pytest.mark.parametrize("handler_class, name", [(JSONHandler, "store.json"), (TXTHandler, "store.jsonl")])
+def test_cache_hits_and_invalidation(tmp_path: Path, handler_class: type, name: str) -> None:
+    handler = handler_class(str(tmp_path / name))
+    handler.add_items(RECORDS[:150])
+    cache = handler.enable_cache(QueryCache())
+    reads = count_reads(handler)
+
+    everything = handler.get_items()
+    moscow = handler.get_items({"location": ["Москва"]})
+    assert handler.get_items({"location": "Москва"}) == moscow
+    assert reads == [1]
+    assert len(everything) == 150 and all(item["location"] == "Москва" for item in moscow)
+    assert len(cache) == 3
+
+    handler.add_items(RECORDS[150:])
+    assert len(handler.get_items()) == 200
+    handler.delete_items({"location": "Москва"})
+    assert handler.get_items({"location": "Москва"}) == []
+    # После записи через хэндлер новое содержимое уже в кэше — файл не перечитывается
+    assert reads == [1]
+
+    other = handler_class(str(tmp_path / name))
+    other.add_items(RECORDS)
+    assert len(handler.get_items({"location": "Москва"})) == len(moscow) + sum(
+        record["location"] == "Москва" for record in RECORDS[150:]
+    )
+
+
+def test_cache_key_follows_schema(tmp_path: Path) -> None:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    handler.add_items(
+        [
+            {"url": "x/1", "key_skills": ["a", "b"], "salary": 150000},
+            {"url": "x/2", "key_skills": ["b", "a"], "salary": 90000},
+        ]
+    )
+    handler.enable_cache(QueryCache())
+    assert [item["url"] for item in handler.get_items({"key_skills": ["a", "b"]})] == ["x/1"]
+    assert [item["url"] for item in handler.get_items({"key_skills": ["b", "a"]})] == ["x/2"]
+    assert [item["url"] for item in handler.get_items({"key_skills": [["b", "a"], ["c"]]})] == ["x/2"]
+
+    high = handler.get_items({"salary": "150000"})
+    reads = count_reads(handler)
+    assert handler.get_items({"salary": 150000}) == high and [item["url"] for item in high] == ["x/1"]
+    assert reads == []
+
+
+def test_lru_by_memory() -> None:
+    small, large = RECORDS[:10], RECORDS[:100]
+    cache = QueryCache(max_bytes=estimate_size(small) * 2 + 1)
+    cache.put("store", "a", small)
+    cache.put("store", "b", small)
+    assert cache.get("store", "a") == small
+    cache.put("store", "c", small)
+    assert cache.get("store", "b") is None
+    assert cache.get("store", "a") == small and cache.get("store", "c") == small
+    cache.put("store", "big", large)
+    assert cache.get("store", "big") is None
+    assert cache.size_bytes <= cache.max_bytes
+    cache.invalidate("store")
+    assert len(cache) == 0 and cache.size_bytes == 0
+
+
+def test_sharded_store_cache(tmp_path: Path) -> None:
+    handler = ShardedHandler(str(tmp_path / "store"))
+    handler.add_items(RECORDS[:100])
+    handler.enable_cache(QueryCache())
+    reads: List[Any] = []
+    original = handler._read_shards
+
+    def counted_read_shards(keys: Iterable[str]) -> List[Dict[str, Any]]:
+        reads.append(keys)
+        return original(keys)
+
+    handler._read_shards = counted_read_shards  # type: ignore[method-assign]
+    assert handler.get_items({"location": "Казань"}) == handler.get_items({"location": "Казань"})
+    assert len(reads) == 1
+    handler.add_items(RECORDS[100:])
+    assert len(handler.get_items()) == 200
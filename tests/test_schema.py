@@ -0,0 +1,96 @@
+# Что проверяется:
+# CSV и XLSX отдают записи в типах схемы (int salary, список key_skills) — те же, что JSON/TXT.
+# Критерии get_items/delete_items приводятся к типам схемы: "150000" и 150000 отбирают одно и то же.
+# Отбор по диапазону зарплат в CSV числовой, а не строковый (90000 < 150000).
+# decode_rows: короткие строки, пустые значения, нечисловая зарплата и поля вне схемы.
+# published_at хранится строкой ISO 8601: критерий-datetime приводится к ней; key_skills — одно значение или варианты.
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks.corpus import generate_records
+from src.schema import criteria_checks, decode_rows
+from src.work_files import CSVHandler, JSONHandler, XLSXHandler
+
+RECORDS: List[Dict[str, Any]] = [
+    {**record, "key_skills": ["Python", "SQL"] if number % 2 else []}
+    for number, record in enumerate(generate_records(40))
+]
+
+
+@pytest.mark.parametrize("handler_class, name", [(CSVHandler, "store.csv"), (XLSXHandler, "store.xlsx")])
+def test_tabular_stores_decode_to_schema_types(tmp_path: Path, handler_class: type, name: str) -> None:
+    reference = JSONHandler(str(tmp_path / "store.json"))
+    reference.add_items(RECORDS)
+    handler = handler_class(str(tmp_path / name))
+    handler.add_items(RECORDS)
+
+    assert handler.get_items() == reference.get_items()
+    assert list(handler.iter_items()) == reference.get_items()
+    assert all(isinstance(item["salary"], int) for item in handler.get_items())
+
+
+def test_native_criteria(tmp_path: Path) -> None:
+    handler = CSVHandler(str(tmp_path / "store.csv"))
+    handler.add_items(RECORDS)
+    salary = RECORDS[0]["salary"]
+    assert handler.get_items({"salary": str(salary)}) == handler.get_items({"salary": salary})
+    assert handler.get_items({"salary": [salary, "0"]}) == [
+        record for record in RECORDS if record["salary"] in (salary, 0)
+    ]
+    assert len(handler.get_items({"key_skills": ["Python", "SQL"]})) == len(RECORDS) // 2
+    assert len(handler.get_items({"key_skills": "Python; SQL"})) == len(RECORDS) // 2
+
+    handler.delete_items({"salary": "0"})
+    assert all(item["salary"] != 0 for item in handler.get_items())
+
+
+def test_numeric_salary_range(tmp_path: Path) -> None:
+    handler = CSVHandler(str(tmp_path / "store.csv"))
+    handler.add_items(
+        [
+            {**RECORDS[0], "url": "https://hh.ru/vacancy/1", "salary": 90000},
+            {**RECORDS[1], "url": "https://hh.ru/vacancy/2", "salary": 150000},
+            {**RECORDS[2], "url": "https://hh.ru/vacancy/3", "salary": 1000000},
+        ]
+    )
+    result = handler.query(salary_min=100000, salary_max=500000)
+    assert [item["salary"] for item in result] == [150000]
+
+
+def test_decode_rows() -> None:
+    header = ["title", "salary", "key_skills", "published_at", "salary_delta"]
+    rows = [
+        ["A", "120000", "Python; SQL", "2025-09-01T12:00:00+03:00", "500"],
+        ["B", "", ""],
+        ["C", "много", "", "", "x"],
+    ]
+    assert decode_rows(header, rows) == [
+        {
+            "title": "A",
+            "salary": 120000,
+            "key_skills": ["Python", "SQL"],
+            "published_at": "2025-09-01T12:00:00+03:00",
+            "salary_delta": "500",
+        },
+        {"title": "B", "salary": None, "key_skills": [], "published_at": None, "salary_delta": None},
+        {"title": "C", "salary": "много", "key_skills": [], "published_at": None, "salary_delta": "x"},
+    ]
+
+
+def test_datetime_and_list_criteria() -> None:
+    record = {"published_at": "2025-09-01T12:00:00+03:00", "key_skills": ["Python", "SQL"]}
+    published = datetime(2025, 9, 1, 12, tzinfo=timezone(timedelta(hours=3)))
+    [check] = criteria_checks({"published_at": published})
+    assert check(record)
+    [check] = criteria_checks({"published_at": [published, "2025-09-02T12:00:00+03:00"]})
+    assert check(record)
+    [check] = criteria_checks({"key_skills": ["Python", "SQL"]})
+    assert check(record)
+    [check] = criteria_checks({"key_skills": [["Go"], ["Python", "SQL"]]})
+    assert check(record)
+    [check] = criteria_checks({"key_skills": [["Go"], ["SQL"]]})
+    assert not check(record)
@@ -0,0 +1,83 @@
+# Что проверяется:
+# SeenFilter растёт секциями: все добавленные url находятся, доля ложных срабатываний не выше заданной.
+# Фильтр, подключённый к хранилищу, пополняется при add_items, сохраняется в файл (несколько байт на вакансию)
+# пакетами или при close() хранилища и после загрузки помнит вакансии, удалённые из хранилища.
+# HHAPI с seen=... отбрасывает уже сохранённые вакансии и прекращает загрузку на полностью известной странице.
+# sync второй раз не запрашивает страницы с уже сохранёнными вакансиями.
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks.corpus import api_item_to_record, generate_api_items
+from benchmarks.fake_hh import FakeHHServer
+from src.cli import main
+from src.get_api import HHAPI
+from src.seen_filter import SeenFilter, seen_filter_path
+from src.work_files import TXTHandler
+
+API_ITEMS: List[Dict[str, Any]] = list(generate_api_items(100))
+
+
+def test_scalable_error_rate() -> None:
+    seen = SeenFilter(capacity=500, error_rate=0.01)
+    urls = [f"https://hh.ru/vacancy/{number}" for number in range(5000)]
+    assert all(seen.add(url) for url in urls[:100])
+    seen.add_items([{"url": url} for url in urls[100:]])
+
+    assert len(seen.slices) == 4
+    # add() не добавляет ключ, принятый за известный (ложное срабатывание), поэтому счёт может быть чуть меньше
+    assert len(urls) * 0.98 < len(seen) <= len(urls)
+    assert all(url in seen for url in urls)
+    assert not seen.add(urls[0])
+    false_positives = sum(f"https://hh.ru/vacancy/new-{number}" in seen for number in range(20000))
+    assert false_positives / 20000 < 0.01
+
+
+def test_store_persistence(tmp_path: Path) -> None:
+    records = [api_item_to_record(item) for item in API_ITEMS]
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    handler.add_items(records[:40])
+    seen = SeenFilter(seen_filter_path(handler.filename), capacity=1000)
+    handler.attach_index(seen, rebuild=not seen.load())
+    handler.add_items(records[30:])
+    handler.delete_items({"url": records[0]["url"]})
+    # Мелкие добавления не перезаписывают файл фильтра: он сохраняется при close()
+    before_close = SeenFilter(seen.path)
+    assert before_close.load() and len(before_close) == 40
+    handler.close()
+
+    assert seen.path == tmp_path / "store.jsonl.seen.bloom"
+    assert seen.path.stat().st_size < 1000 * 3
+    loaded = SeenFilter(seen.path)
+    assert loaded.load()
+    assert len(loaded) == len(records)
+    assert all(record["url"] in loaded for record in records)
+
+
+def test_pagination_skips_known() -> None:
+    # Поиск отсортирован по дате: 15 новых вакансий, за ними уже сохранённые
+    seen = SeenFilter()
+    seen.add_items([{"url": item["alternate_url"]} for item in API_ITEMS[15:]])
+    with FakeHHServer(items=API_ITEMS) as server:
+        api = HHAPI(base_url=server.url, per_page=10, pages=10, seen=seen)
+        pages = list(api.iter_pages("python"))
+        assert server.requests_count == 3
+    assert [len(page) for page in pages] == [10, 5]
+    assert [item["alternate_url"] for page in pages for item in page] == [
+        item["alternate_url"] for item in API_ITEMS[:15]
+    ]
+
+
+def test_sync_stops_on_known_pages(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    store = str(tmp_path / "store.jsonl")
+    with FakeHHServer(items=API_ITEMS) as server:
+        args = ["sync", "python", "--api-url", server.url, "--per-page", "10", "--pages", "10", "--store", store]
+        assert main(args) == 0
+        first = server.requests_count
+        assert main(args) == 0
+        # Проверка соединения и первая страница, на которой все вакансии уже сохранены
+        assert server.requests_count - first == 2
+    assert len(TXTHandler(store).get_items()) == len(API_ITEMS)
+    assert seen_filter_path(Path(store)).exists()
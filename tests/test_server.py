@@ -0,0 +1,105 @@
+# Что проверяется:
+# Обход всех страниц /vacancies по курсору X-Next-Cursor: без пропусков и повторов, в порядке сортировки.
+# Фильтры location, salary_min, q (сортировка relevance) совпадают с отбором по данным.
+# Ответ передаётся частями (Transfer-Encoding: chunked) в формате JSONL.
+# ETag: повторный запрос с If-None-Match получает 304, после изменения хранилища — новые данные.
+# Некорректные параметры — 400; параллельные клиенты получают одинаковые ответы из одного снимка.
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+import pytest
+
+from benchmarks.corpus import generate_records
+from src.server import VacancyServer
+from src.work_files import TXTHandler
+
+RECORDS: List[Dict[str, Any]] = list(generate_records(300))
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[VacancyServer]:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    handler.add_items(RECORDS)
+    with VacancyServer(handler, port=0) as service:
+        yield service
+
+
+def get(
+    server: VacancyServer, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+) -> Tuple[int, Dict[str, str], List[Dict[str, Any]]]:
+    address = urlparse(server.url)
+    connection = HTTPConnection(address.netloc, timeout=10)
+    connection.request("GET", "/vacancies?" + urlencode(params), headers=headers or {})
+    response = connection.getresponse()
+    body = response.read().decode("utf-8")
+    connection.close()
+    response_headers = {name.lower(): value for name, value in response.getheaders()}
+    if response.status != 200:
+        return response.status, response_headers, [json.loads(body)] if body else []
+    return response.status, response_headers, [json.loads(line) for line in body.splitlines()]
+
+
+def test_cursor_pagination(server: VacancyServer) -> None:
+    pages, cursor = [], None
+    while True:
+        params = {"sort": "-salary", "limit": 70, **({"cursor": cursor} if cursor else {})}
+        status, headers, items = get(server, params)
+        assert status == 200 and headers["transfer-encoding"] == "chunked"
+        assert headers["x-total-count"] == str(len(RECORDS))
+        pages.append(items)
+        cursor = headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        assert "cursor=" in headers["link"] and 'rel="next"' in headers["link"]
+
+    assert [len(page) for page in pages] == [70, 70, 70, 70, 20]
+    items = [item for page in pages for item in page]
+    assert sorted(item["url"] for item in items) == sorted(record["url"] for record in RECORDS)
+    salaries = [item["salary"] for item in items]
+    assert salaries == sorted(salaries, reverse=True)
+
+
+def test_filters_and_relevance(server: VacancyServer) -> None:
+    status, _, items = get(server, {"location": "Москва", "location_match": "exact", "salary_min": 200000})
+    expected = {r["url"] for r in RECORDS if r["location"] == "Москва" and r["salary"] >= 200000}
+    assert status == 200 and {item["url"] for item in items} == expected
+    dates = [item["published_at"] for item in items]
+    assert dates == sorted(dates, reverse=True)
+
+    _, headers, items = get(server, {"q": "django", "limit": 1000})
+    assert items and all("django" in (item["title"] + item["description"]).lower() for item in items)
+    assert "x-next-cursor" not in headers
+
+    for params in ({"limit": 0}, {"sort": "relevance"}, {"salary_min": "много"}, {"cursor": "???"}):
+        status, _, body = get(server, params)
+        assert status == 400 and "error" in body[0]
+
+
+def test_etag_and_reload(server: VacancyServer) -> None:
+    params = {"location": "Москва", "limit": 5}
+    _, headers, first = get(server, params)
+    status, _, items = get(server, params, {"If-None-Match": headers["etag"]})
+    assert status == 304 and items == []
+    assert get(server, {**params, "limit": 6}, {"If-None-Match": headers["etag"]})[0] == 200
+
+    newest = {**RECORDS[0], "url": "https://hh.ru/vacancy/1", "location": "Москва", "published_at": "2030-01-01"}
+    server.handler.add_items([newest])
+    # mtime может совпасть при быстрой записи — размер файла изменился в любом случае
+    os.utime(server.handler.filename)
+    status, new_headers, items = get(server, params, {"If-None-Match": headers["etag"]})
+    assert status == 200 and new_headers["etag"] != headers["etag"]
+    assert items[0]["url"] == newest["url"] and items[1:] == first[:4]
+
+
+def test_concurrent_clients(server: VacancyServer) -> None:
+    params = {"q": "python sql", "sort": "salary", "limit": 50}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda _: get(server, params), range(16)))
+    assert all(status == 200 for status, _, _ in responses)
+    assert all(items == responses[0][2] for _, _, items in responses)
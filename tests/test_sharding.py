@@ -0,0 +1,124 @@
+# Что проверяется:
+# ShardedHandler раскладывает вакансии по секциям месяца или локации и ведёт манифест со статистикой.
+# add_items перезаписывает только затронутые секции, дубликаты по url не добавляются — и в другой секции:
+# перепубликация с тем же url в новом месяце оставляет прежнюю запись, как обычный хэндлер.
+# get_items по url и published_at читает только нужные секции.
+# query() отбрасывает секции по датам, зарплате и локации, результат совпадает с обычным хэндлером.
+# delete_items и archive() обновляют манифест и подключённые индексы; get_handler узнаёт каталог по манифесту.
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import pytest
+
+from src.indexes import LocationIndex
+from src.sharding import ShardedHandler
+from src.work_files import TXTHandler, get_handler
+
+
+def make_record(number: int, month: int, location: str, salary: int) -> Dict[str, Any]:
+    return {
+        "title": f"Python Developer {number}",
+        "location": location,
+        "published_at": f"2025-{month:02d}-{number % 28 + 1:02d}T12:00:00+03:00",
+        "url": f"https://hh.ru/vacancy/{number}",
+        "salary": salary,
+        "description": "Разработка на Python",
+    }
+
+
+RECORDS: List[Dict[str, Any]] = [
+    make_record(n, month=n % 4 + 6, location="Москва" if n % 3 else "Казань", salary=50000 + 10000 * n)
+    for n in range(1, 25)
+]
+
+
+def test_month_partition_and_manifest(tmp_path: Path) -> None:
+    handler = ShardedHandler(str(tmp_path / "store"))
+    handler.add_items(RECORDS)
+    shards = handler.shards
+    assert sorted(shards) == ["2025-06", "2025-07", "2025-08", "2025-09"]
+    assert sum(stats["count"] for stats in shards.values()) == len(RECORDS)
+    assert shards["2025-06"]["locations"] == ["казань", "москва"]
+    assert len(handler.get_items()) == len(RECORDS)
+
+    june = tmp_path / "store" / shards["2025-06"]["file"]
+    mtime = june.stat().st_mtime_ns
+    handler.add_items(RECORDS[:2] + [make_record(100, 9, "Пермь", 10000)])
+    assert june.stat().st_mtime_ns == mtime
+    assert handler.shards["2025-09"]["count"] == shards["2025-09"]["count"] + 1
+
+    reopened = get_handler(str(tmp_path / "store"))
+    assert isinstance(reopened, ShardedHandler)
+    assert len(reopened.get_items()) == len(RECORDS) + 1
+
+
+def test_query_prunes_shards(tmp_path: Path) -> None:
+    handler = ShardedHandler(str(tmp_path / "store"))
+    handler.add_items(RECORDS)
+    plain = TXTHandler(str(tmp_path / "plain.jsonl"))
+    plain.add_items(RECORDS)
+    for criteria in (
+        {"date_from": "2025-07-01", "date_to": "2025-08-31"},
+        {"location": "казань", "salary_min": 150000},
+        {"location": "Пермь"},
+    ):
+        assert sorted(item["url"] for item in handler.query(**criteria)) == sorted(
+            item["url"] for item in plain.query(**criteria)
+        )
+
+    reads: List[str] = []
+    original = handler._read_shards
+
+    def counting_read(keys: Iterable[str]) -> List[Dict[str, Any]]:
+        keys = list(keys)
+        reads.extend(keys)
+        return original(keys)
+
+    handler._read_shards = counting_read  # type: ignore[method-assign]
+    handler.query(date_from="2025-09-01")
+    assert reads == ["2025-09"]
+    reads.clear()
+    assert handler.get_items({"url": RECORDS[0]["url"]}) == [RECORDS[0]]
+    assert handler.get_items({"published_at": RECORDS[1]["published_at"]}) == [RECORDS[1]]
+    assert reads == [handler.shard_key(RECORDS[0]), handler.shard_key(RECORDS[1])]
+
+
+def test_repost_in_another_shard(tmp_path: Path) -> None:
+    handler = ShardedHandler(str(tmp_path / "store"))
+    plain = TXTHandler(str(tmp_path / "plain.jsonl"))
+    repost = {**RECORDS[0], "published_at": "2025-11-02T12:00:00+03:00", "salary": 1}
+    for store in (handler, plain):
+        store.add_items(RECORDS)
+        assert store.add_items([repost]) == 0
+    assert handler.get_items({"url": repost["url"]}) == plain.get_items({"url": repost["url"]}) == [RECORDS[0]]
+    assert "2025-11" not in handler.shards
+
+    # Карта url восстанавливается по секциям, если её файла нет
+    handler.urls_path.unlink()
+    reopened = ShardedHandler(str(tmp_path / "store"))
+    assert reopened.add_items([repost, make_record(200, 11, "Пермь", 1)]) == 1
+    reopened.delete_items({"url": RECORDS[0]["url"]})
+    assert ShardedHandler(str(tmp_path / "store")).add_items([repost]) == 1
+
+
+def test_area_partition_delete_and_archive(tmp_path: Path) -> None:
+    handler = ShardedHandler(str(tmp_path / "store"), partition_by="area")
+    index = LocationIndex()
+    handler.attach_index(index)
+    handler.add_items(RECORDS)
+    assert sorted(handler.shards) == ["казань", "москва"]
+    assert len(handler.get_items({"location": "Казань"})) == 8
+
+    handler.delete_items({"location": "Казань"})
+    assert sorted(handler.shards) == ["москва"]
+    assert index.lookup("казань") == set()
+
+    monthly = ShardedHandler(str(tmp_path / "monthly"))
+    monthly.add_items(RECORDS)
+    assert monthly.archive("2025-08-01") == ["2025-06", "2025-07"]
+    assert sorted(monthly.archived) == ["2025-06", "2025-07"]
+    assert (tmp_path / "monthly" / monthly.archived["2025-06"]["file"]).exists()
+    assert all(item["published_at"] >= "2025-08" for item in monthly.get_items())
+    with pytest.raises(ValueError):
+        monthly.archive("вчера")
@@ -0,0 +1,79 @@
+# Что проверяется:
+# SnapshotDiff находит новые, удалённые и изменившиеся вакансии, для зарплаты считает разницу.
+# Сравнение с разбиением на части (partitions > 1) даёт те же события, что и в памяти.
+# Хранилища разных форматов (JSON и CSV) сравниваются корректно, события пишутся в CSV с DIFF_FIELDS.
+# Подкоманда CLI diff выводит события и счётчики.
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.cli import main
+from src.snapshot_diff import DIFF_FIELDS, SnapshotDiff, diff_snapshots
+from src.work_files import CSVHandler, JSONHandler, TXTHandler
+
+
+def make_record(number: int, salary: int, title: str = "Python Developer") -> Dict[str, Any]:
+    return {
+        "title": f"{title} {number}",
+        "location": "Москва",
+        "published_at": "2025-09-01T12:00:00+03:00",
+        "url": f"https://hh.ru/vacancy/{number}",
+        "salary": salary,
+        "description": "Разработка на Python",
+        "key_skills": ["Python", "SQL"],
+        "experience": "Нет опыта",
+    }
+
+
+OLD: List[Dict[str, Any]] = [make_record(n, 100000 + n) for n in range(1, 51)]
+NEW: List[Dict[str, Any]] = (
+    [make_record(n, 100000 + n) for n in range(1, 41)]
+    + [make_record(41, 150000), make_record(42, 100042, "Senior Python Developer")]
+    + [make_record(n, 90000) for n in range(60, 63)]
+)
+
+
+def summary(events: List[Dict[str, Any]]) -> List[tuple]:
+    return sorted((e["change"], e["url"], tuple(e["changed_fields"]), e.get("salary_delta")) for e in events)
+
+
+def test_diff_events() -> None:
+    events, counts = diff_snapshots(OLD, NEW)
+    assert counts == {"added": 3, "removed": 8, "changed": 2, "unchanged": 40}
+    by_url = {event["url"]: event for event in events}
+    salary_change = by_url["https://hh.ru/vacancy/41"]
+    assert salary_change["changed_fields"] == ["salary"]
+    assert salary_change["salary_old"] == 100041 and salary_change["salary_delta"] == 49959
+    assert by_url["https://hh.ru/vacancy/42"]["title_old"] == "Python Developer 42"
+    assert by_url["https://hh.ru/vacancy/50"]["change"] == "removed"
+
+    partitioned, partitioned_counts = diff_snapshots(OLD, NEW, partitions=4)
+    assert partitioned_counts == counts
+    assert summary(partitioned) == summary(events)
+
+
+def test_diff_stores_of_different_formats(tmp_path: Path) -> None:
+    old = JSONHandler(str(tmp_path / "old.json"))
+    old.add_items(OLD)
+    new = CSVHandler(str(tmp_path / "new.csv"))
+    new.add_items(NEW)
+    output = CSVHandler(str(tmp_path / "diff.csv"), DIFF_FIELDS)
+    counts = SnapshotDiff(old, new).write(output)
+    assert counts["changed"] == 2 and counts["unchanged"] == 40
+    rows = {row["url"]: row for row in output.get_items()}
+    assert len(rows) == 13
+    assert rows["https://hh.ru/vacancy/41"]["salary_delta"] == "49959"
+
+
+def test_cli_diff(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    TXTHandler(str(tmp_path / "old.jsonl")).add_items(OLD)
+    TXTHandler(str(tmp_path / "new.jsonl")).add_items(NEW)
+    args = ["diff", "--old", str(tmp_path / "old.jsonl"), "--new", str(tmp_path / "new.jsonl"), "--partitions", "3"]
+    assert main(args) == 0
+    captured = capsys.readouterr()
+    events = [json.loads(line) for line in captured.out.splitlines()]
+    assert len(events) == 13
+    assert json.loads(captured.err)["removed"] == 8
@@ -0,0 +1,85 @@
+# Что проверяется:
+# run_staged() даёт те же вакансии и в том же порядке, что и последовательная обработка, и сохраняет их в хранилище.
+# Запись по времени: вакансии первой страницы попадают на диск до загрузки следующей (flush_interval).
+# Backpressure: пока запись стоит, загрузчик не уходит вперёд дальше ограниченных очередей.
+# Ошибка загрузки пробрасывается из run_staged(), а уже обработанные вакансии записаны.
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from benchmarks.corpus import generate_api_items
+from src.pipeline import process_items
+from src.services import batched
+from src.staged import run_staged
+from src.work_files import TXTHandler
+
+API_ITEMS: List[Dict[str, Any]] = list(generate_api_items(400))
+PAGES: List[List[Dict[str, Any]]] = list(batched(API_ITEMS, 20))
+
+
+def test_same_result_as_sequential(tmp_path: Path) -> None:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    vacancies = run_staged(iter(PAGES), handler, ["python", "sql"], "Москва", workers=3, batch_size=7)
+    expected = process_items(API_ITEMS, ["python", "sql"], "Москва", skip_invalid=True, workers=1)
+    assert [vac.url for vac in vacancies] == [vac.url for vac in expected]
+    assert sorted(item["url"] for item in handler.get_items()) == sorted(vac.url for vac in expected)
+
+
+def test_flush_by_interval(tmp_path: Path) -> None:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    stored_before_second_page: List[int] = []
+
+    def pages() -> Iterator[List[Dict[str, Any]]]:
+        yield PAGES[0]
+        time.sleep(0.5)
+        stored_before_second_page.append(len(TXTHandler(str(handler.filename)).get_items()))
+        yield PAGES[1]
+
+    run_staged(pages(), handler, batch_size=10000, flush_interval=0.1)
+    assert stored_before_second_page == [len(PAGES[0])]
+    assert len(handler.get_items()) == len(PAGES[0]) + len(PAGES[1])
+
+
+def test_backpressure(tmp_path: Path) -> None:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+    released = threading.Event()
+    original = handler.add_items
+
+    def blocked_add_items(items: List[Dict[str, Any]]) -> int:
+        released.wait()
+        return original(items)
+
+    handler.add_items = blocked_add_items  # type: ignore[method-assign]
+    produced: List[int] = []
+
+    def pages() -> Iterator[List[Dict[str, Any]]]:
+        for page in PAGES:
+            produced.append(1)
+            yield page
+
+    worker = threading.Thread(target=run_staged, args=(pages(), handler), kwargs={"queue_size": 2, "batch_size": 20})
+    worker.start()
+    time.sleep(0.5)
+    # Запись стоит: страницы в очереди писателя (2) и страниц (2), по одной у обработчиков и загрузчика, одна в записи
+    assert len(produced) <= 2 + 2 + 2 + 1 + 1 < len(PAGES)
+    released.set()
+    worker.join(10)
+    assert len(produced) == len(PAGES)
+    assert len(handler.get_items()) == len(API_ITEMS)
+
+
+def test_fetch_error_flushes_processed(tmp_path: Path) -> None:
+    handler = TXTHandler(str(tmp_path / "store.jsonl"))
+
+    def pages() -> Iterator[List[Dict[str, Any]]]:
+        yield PAGES[0]
+        yield PAGES[1]
+        raise ConnectionError("Ошибка сети")
+
+    with pytest.raises(ConnectionError):
+        run_staged(pages(), handler, batch_size=10000, flush_interval=60)
+    assert len(handler.get_items()) == len(PAGES[0]) + len(PAGES[1])
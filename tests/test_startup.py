@@ -0,0 +1,50 @@
+# Что проверяется:
+# Импорт CLI и интерфейса не тянет тяжёлые зависимости (requests, openpyxl, pandas).
+# Импорт модулей не создаёт папок (нет побочных эффектов).
+# Время импорта src.cli по данным python -X importtime укладывается в бюджет.
+# Бюджет задаётся переменной окружения HH_STARTUP_BUDGET_MS (по умолчанию 250 мс).
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("requests", "openpyxl", "pandas", "numpy")
+BUDGET_MS = float(os.environ.get("HH_STARTUP_BUDGET_MS", "250"))
+
+
+def import_times(module: str, cwd: Path) -> Dict[str, int]:
+    """Запускает python -X importtime и возвращает накопленное время импорта модулей (мкс)."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = int(cumulative.strip())
+    return times
+
+
+@pytest.mark.parametrize("module", ["src.cli", "src.user_interface", "src.work_files"])
+def test_import_has_no_heavy_dependencies(module: str, tmp_path: Path) -> None:
+    times = import_times(module, tmp_path)
+    loaded = {name.split(".")[0] for name in times}
+    assert not loaded.intersection(HEAVY_MODULES)
+    assert list(tmp_path.iterdir()) == []  # импорт ничего не создаёт в текущей папке
+
+
+def test_cli_import_time_budget(tmp_path: Path) -> None:
+    times = import_times("src.cli", tmp_path)
+    assert times["src.cli"] / 1000 < BUDGET_MS
@@ -0,0 +1,38 @@
+# Что проверяется:
+# part_stats() за один проход считает количество записей, диапазоны дат и зарплат и нормализованные локации;
+# записи без даты или зарплаты не сужают диапазоны.
+# ranges_overlap(): открытые границы запроса, часть без значений и касание границ диапазонов.
+
+from typing import Any, Dict, List
+
+from src.indexes import to_timestamp
+from src.store_stats import part_stats, ranges_overlap
+
+
+def test_part_stats() -> None:
+    items: List[Dict[str, Any]] = [
+        {"location": "Москва", "published_at": "2025-09-01T12:00:00+0300", "salary": 150000},
+        {"location": "москва", "published_at": "2025-08-15T09:00:00+0300", "salary": None},
+        {"location": "Казань", "published_at": None, "salary": 90000},
+    ]
+    stats = part_stats(iter(items))
+    assert stats["count"] == 3
+    assert stats["min_published_at"] == to_timestamp("2025-08-15T09:00:00+0300")
+    assert stats["max_published_at"] == to_timestamp("2025-09-01T12:00:00+0300")
+    assert (stats["min_salary"], stats["max_salary"]) == (90000, 150000)
+    assert len(stats["locations"]) == 2
+    assert part_stats([]) == {
+        "count": 0,
+        "min_published_at": None,
+        "max_published_at": None,
+        "min_salary": None,
+        "max_salary": None,
+        "locations": [],
+    }
+
+
+def test_ranges_overlap() -> None:
+    assert ranges_overlap(None, None, None, None)
+    assert not ranges_overlap(None, None, 1, None)
+    assert ranges_overlap(10, 20, 20, None) and ranges_overlap(10, 20, None, 10)
+    assert not ranges_overlap(10, 20, 21, 30) and not ranges_overlap(10, 20, 0, 9)
@@ -0,0 +1,105 @@
+# Что проверяется:
+# Токенизация: HTML-теги, регистр, ё -> е, стемминг русских окончаний.
+# Поиск в режимах "or" и "and".
+# Ранжирование BM25 — более релевантная вакансия выше.
+# Инкрементальное обновление индекса и сохранение/загрузка из файла.
+# Индекс, подключённый к FileHandler, обновляется при add_items/delete_items.
+# FileHandler.search() читает только найденные url: у сжатого хранилища распаковываются только их блоки.
+
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import pytest
+
+from src.compressed import CompressedJSONLHandler
+from src.text_index import InvertedIndex, tokenize
+from src.work_files import JSONHandler, TXTHandler
+
+vacancies = [
+    {
+        "title": "Python разработчик",
+        "url": "https://hh.ru/vacancy/1",
+        "description": "Разработка backend на Django, опыт работы с PostgreSQL",
+    },
+    {
+        "title": "Главный бухгалтер",
+        "url": "https://hh.ru/vacancy/2",
+        "description": "Знание 1С <highlighttext>Бухгалтерия</highlighttext>",
+    },
+    {
+        "title": "Frontend разработчик",
+        "url": "https://hh.ru/vacancy/3",
+        "description": "Разработке интерфейсов на React",
+    },
+]
+
+
+def test_tokenize_normalizes_russian_words() -> None:
+    assert tokenize("Разработка") == tokenize("разработке") == tokenize("РАЗРАБОТКИ")
+    assert tokenize("<highlighttext>Бухгалтерия</highlighttext>") == tokenize("бухгалтерии")
+    assert tokenize("Ёлка") == tokenize("елка")
+    assert tokenize("C++ и C#") == ["c++", "и", "c#"]
+
+
+def test_search_or_and_modes() -> None:
+    index = InvertedIndex()
+    index.add_items(vacancies)
+    assert index.match("разработка") == {"https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3"}
+    assert index.match(["django", "react"], mode="or") == {"https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3"}
+    assert index.match(["разработчик", "django"], mode="and") == {"https://hh.ru/vacancy/1"}
+    assert index.match("бухгалтерия") == {"https://hh.ru/vacancy/2"}
+    with pytest.raises(ValueError):
+        index.match("python", mode="xor")
+
+
+def test_bm25_ranking() -> None:
+    index = InvertedIndex()
+    index.add_items(vacancies)
+    ranked = index.search("python разработчик")
+    assert ranked[0][0] == "https://hh.ru/vacancy/1"
+    assert len(index.search("разработчик", limit=1)) == 1
+
+
+def test_incremental_update_and_persistence(tmp_path: Path) -> None:
+    index = InvertedIndex(tmp_path / "text.idx")
+    index.add_items(vacancies[:2])
+    index.add_items([{**vacancies[0], "description": "Data Science"}])  # тот же url — переиндексация
+    assert len(index) == 2
+    assert index.match("django") == set()
+    index.remove_items([vacancies[1]])
+    index.save()
+
+    loaded = InvertedIndex(tmp_path / "text.idx")
+    assert loaded.load()
+    assert loaded.match("science") == {"https://hh.ru/vacancy/1"}
+    assert loaded.match("бухгалтер") == set()
+
+
+@pytest.mark.parametrize("HandlerClass, filename", [(JSONHandler, "index.json"), (TXTHandler, "index.txt")])
+def test_index_attached_to_handler(tmp_path: Path, HandlerClass: type, filename: str) -> None:
+    handler = HandlerClass(str(tmp_path / filename))
+    handler.add_items(vacancies[:1])
+    index = handler.attach_index(InvertedIndex(tmp_path / "text.idx"), rebuild=True)
+    handler.add_items(vacancies[1:])
+    assert len(index) == 3
+    assert [item["url"] for item in handler.search("бухгалтерия")] == ["https://hh.ru/vacancy/2"]
+
+    handler.delete_items(criteria={"url": "https://hh.ru/vacancy/2"})
+    assert handler.search("бухгалтерия") == []
+    assert (tmp_path / "text.idx").exists()
+
+
+def test_search_reads_only_ranked_blocks(tmp_path: Path) -> None:
+    handler = CompressedJSONLHandler(str(tmp_path / "store.jsonl.gz"), block_size=1)
+    handler.add_items(vacancies)
+    handler.attach_index(InvertedIndex(), rebuild=True)
+    read: List[int] = []
+    original = handler._read_blocks
+
+    def counted_read_blocks(blocks: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        read.append(len(blocks))
+        return original(blocks)
+
+    handler._read_blocks = counted_read_blocks  # type: ignore[method-assign]
+    assert [item["url"] for item in handler.search("бухгалтерия")] == ["https://hh.ru/vacancy/2"]
+    assert read == [1]
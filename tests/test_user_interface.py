@@ -1,6 +1,6 @@
 # Что проверяется:
 # Ввод пользователя через mock input.
-# Получение вакансий через замоканный HHAPI.
+# Получение страниц вакансий через замоканный HHAPI.iter_pages.
 # Фильтрация вакансий по ключевым словам и зарплате.
 # Сохранение вакансий в JSON-файл в папку data.
 # Тест проверяет фильтрацию, создание папки и сохранение файла.
@@ -41,26 +41,30 @@ def test_user_interaction_with_location(monkeypatch: MagicMock) -> None:
     )
     monkeypatch.setattr("builtins.input", lambda _: next(inputs))
 
-    # Мокаем HHAPI.get_vacancies
-    with patch("src.get_api.HHAPI.get_vacancies") as mock_get:
-        mock_get.return_value = [
-            {
-                "name": "Python Developer",
-                "area": {"name": "Москва"},
-                "published_at": "2025-09-02T12:00:00Z",
-                "alternate_url": "https://hh.ru/vacancy/1",
-                "salary": {"from": 150000, "to": 200000, "currency": "RUR"},
-                "snippet": {"requirement": "Разработка backend"},
-            },
-            {
-                "name": "Junior Developer",
-                "area": {"name": "Санкт-Петербург"},
-                "published_at": "2025-09-01T12:00:00Z",
-                "alternate_url": "https://hh.ru/vacancy/2",
-                "salary": {"from": 90000, "to": 120000, "currency": "RUR"},
-                "snippet": {"requirement": "Разработка frontend"},
-            },
-        ]
+    # Мокаем HHAPI.iter_pages (одна страница)
+    with patch("src.get_api.HHAPI.iter_pages") as mock_get:
+        mock_get.return_value = iter(
+            [
+                [
+                    {
+                        "name": "Python Developer",
+                        "area": {"name": "Москва"},
+                        "published_at": "2025-09-02T12:00:00Z",
+                        "alternate_url": "https://hh.ru/vacancy/1",
+                        "salary": {"from": 150000, "to": 200000, "currency": "RUR"},
+                        "snippet": {"requirement": "Разработка backend"},
+                    },
+                    {
+                        "name": "Junior Developer",
+                        "area": {"name": "Санкт-Петербург"},
+                        "published_at": "2025-09-01T12:00:00Z",
+                        "alternate_url": "https://hh.ru/vacancy/2",
+                        "salary": {"from": 90000, "to": 120000, "currency": "RUR"},
+                        "snippet": {"requirement": "Разработка frontend"},
+                    },
+                ]
+            ]
+        )
 
         # Мокаем JSONHandler.add_items
         with patch.object(
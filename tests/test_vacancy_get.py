@@ -5,10 +5,12 @@
 # Ошибки при пустом названии и неправильной ссылке.
 # Сравнение вакансий по зарплате (<, >, ==).
 # Значения по умолчанию для описания и локации.
+# Компактная запись to_record() / from_record() и pickle вакансии.
 # Mock API возвращает тестовые данные hh.ru.
 # Создание объектов Vacancy через конвертер convert_api_to_vacancy.
 #
 
+import pickle
 from datetime import datetime
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -148,6 +150,21 @@ def test_vacancy_default_description_location() -> None:
     assert vac.salary == 0
 
 
+def test_vacancy_record_round_trip() -> None:
+    vac = Vacancy(
+        title="Vacancy",
+        location="Москва",
+        published_at="2025-09-02T12:00:00Z",
+        url="https://hh.ru/vacancy/1",
+        salary=100000,
+        description="Python",
+        key_skills=["Django", "SQL"],
+    )
+    restored = Vacancy.from_record(pickle.loads(pickle.dumps(vac.to_record())))
+    assert restored.to_dict() == vac.to_dict()
+    assert pickle.loads(pickle.dumps(vac)).to_dict() == vac.to_dict()
+
+
 def convert_api_to_vacancy(item: dict) -> Vacancy:
     """Помощник для создания объекта Vacancy из данных API"""
     salary_data = item.get("salary")
@@ -0,0 +1,164 @@
+# Что проверяется:
+# Загрузка сохранённых поисков из JSON: неизвестные поля и повторяющиеся имена — ValueError.
+# Инкрементальный опрос: второй цикл передаёт date_from, загружает одну страницу и добавляет только новые вакансии;
+# клиент API и сессия переиспользуются между циклами.
+# Расписание run(): интервалы со сдвигом в пределах jitter, остановка по max_cycles, статистика по поискам.
+# Отметка date_from ведётся отдельно для каждого источника; полученные url старше отметки забываются.
+# После неудачной записи в хранилище следующий цикл снова получает и сохраняет те же вакансии.
+# Ошибка источника (в том числе непредвиденная) попадает в статистику и не останавливает демон;
+# CLI watch сохраняет статистику в файл.
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks.corpus import generate_api_items
+from benchmarks.fake_hh import FakeHHServer, FakeSuperJobServer
+from src.cli import main
+from src.get_api import SuperJobAPI
+from src.indexes import to_timestamp
+from src.watch import SavedSearch, WatchDaemon, load_saved_searches
+from src.work_files import TXTHandler
+
+
+def fresh_items(count: int) -> List[Dict[str, Any]]:
+    """Вакансии, опубликованные позже всех вакансий синтетического корпуса."""
+    items = list(generate_api_items(count, seed=3, start_id=300000000))
+    for number, item in enumerate(items):
+        item["published_at"] = f"2025-09-02T1{number}:00:00+0300"
+    return items
+
+
+def test_load_saved_searches(tmp_path: Path) -> None:
+    path = tmp_path / "searches.json"
+    path.write_text(json.dumps({"searches": [{"name": "py", "queries": ["python"], "store": "a.jsonl"}]}))
+    [search] = load_saved_searches(str(path))
+    assert search.interval == 900 and search.sources == ["hh"]
+    assert SavedSearch.from_dict(search.to_dict()).to_dict() == search.to_dict()
+
+    path.write_text(json.dumps([{"name": "py", "queries": ["python"], "store": "a.jsonl", "period": 5}]))
+    with pytest.raises(ValueError):
+        load_saved_searches(str(path))
+    path.write_text(json.dumps([{"name": "py", "queries": ["python"], "store": "a.jsonl"}] * 2))
+    with pytest.raises(ValueError):
+        load_saved_searches(str(path))
+
+
+def test_incremental_polling(tmp_path: Path) -> None:
+    store = tmp_path / "store.jsonl"
+    with FakeHHServer(count=30) as server:
+        search = SavedSearch("py", ["python"], str(store), api_urls={"hh": server.url}, per_page=10)
+        daemon = WatchDaemon([search])
+
+        first = daemon.poll(search)
+        assert first["last_added"] == 30 and first["errors"] == 0
+        assert "date_from" not in server.last_params
+        client, session = daemon._client("hh", search), daemon._session
+
+        server.items.extend(fresh_items(5))
+        requests_before = server.requests_count
+        second = daemon.poll(search)
+        assert second["last_added"] == 5 and second["total_added"] == 35
+        newest = max(datetime.strptime(item["published_at"], "%Y-%m-%dT%H:%M:%S%z") for item in server.items[:30])
+        # date_from — самая свежая вакансия первого цикла
+        assert server.last_params["date_from"] == [newest.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z")]
+        assert server.requests_count - requests_before == 1  # одна страница: на ней новые вакансии кончились
+        assert second["newest_published_at"] == "2025-09-02T11:00:00+00:00"
+        assert daemon._client("hh", search) is client and daemon._session is session
+
+        third = daemon.poll(search)
+        assert third["last_added"] == 0 and third["cycles"] == 3
+        daemon.close()
+    assert len(TXTHandler(str(store)).get_items()) == 35
+
+
+def test_watermark_per_source(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    old_items = list(generate_api_items(10, seed=5, start_id=400000000))
+    with FakeHHServer(items=fresh_items(5)) as hh, FakeSuperJobServer(items=old_items) as superjob:
+        urls = {"hh": hh.url, "superjob": superjob.url}
+        search = SavedSearch(
+            "py", ["python"], str(tmp_path / "store.jsonl"), sources=["hh", "superjob"], api_urls=urls
+        )
+        daemon = WatchDaemon([search])
+        assert daemon.poll(search)["last_added"] == 15
+
+        newest_old = max(to_timestamp(item["published_at"]) or 0 for item in old_items)
+        state = daemon._states["py"]
+        assert state.watermarks["superjob"] == newest_old < state.watermarks["hh"]
+        assert all(stamp == state.watermarks["hh"] for stamp in state.seen["hh"].values())
+
+        daemon.poll(search)
+        # Свежие вакансии hh не сдвигают date_from другого источника
+        assert superjob.last_params["date_published_from"] == [str(int(newest_old))]
+
+        def broken(self: SuperJobAPI, item: Dict[str, Any]) -> Dict[str, Any]:
+            raise KeyError("profession")
+
+        monkeypatch.setattr(SuperJobAPI, "normalize", broken)
+        failed = daemon.poll(search)
+        assert failed["errors"] == 1 and failed["last_error"] == "KeyError: 'profession'"
+        monkeypatch.undo()
+        assert daemon.poll(search)["last_error"] is None
+        daemon.close()
+
+
+def test_failed_write_is_retried(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    with FakeHHServer(count=30) as server:
+        search = SavedSearch("py", ["python"], str(tmp_path / "store.jsonl"), api_urls={"hh": server.url})
+        daemon = WatchDaemon([search])
+        handler = daemon._store(search)
+
+        def disk_full(items: List[Dict[str, Any]]) -> int:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(handler, "add_items", disk_full)
+        failed = daemon.poll(search)
+        assert failed["errors"] == 1 and failed["last_error"] == "disk full"
+        assert failed["newest_published_at"] is None
+
+        monkeypatch.undo()
+        recovered = daemon.poll(search)
+        daemon.close()
+    assert recovered["last_found"] == 30 and recovered["last_added"] == 30
+    assert handler.count() == 30
+
+
+def test_run_schedule_and_errors(tmp_path: Path) -> None:
+    with FakeHHServer(count=10) as server:
+        good = SavedSearch(
+            "good", ["python"], str(tmp_path / "good.jsonl"), interval=0.05, api_urls={"hh": server.url}
+        )
+        bad = SavedSearch(
+            "bad", ["python"], str(tmp_path / "bad.jsonl"), interval=0.1, api_urls={"hh": "http://127.0.0.1:9/v"}
+        )
+        daemon = WatchDaemon([good, bad], jitter=0.2, seed=1, timeout=1)
+        delays = [daemon.next_delay(good) for _ in range(50)]
+        assert all(0.04 <= delay <= 0.06 for delay in delays) and len(set(delays)) > 1
+
+        daemon.run(max_cycles=5)
+        daemon.close()
+    stats = {row["name"]: row for row in daemon.stats()}
+    assert stats["good"]["cycles"] + stats["bad"]["cycles"] == 5
+    assert stats["good"]["cycles"] >= stats["bad"]["cycles"] >= 1
+    assert stats["good"]["total_added"] == 10 and stats["good"]["freshness_seconds"] >= 0
+    assert stats["bad"]["errors"] == stats["bad"]["cycles"] and stats["bad"]["freshness_seconds"] is None
+    assert "Ошибка" in stats["bad"]["last_error"]
+
+
+def test_cli_watch(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    with FakeHHServer(count=10) as server:
+        searches = tmp_path / "searches.json"
+        store = str(tmp_path / "store.jsonl")
+        searches.write_text(
+            json.dumps([{"name": "py", "queries": ["python"], "store": store, "api_urls": {"hh": server.url}}])
+        )
+        stats_path = tmp_path / "stats.json"
+        args = ["watch", "--searches", str(searches), "--stats", str(stats_path), "--cycles", "1", "--jitter", "0"]
+        assert main(args) == 0
+    [row] = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert row["name"] == "py" and row["total_added"] == 10
+    [saved] = json.loads(stats_path.read_text(encoding="utf-8"))
+    assert saved["name"] == "py" and saved["cycles"] == 1 and saved["last_added"] == 10
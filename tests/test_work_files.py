@@ -1,18 +1,21 @@
 # Что проверяется:
 # Добавление вакансий во все типы файлов (JSON, CSV, XLSX, TXT).
-# Проверка, что дубликаты не добавляются.
+# Проверка, что дубликаты не добавляются (add_items возвращает число добавленных, count() — размер хранилища).
 # Фильтрация по критериям (например, location).
 # Удаление вакансий по критериям.
 # Полное удаление всех записей.
 # Удаление вакансий проверяет, что все элементы с указанными критериями удалены.
 # Подходит для всех четырёх хэндлеров: JSON, CSV, XLSX, TXT.
+# JSONHandler.iter_items разбирает массив потоково: результат не зависит от размера фрагмента чтения.
 
+import io
+import json
 from pathlib import Path
 from typing import Type
 
 import pytest
 
-from src.work_files import CSVHandler, FileHandler, JSONHandler, TXTHandler, XLSXHandler
+from src.work_files import CSVHandler, FileHandler, JSONHandler, TXTHandler, XLSXHandler, _iter_json_array
 
 fake_vacancies = [
     {
@@ -48,7 +51,7 @@ def test_file_handler_add_get_delete(tmp_path: Path, HandlerClass: Type[FileHand
     handler = HandlerClass(str(file_path))
 
     # ------------------ Добавление ------------------
-    handler.add_items(fake_vacancies)
+    assert handler.add_items(fake_vacancies) == 2
     items = handler.get_items()
     assert len(items) == 2
     urls = [item["url"] for item in items]
@@ -56,9 +59,10 @@ def test_file_handler_add_get_delete(tmp_path: Path, HandlerClass: Type[FileHand
     assert "https://hh.ru/vacancy/456" in urls
 
     # ------------------ Проверка добавления дубликатов ------------------
-    handler.add_items([fake_vacancies[0]])  # добавляем дубликат
+    assert handler.add_items([fake_vacancies[0]]) == 0  # добавляем дубликат
     items = handler.get_items()
     assert len(items) == 2  # дубликат не добавился
+    assert handler.count() == 2
 
     # ------------------ Фильтрация ------------------
     filtered = handler.get_items(criteria={"location": "Москва"})
@@ -78,3 +82,17 @@ def test_file_handler_add_get_delete(tmp_path: Path, HandlerClass: Type[FileHand
     # ------------------ Удаление всех ------------------
     handler.delete_items(criteria={"salary": 0})
     assert handler.get_items() == []
+
+
+def test_json_streaming_read(tmp_path: Path) -> None:
+    handler = JSONHandler(str(tmp_path / "store.json"))
+    handler.add_items(fake_vacancies)
+    assert list(handler.iter_items()) == fake_vacancies
+    text = handler.filename.read_text(encoding="utf-8")
+    for chunk_size in (1, 7, 100):
+        assert list(_iter_json_array(io.StringIO(text), chunk_size)) == fake_vacancies
+    assert list(_iter_json_array(io.StringIO("[1, 22 ,333 ]"), 2)) == [1, 22, 333]
+    for broken in ("{}", "[{}", '[{"url": '):
+        with pytest.raises(ValueError):
+            list(_iter_json_array(io.StringIO(broken), 2))
+    assert json.loads(text) == fake_vacancies